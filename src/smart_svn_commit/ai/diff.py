@@ -2,8 +2,31 @@
 获取文件差异内容
 """
 
+import os
 import subprocess
-from typing import List
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from ..core.config import load_config
+from .diff_cache import DEFAULT_MAX_DISK_MB, DEFAULT_MAX_MEMORY_MB, get_diff_cache
+
+# 逐个获取 diff 时的并发进程数
+DIFF_MAX_WORKERS = 8
+
+# svn diff 输出中每个文件的起始标记
+INDEX_HEADER = "Index: "
+PROPERTY_HEADER = "Property changes on: "
+
+
+class DiffRecords:
+    """svn diff 输出的拆分结果：diffs 为文件路径到 diff 的字典，last_path 为最后一个文件"""
+
+    __slots__ = ("diffs", "last_path")
+
+    def __init__(self) -> None:
+        self.diffs: Dict[str, str] = {}
+        self.last_path: Optional[str] = None
 
 
 def get_file_diff(file_path: str) -> str:
@@ -32,17 +55,209 @@ def get_file_diff(file_path: str) -> str:
     return ""
 
 
-def get_multiple_files_diff(file_paths: List[str]) -> List[dict[str, str]]:
+def get_multiple_files_diff(
+    file_paths: List[str], should_cancel: Optional[Callable[[], bool]] = None
+) -> List[dict[str, str]]:
     """
     批量获取多个文件的 diff 内容
 
+    启用 diff 缓存时先取出内容未变化的文件的缓存结果，只对其余文件运行 svn；
+    先用一次 svn diff --targets 获取全部文件的 diff 并按文件拆分；
+    批量获取失败或输出中缺少的文件再用线程池逐个获取。
+
+    Args:
+        file_paths: 文件路径列表
+        should_cancel: 返回 True 时终止 svn diff 并停止获取（可选）
+
+    Returns:
+        包含 path 和 diff 的字典列表（顺序与 file_paths 一致），取消时返回空列表
+    """
+    cache_config = load_config().get("diffCache", {})
+    cache = None
+    keys: Dict[str, str] = {}
+    diffs: Dict[str, str] = {}
+    if cache_config.get("enabled", True):
+        cache = get_diff_cache(
+            cache_config.get("maxMemoryMB", DEFAULT_MAX_MEMORY_MB),
+            cache_config.get("maxDiskMB", DEFAULT_MAX_DISK_MB),
+        )
+        # 校验键在运行 svn 之前计算，期间被修改的文件下次会重新获取
+        keys = cache.compute_keys(file_paths)
+        diffs = cache.get_many(keys)
+
+    pending = [path for path in file_paths if path not in diffs]
+    if len(pending) > 1:
+        diffs.update(get_batched_diff(pending, should_cancel) or {})
+
+    def get_diff(file_path: str) -> str:
+        if should_cancel is not None and should_cancel():
+            return ""
+        return get_file_diff(file_path)
+
+    missing = [path for path in pending if path not in diffs]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(DIFF_MAX_WORKERS, len(missing))) as executor:
+            diffs.update(zip(missing, executor.map(get_diff, missing)))
+
+    # 取消后的结果不完整，不返回也不缓存
+    if should_cancel is not None and should_cancel():
+        return []
+
+    if cache is not None:
+        # 空结果也可能来自 svn 运行失败，不缓存
+        cache.put_many(
+            {path: (keys[path], diffs[path]) for path in pending if path in keys and diffs[path]}
+        )
+
+    return [{"path": file_path, "diff": diffs[file_path]} for file_path in file_paths]
+
+
+def get_batched_diff(
+    file_paths: List[str], should_cancel: Optional[Callable[[], bool]] = None
+) -> Optional[Dict[str, str]]:
+    """
+    运行一次 svn diff --targets，按 Index: 标记将输出拆分为各文件的 diff
+
+    目录的 diff 包含其下所有文件的变更。svn 中途出错（如包含未版本化的文件）时，
+    只返回出错前已完整输出的文件。
+
     Args:
         file_paths: 文件路径列表
+        should_cancel: 返回 True 时终止 svn 进程（可选，视为中途出错）
 
     Returns:
-        包含 path 和 diff 的字典列表
+        文件路径到 diff 内容的字典（没有变更的文件对应空字符串），
+        无法运行 svn 时返回 None
     """
-    return [
-        {"path": file_path, "diff": get_file_diff(file_path)}
-        for file_path in file_paths
-    ]
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="w", encoding="utf-8", delete=False, suffix=".txt"
+        ) as f:
+            for file_path in file_paths:
+                f.write(file_path + "\n")
+            targets_file = f.name
+    except OSError:
+        return None
+
+    try:
+        process = subprocess.Popen(
+            ["svn", "diff", "--targets", targets_file],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+        )
+    except (FileNotFoundError, OSError):
+        _remove_file(targets_file)
+        return None
+
+    lines: Iterable[str] = process.stdout
+    if should_cancel is not None:
+        lines = _read_until_cancelled(process, should_cancel)
+    try:
+        records = split_diff_output(lines, file_paths)
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        _remove_file(targets_file)
+
+    if returncode != 0:
+        # 最后一个文件的输出可能不完整，交给调用方逐个获取
+        if records.last_path is not None:
+            records.diffs.pop(records.last_path, None)
+        return records.diffs
+
+    for file_path in file_paths:
+        records.diffs.setdefault(file_path, "")
+    return records.diffs
+
+
+def _read_until_cancelled(
+    process: subprocess.Popen, should_cancel: Callable[[], bool]
+) -> Iterator[str]:
+    """逐行读取进程输出，取消时终止进程并停止读取"""
+    for line in process.stdout:
+        if should_cancel():
+            process.kill()
+            return
+        yield line
+
+
+def split_diff_output(lines: Iterable[str], file_paths: List[str]) -> DiffRecords:
+    """
+    边读取边按文件拆分 svn diff 输出
+
+    每个文件以 "Index: <路径>" 开头；只有属性变化的文件可能以
+    "Property changes on: <路径>" 开头。输出中的路径归属到 file_paths 中的
+    同名路径，或包含它的目录。
+
+    Args:
+        lines: svn diff 输出的行（保留换行符）
+        file_paths: 传给 svn diff 的路径列表
+
+    Returns:
+        拆分结果
+    """
+    # 按统一的分隔符匹配路径（Windows 上 svn 输出反斜杠）
+    targets = {_normalize_path(path): path for path in file_paths}
+    records = DiffRecords()
+    chunks: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    current_path: Optional[str] = None
+
+    for line in lines:
+        header_path = _header_path(line)
+        if header_path is not None and header_path != current_path:
+            current_path = header_path
+            target = _find_target(targets, header_path)
+            current = None if target is None else chunks.setdefault(target, [])
+            records.last_path = target
+        if current is not None:
+            current.append(line)
+
+    for target, chunk in chunks.items():
+        records.diffs[target] = "".join(chunk).strip()
+    return records
+
+
+def _header_path(line: str) -> Optional[str]:
+    """解析文件起始标记中的路径（不是起始标记时返回 None）"""
+    for header in (INDEX_HEADER, PROPERTY_HEADER):
+        if line.startswith(header):
+            return _normalize_path(line[len(header) :].rstrip("\r\n"))
+    return None
+
+
+def _find_target(targets: Dict[str, str], path: str) -> Optional[str]:
+    """
+    查找输出路径对应的目标路径（自身或最近的上级目录）
+
+    Args:
+        targets: 统一分隔符后的路径到原始路径的字典
+        path: 输出中的路径（已统一分隔符）
+
+    Returns:
+        原始目标路径，找不到时返回 None
+    """
+    while True:
+        target = targets.get(path)
+        if target is not None:
+            return target
+        sep_idx = path.rfind("/")
+        if sep_idx < 0:
+            return targets.get(".")
+        path = path[:sep_idx]
+
+
+def _normalize_path(path: str) -> str:
+    """统一路径分隔符并去掉末尾的分隔符"""
+    return path.replace("\\", "/").rstrip("/") or "."
+
+
+def _remove_file(file_path: str) -> None:
+    """删除临时文件，忽略错误（Windows 可能锁定文件）"""
+    try:
+        os.unlink(file_path)
+    except OSError:
+        pass
@@ -0,0 +1,267 @@
+"""
+diff 缓存
+
+按文件的绝对路径缓存 svn diff 结果（内存 + 用户缓存目录下的 sqlite），
+以文件修改时间、大小以及 wc.db 中的节点状态（BASE 修订版本、是否已添加、
+本地属性修改）作为校验键。校验只需要 stat 和一次只读的 wc.db 查询，
+文件或节点状态变化后缓存自动失效。内存和磁盘缓存都按最近使用淘汰。
+
+全局实例由多个生成线程共享（包括已取消但仍在运行的线程），
+内存缓存和命中统计由锁保护。
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from stat import S_ISREG
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import get_cache_dir
+from ..core.wc_db import read_node_states
+
+# 缓存数据库文件名
+CACHE_DB_NAME = "diff_cache.sqlite"
+
+# 默认的内存和磁盘缓存上限（MB）
+DEFAULT_MAX_MEMORY_MB = 16
+DEFAULT_MAX_DISK_MB = 64
+
+# sqlite 加锁等待时间（秒）
+DB_TIMEOUT = 1.0
+
+# 批量读取时每条 SQL 语句的路径数量（sqlite 参数个数有上限）
+QUERY_CHUNK = 500
+
+# 校验键中各字段的分隔符
+KEY_SEPARATOR = "\t"
+
+
+class DiffCache:
+    """svn diff 结果缓存（内存 LRU + sqlite，磁盘数据使用 zlib 压缩）"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+        max_disk_mb: float = DEFAULT_MAX_DISK_MB,
+    ):
+        """
+        初始化 diff 缓存
+
+        Args:
+            db_path: 数据库文件路径，为 None 时使用用户缓存目录
+            max_memory_mb: 内存缓存上限（按 diff 文本长度估算）
+            max_disk_mb: 磁盘缓存上限（按压缩后的大小计算）
+        """
+        self._db_path = db_path or get_cache_dir() / CACHE_DB_NAME
+        self._max_memory = int(max_memory_mb * 1024 * 1024)
+        self._max_disk = int(max_disk_mb * 1024 * 1024)
+        # 绝对路径 -> (校验键, diff)
+        self._memory: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute_keys(self, file_paths: List[str], wc_path: Optional[Path] = None) -> Dict[str, str]:
+        """
+        计算文件当前的校验键
+
+        目录、不存在的文件以及未版本化的文件不参与缓存，不包含在结果中。
+
+        Args:
+            file_paths: 文件路径列表（相对于 wc_path）
+            wc_path: 工作目录，为 None 时使用当前目录
+
+        Returns:
+            文件路径 -> 校验键
+        """
+        wc_path = wc_path or Path.cwd()
+        stats: Dict[str, os.stat_result] = {}
+        for file_path in file_paths:
+            try:
+                stat = os.stat(os.path.join(wc_path, file_path))
+            except OSError:
+                continue
+            # 目录的 diff 包含其下所有文件，无法用目录自身的 stat 校验
+            if S_ISREG(stat.st_mode):
+                stats[file_path] = stat
+
+        if not stats:
+            return {}
+        node_states = read_node_states(wc_path, list(stats))
+        if node_states is None:
+            return {}
+
+        keys = {}
+        for file_path, stat in stats.items():
+            node_state = node_states.get(file_path)
+            if node_state is not None:
+                keys[file_path] = KEY_SEPARATOR.join(
+                    (file_path, str(stat.st_mtime_ns), str(stat.st_size), node_state)
+                )
+        return keys
+
+    def get_many(self, keys: Dict[str, str], wc_path: Optional[Path] = None) -> Dict[str, str]:
+        """
+        读取与校验键匹配的 diff（先查内存，再查磁盘）
+
+        Args:
+            keys: compute_keys 返回的文件路径 -> 校验键
+            wc_path: 工作目录，为 None 时使用当前目录
+
+        Returns:
+            命中的文件路径 -> diff
+        """
+        wc_path = wc_path or Path.cwd()
+        result: Dict[str, str] = {}
+        pending: Dict[str, Tuple[str, str]] = {}
+        with self._lock:
+            for file_path, key in keys.items():
+                abs_path = os.path.abspath(os.path.join(wc_path, file_path))
+                cached = self._memory.get(abs_path)
+                if cached is not None and cached[0] == key:
+                    self._memory.move_to_end(abs_path)
+                    result[file_path] = cached[1]
+                else:
+                    pending[abs_path] = (file_path, key)
+
+        loaded = self._load(pending) if pending else {}
+        with self._lock:
+            for abs_path, diff in loaded.items():
+                file_path, key = pending[abs_path]
+                result[file_path] = diff
+                self._remember(abs_path, key, diff)
+            self.hits += len(result)
+            self.misses += len(keys) - len(result)
+        return result
+
+    def put_many(
+        self, entries: Dict[str, Tuple[str, str]], wc_path: Optional[Path] = None
+    ) -> None:
+        """
+        保存 diff 并淘汰最久未使用的条目
+
+        Args:
+            entries: 文件路径 -> (校验键, diff)
+            wc_path: 工作目录，为 None 时使用当前目录
+        """
+        if not entries:
+            return
+        wc_path = wc_path or Path.cwd()
+        rows = []
+        now = time.time()
+        for file_path, (key, diff) in entries.items():
+            abs_path = os.path.abspath(os.path.join(wc_path, file_path))
+            with self._lock:
+                self._remember(abs_path, key, diff)
+            data = zlib.compress(diff.encode("utf-8"))
+            rows.append((abs_path, key, now, len(data), data))
+
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO diffs (path, key, used_at, size, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict_disk(conn)
+        except (sqlite3.Error, OSError) as e:
+            print(f"警告: 无法保存 diff 缓存: {e}", file=sys.stderr)
+
+    def _load(self, pending: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """从磁盘读取与校验键匹配的 diff，并更新最近使用时间"""
+        loaded: Dict[str, str] = {}
+        abs_paths = list(pending)
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(abs_paths), QUERY_CHUNK):
+                    chunk = abs_paths[start : start + QUERY_CHUNK]
+                    placeholders = ", ".join("?" * len(chunk))
+                    for abs_path, key, data in conn.execute(
+                        f"SELECT path, key, data FROM diffs WHERE path IN ({placeholders})",
+                        chunk,
+                    ):
+                        if key == pending[abs_path][1]:
+                            loaded[abs_path] = zlib.decompress(data).decode("utf-8")
+                if loaded:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE diffs SET used_at = ? WHERE path = ?",
+                        [(now, abs_path) for abs_path in loaded],
+                    )
+        except (sqlite3.Error, OSError, zlib.error, UnicodeDecodeError) as e:
+            print(f"警告: 无法读取 diff 缓存: {e}", file=sys.stderr)
+        return loaded
+
+    def _remember(self, abs_path: str, key: str, diff: str) -> None:
+        """加入内存缓存（超过上限时淘汰最久未使用的条目，调用方须持有 _lock）"""
+        previous = self._memory.pop(abs_path, None)
+        if previous is not None:
+            self._memory_size -= len(previous[1])
+        if len(diff) > self._max_memory:
+            return
+        self._memory[abs_path] = (key, diff)
+        self._memory_size += len(diff)
+        while self._memory_size > self._max_memory:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _evict_disk(self, conn: sqlite3.Connection) -> None:
+        """删除最久未使用的条目，使磁盘缓存不超过上限"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM diffs").fetchone()[0]
+        if total <= self._max_disk:
+            return
+        kept = 0
+        expired = []
+        for abs_path, size in conn.execute("SELECT path, size FROM diffs ORDER BY used_at DESC"):
+            kept += size
+            if kept > self._max_disk:
+                expired.append((abs_path,))
+        conn.executemany("DELETE FROM diffs WHERE path = ?", expired)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接（事务结束后提交并关闭），并确保表结构存在"""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._db_path), timeout=DB_TIMEOUT)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS diffs ("
+                    "path TEXT PRIMARY KEY, key TEXT, used_at REAL, size INTEGER, data BLOB)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+
+# 全局单例实例（内存缓存在多次生成之间保留）
+_global_diff_cache: Optional[DiffCache] = None
+_global_diff_cache_lock = threading.Lock()
+
+
+def get_diff_cache(
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB, max_disk_mb: float = DEFAULT_MAX_DISK_MB
+) -> DiffCache:
+    """
+    获取全局 diff 缓存实例
+
+    Args:
+        max_memory_mb: 内存缓存上限（仅在首次创建时生效）
+        max_disk_mb: 磁盘缓存上限（仅在首次创建时生效）
+
+    Returns:
+        全局 diff 缓存实例
+    """
+    global _global_diff_cache
+    with _global_diff_cache_lock:
+        if _global_diff_cache is None:
+            _global_diff_cache = DiffCache(max_memory_mb=max_memory_mb, max_disk_mb=max_disk_mb)
+        return _global_diff_cache
@@ -0,0 +1,305 @@
+"""
+按 token 预算生成 diff 摘要
+
+在本地估算 token 数，按 diff 大小和文件重要程度把总预算分配给各文件：
+每个文件优先保留 hunk 头和变更行，预算有剩余时再保留靠近变更的上下文行；
+分不到足够预算的文件只保留一行增删统计。无论选中多少文件，摘要大小都不超过预算。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# 默认的摘要 token 预算
+DEFAULT_MAX_DIFF_TOKENS = 3000
+
+# 单个文件至少需要的 token 数，分不到时只保留统计行
+MIN_FILE_TOKENS = 40
+
+# 统计行最多占用的预算比例（其余用于 diff 内容）
+STATS_BUDGET_RATIO = 0.25
+
+# 低优先级文件（资源、生成文件等）的权重，普通文件为 1.0
+LOW_PRIORITY_WEIGHT = 0.25
+LOW_PRIORITY_SUFFIXES = (
+    ".meta",
+    ".prefab",
+    ".unity",
+    ".asset",
+    ".mat",
+    ".anim",
+    ".controller",
+    ".lock",
+    ".min.js",
+    ".map",
+    ".svg",
+)
+
+# 行类型
+LINE_HEADER = 0  # svn 文件头（Index:、===、---、+++），摘要中省略
+LINE_HUNK = 1  # hunk 头（@@ ... @@）
+LINE_CHANGE = 2  # 增删行、属性变化
+LINE_CONTEXT = 3  # 上下文行
+LINE_PROPERTY = 4  # 属性变化起始行（Property changes on:）
+
+# 省略标记
+OMITTED_MARK = "..."
+
+# svn diff 中属性变化的起始标记
+PROPERTY_HEADER = "Property changes on: "
+
+# svn diff 中标记二进制文件的内容
+BINARY_MARK = "Cannot display: file marked as a binary type."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    在本地粗略估算文本的 token 数（ASCII 约 4 个字符一个 token，其他字符各算一个）
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的 token 数
+    """
+    ascii_count = len(text.encode("ascii", "ignore"))
+    return (ascii_count + 3) // 4 + len(text) - ascii_count
+
+
+class FileDiffSummary:
+    """单个文件的 diff 解析结果"""
+
+    __slots__ = ("path", "lines", "kinds", "costs", "added", "removed", "binary", "weight")
+
+    def __init__(self, path: str, diff: str):
+        """
+        解析 diff
+
+        Args:
+            path: 文件路径
+            diff: svn diff 输出
+        """
+        self.path = path
+        self.lines: List[str] = []
+        self.kinds: List[int] = []
+        self.costs: List[int] = []
+        self.added = 0
+        self.removed = 0
+        self.binary = False
+        self.weight = (
+            LOW_PRIORITY_WEIGHT if path.lower().endswith(LOW_PRIORITY_SUFFIXES) else 1.0
+        )
+
+        in_hunk = False
+        for line in diff.splitlines():
+            kind = _classify_line(line, in_hunk)
+            if kind == LINE_HUNK:
+                in_hunk = True
+            elif kind == LINE_PROPERTY:
+                # 属性变化不计入增删行数
+                in_hunk = False
+                kind = LINE_CHANGE
+            elif kind == LINE_HEADER:
+                in_hunk = False
+                if line == BINARY_MARK:
+                    self.binary = True
+                continue
+            elif kind == LINE_CHANGE and in_hunk:
+                if line.startswith("+"):
+                    self.added += 1
+                elif line.startswith("-"):
+                    self.removed += 1
+            self.lines.append(line)
+            self.kinds.append(kind)
+            self.costs.append(estimate_tokens(line) + 1)
+
+    def header(self) -> str:
+        """文件标题行"""
+        return f"文件: {self.path} (+{self.added} -{self.removed})"
+
+    def stat_line(self) -> str:
+        """只保留统计时使用的行"""
+        suffix = "，二进制文件" if self.binary else ""
+        return f"- {self.path} (+{self.added} -{self.removed}{suffix})"
+
+    def full_cost(self) -> int:
+        """完整保留所有行需要的 token 数（含标题）"""
+        return estimate_tokens(self.header()) + 4 + sum(self.costs)
+
+    def render(self, budget: int) -> Optional[str]:
+        """
+        在预算内生成该文件的摘要
+
+        优先保留 hunk 头和变更行（按出现顺序），然后按与变更行的距离由近到远加入上下文行，
+        连续省略的行以 "..." 表示。
+
+        Args:
+            budget: token 预算（含标题）
+
+        Returns:
+            摘要文本，预算不足以保留任何变更时返回 None
+        """
+        budget -= estimate_tokens(self.header()) + 4
+        if budget <= 0 or not self.lines:
+            return None
+
+        if sum(self.costs) <= budget:
+            keep = [True] * len(self.lines)
+        else:
+            keep = self._select_lines(budget)
+            if not any(keep):
+                return None
+
+        body: List[str] = []
+        omitted = False
+        for line, kept in zip(self.lines, keep):
+            if kept:
+                body.append(line)
+                omitted = False
+            elif not omitted:
+                body.append(OMITTED_MARK)
+                omitted = True
+        return f"{self.header()}\n变更内容:\n" + "\n".join(body)
+
+    def _select_lines(self, budget: int) -> List[bool]:
+        """在预算内选择要保留的行"""
+        keep = [False] * len(self.lines)
+        mark_cost = estimate_tokens(OMITTED_MARK) + 1
+
+        # 1. hunk 头和变更行（预算不足时截断在最后一个完整的行）
+        for idx, kind in enumerate(self.kinds):
+            if kind == LINE_CONTEXT:
+                continue
+            cost = self.costs[idx] + mark_cost
+            if cost > budget:
+                return keep
+            keep[idx] = True
+            budget -= cost
+
+        # 2. 上下文行，按与最近变更行的距离由近到远
+        for _, idx in sorted(self._context_distances()):
+            if self.costs[idx] > budget:
+                break
+            keep[idx] = True
+            budget -= self.costs[idx]
+        return keep
+
+    def _context_distances(self) -> List[Tuple[int, int]]:
+        """计算每个上下文行到同一 hunk 内最近变更行的距离，返回 (距离, 行号) 列表"""
+        count = len(self.kinds)
+        distances = [count] * count
+        last = None
+        for idx, kind in enumerate(self.kinds):
+            if kind == LINE_HUNK:
+                last = None
+            elif kind == LINE_CHANGE:
+                last = idx
+            elif last is not None:
+                distances[idx] = idx - last
+        last = None
+        for idx in range(count - 1, -1, -1):
+            kind = self.kinds[idx]
+            if kind == LINE_HUNK:
+                last = None
+            elif kind == LINE_CHANGE:
+                last = idx
+            elif last is not None:
+                distances[idx] = min(distances[idx], last - idx)
+        return [
+            (distances[idx], idx) for idx, kind in enumerate(self.kinds) if kind == LINE_CONTEXT
+        ]
+
+
+def summarize_diffs(
+    files_with_diff: List[Dict[str, str]], max_tokens: int = DEFAULT_MAX_DIFF_TOKENS
+) -> str:
+    """
+    按 token 预算生成多个文件的 diff 摘要
+
+    Args:
+        files_with_diff: 包含 path 和 diff 的字典列表
+        max_tokens: 摘要的 token 预算
+
+    Returns:
+        diff 摘要字符串（没有任何 diff 时返回空字符串）
+    """
+    files = [
+        FileDiffSummary(file_info.get("path", ""), file_info["diff"])
+        for file_info in files_with_diff
+        if file_info.get("diff")
+    ]
+    if not files:
+        return ""
+
+    stat_costs = [estimate_tokens(file.stat_line()) + 1 for file in files]
+    detail_budget = max_tokens - min(sum(stat_costs), int(max_tokens * STATS_BUDGET_RATIO))
+    demands = [0 if file.binary else file.full_cost() for file in files]
+    allocations = allocate_budget(demands, [file.weight for file in files], detail_budget)
+
+    parts: List[str] = []
+    stat_only: List[int] = []
+    used = 0
+    for idx, (file, allocation) in enumerate(zip(files, allocations)):
+        # 能完整保留的小文件不受最小预算限制
+        fits = allocation >= min(MIN_FILE_TOKENS, demands[idx])
+        text = file.render(allocation) if fits else None
+        if text is None:
+            stat_only.append(idx)
+        else:
+            parts.append(text)
+            used += estimate_tokens(text) + 2
+
+    if stat_only:
+        stats_budget = max_tokens - used
+        stats = ["其他文件（仅统计）:"]
+        stats_budget -= estimate_tokens(stats[0]) + 1
+        for listed, idx in enumerate(stat_only):
+            if stat_costs[idx] > stats_budget:
+                stats.append(f"... 另有 {len(stat_only) - listed} 个文件")
+                break
+            stats.append(files[idx].stat_line())
+            stats_budget -= stat_costs[idx]
+        parts.append("\n".join(stats))
+
+    return "\n\n".join(parts)
+
+
+def allocate_budget(demands: List[int], weights: List[float], budget: int) -> List[int]:
+    """
+    按权重分配预算：需求小于公平份额的文件获得全部需求，剩余预算继续按权重分给其他文件
+
+    Args:
+        demands: 每个文件完整保留需要的 token 数
+        weights: 每个文件的权重
+        budget: 总预算
+
+    Returns:
+        每个文件分到的 token 数
+    """
+    allocations = [0] * len(demands)
+    remaining_weight = sum(weights)
+    # 按单位权重的需求从小到大分配
+    order = sorted(range(len(demands)), key=lambda idx: demands[idx] / weights[idx])
+    for idx in order:
+        if remaining_weight <= 0 or budget <= 0:
+            break
+        share = int(budget * weights[idx] / remaining_weight)
+        allocations[idx] = min(demands[idx], share)
+        budget -= allocations[idx]
+        remaining_weight -= weights[idx]
+    return allocations
+
+
+def _classify_line(line: str, in_hunk: bool) -> int:
+    """判断 diff 行的类型"""
+    if line.startswith("@@"):
+        return LINE_HUNK
+    if line.startswith(PROPERTY_HEADER):
+        return LINE_PROPERTY
+    if in_hunk:
+        if line.startswith(("+", "-")):
+            return LINE_CHANGE
+        if line.startswith((" ", "\\")) or not line:
+            return LINE_CONTEXT
+    if line.startswith(("Index: ", "=====", "____", "--- ", "+++ ")) or line == BINARY_MARK:
+        return LINE_HEADER
+    # 属性变化内容（Added: svn:eol-style 等）
+    return LINE_CHANGE
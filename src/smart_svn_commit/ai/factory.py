@@ -2,11 +2,23 @@
 提交消息生成工厂 - 协调 AI 和降级方案
 """
 
-from typing import List
+from typing import Callable, Dict, List, Optional
 
+from ..core.config import load_config
 from .diff import get_multiple_files_diff
 from .fallback import generate_commit_message_by_keywords
-from .generator import DEFAULT_MESSAGE, generate_commit_message_with_ai
+from .generator import DEFAULT_MESSAGE, is_ai_api_ready, request_commit_message
+from .map_reduce import should_map_reduce, summarize_groups
+
+# 生成阶段（on_progress 回调的参数）
+STAGE_COLLECTING_DIFFS = "collecting_diffs"
+STAGE_SUMMARIZING_GROUPS = "summarizing_groups"
+STAGE_CALLING_API = "calling_api"
+STAGE_FALLBACK = "fallback"
+
+# 提交消息来源（另有 generator 中的 SOURCE_AI、SOURCE_CACHE）
+SOURCE_KEYWORDS = "keywords"
+SOURCE_DEFAULT = "default"
 
 
 def generate_commit_message(files: List[str]) -> str:
@@ -20,15 +32,73 @@ def generate_commit_message(files: List[str]) -> str:
     Returns:
         生成的提交消息字符串
     """
+    result = generate_commit_message_result(files)
+    return result["message"] if result is not None else DEFAULT_MESSAGE
+
+
+def generate_commit_message_result(
+    files: List[str],
+    on_delta: Optional[Callable[[str], None]] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    生成提交消息并返回其来源，可报告进度和取消
+
+    AI 未启用或未配置时不获取 diff，直接使用关键词匹配。文件很多且 diff 超出单个提示词的预算时，
+    先按目录分组并发概括，再用各组概括生成提交消息（见 map_reduce 模块）。
+
+    Args:
+        files: 选中的文件路径列表
+        on_delta: 流式接收回调（可选），AI 每返回一段文本调用一次；
+            最终结果以返回值为准（AI 失败时会降级为关键词匹配的结果）
+        on_progress: 进入新阶段时调用（可选），参数为 STAGE_* 常量
+        should_cancel: 返回 True 时尽快停止（终止 svn diff、关闭 AI 响应）
+
+    Returns:
+        包含 message 和 source（generator.SOURCE_AI、generator.SOURCE_CACHE、
+        SOURCE_KEYWORDS 或 SOURCE_DEFAULT）的字典，取消时返回 None
+    """
     if not files:
-        return DEFAULT_MESSAGE
+        return {"message": DEFAULT_MESSAGE, "source": SOURCE_DEFAULT}
+
+    def cancelled() -> bool:
+        return should_cancel is not None and should_cancel()
+
+    def report(stage: str) -> None:
+        if on_progress is not None:
+            on_progress(stage)
+
+    config = load_config()
+    api_config = config.get("aiApi", {})
+    if is_ai_api_ready(api_config):
+        report(STAGE_COLLECTING_DIFFS)
+        files_with_diff = get_multiple_files_diff(files, should_cancel)
+        if cancelled():
+            return None
 
-    files_with_diff = get_multiple_files_diff(files)
+        # 变更集很大时先分组概括（失败时仍使用按预算截断的 diff 摘要）
+        diff_summary = None
+        if should_map_reduce(files_with_diff, api_config):
+            report(STAGE_SUMMARIZING_GROUPS)
+            diff_summary = summarize_groups(files_with_diff, config, should_cancel)
+            if cancelled():
+                return None
 
-    # 尝试使用 AI API 生成
-    api_message = generate_commit_message_with_ai(files_with_diff)
-    if api_message != DEFAULT_MESSAGE:
-        return api_message
+        # 尝试使用 AI API 生成（可能直接命中响应缓存）
+        report(STAGE_CALLING_API)
+        api_result = request_commit_message(
+            files_with_diff,
+            config,
+            on_delta=on_delta,
+            should_cancel=should_cancel,
+            diff_summary=diff_summary,
+        )
+        if cancelled():
+            return None
+        if api_result is not None:
+            return api_result
 
     # 降级到关键词匹配
-    return generate_commit_message_by_keywords(files)
+    report(STAGE_FALLBACK)
+    return {"message": generate_commit_message_by_keywords(files), "source": SOURCE_KEYWORDS}
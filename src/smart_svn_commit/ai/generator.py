@@ -3,23 +3,36 @@ AI 提交消息生成器
 """
 
 import sys
-from typing import Any, Dict, List
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-# OpenAI SDK 导入
+# OpenAI SDK 导入（httpx 是 openai 的依赖，用于配置连接池）
 try:
+    import httpx
     from openai import OpenAI as OpenAIClient
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
 from ..core.config import load_config
+from .diff_summary import DEFAULT_MAX_DIFF_TOKENS, summarize_diffs
+from .response_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_HOURS, ResponseCache, make_cache_key
 
 # 默认常量
 DEFAULT_MESSAGE = "chore: 提交变更"
-DEFAULT_MAX_DIFF_LENGTH = 2000
 DEFAULT_TEMPERATURE = 0.3
 DEFAULT_MAX_TOKENS = 200
 DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+# AI 提交消息的来源：本次调用 API / 响应缓存
+SOURCE_AI = "ai"
+SOURCE_CACHE = "cache"
+
+# 客户端注册表：同一组连接参数在进程内复用一个客户端（连接池和 TLS 会话随之复用）
+_clients: Dict[Tuple[str, str, float, int, float], "OpenAIClient"] = {}
+_clients_lock = threading.Lock()
 
 # 默认提示词
 DEFAULT_SYSTEM_PROMPT = """你是一个专业的代码提交消息生成助手。请根据代码的 diff 内容生成符合 Conventional Commits 格式的提交消息。
@@ -40,7 +53,10 @@ DEFAULT_USER_TEMPLATE = """请根据以下代码变更生成提交消息：
 
 
 def generate_commit_message_with_ai(
-    files_with_diff: List[Dict[str, str]], config: Dict[str, Any] | None = None
+    files_with_diff: List[Dict[str, str]],
+    config: Dict[str, Any] | None = None,
+    on_delta: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
 ) -> str:
     """
     使用 OpenAI SDK 生成提交消息
@@ -48,33 +64,52 @@ def generate_commit_message_with_ai(
     Args:
         files_with_diff: 包含 path 和 diff 的字典列表
         config: 配置字典（可选，如果为 None 则自动加载）
+        on_delta: 流式接收回调（可选），每收到一段文本调用一次
+        should_cancel: 返回 True 时停止接收流式响应（可选）
 
     Returns:
         生成的提交消息，如果失败则返回默认消息
     """
+    result = request_commit_message(files_with_diff, config, on_delta, should_cancel)
+    return result["message"] if result is not None else DEFAULT_MESSAGE
+
+
+def request_commit_message(
+    files_with_diff: List[Dict[str, str]],
+    config: Dict[str, Any] | None = None,
+    on_delta: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    diff_summary: Optional[str] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    使用 OpenAI SDK 生成提交消息，并标明结果是否来自响应缓存
+
+    Args:
+        files_with_diff: 包含 path 和 diff 的字典列表
+        config: 配置字典（可选，如果为 None 则自动加载）
+        on_delta: 流式接收回调（可选），每收到一段文本调用一次
+        should_cancel: 返回 True 时停止接收流式响应（可选）
+        diff_summary: 代替 diff 摘要填入提示词的内容（可选，如分组概括的结果）
+
+    Returns:
+        包含 message 和 source（SOURCE_AI 或 SOURCE_CACHE）的字典，
+        未配置、没有 diff 或调用失败时返回 None
+    """
     if config is None:
         config = load_config()
 
     # 检查 API 配置
     api_config = config.get("aiApi", {})
-    if not api_config.get("enabled", False):
-        return DEFAULT_MESSAGE
-
-    if not OPENAI_AVAILABLE:
-        print("OpenAI SDK 未安装，请运行: pip install openai", file=sys.stderr)
-        return DEFAULT_MESSAGE
-
-    base_url = api_config.get("baseUrl", "")
-    api_key = api_config.get("apiKey", "")
-    model = api_config.get("model", "gpt-3.5-turbo")
-
-    if not base_url or not api_key:
-        return DEFAULT_MESSAGE
+    if not is_ai_api_ready(api_config):
+        return None
 
     # 构建 diff 摘要
-    diff_summary = _build_diff_summary(files_with_diff)
+    if diff_summary is None:
+        diff_summary = _build_diff_summary(
+            files_with_diff, api_config.get("maxDiffTokens", DEFAULT_MAX_DIFF_TOKENS)
+        )
     if not diff_summary:
-        return DEFAULT_MESSAGE
+        return None
 
     # 获取提示词
     prompts_config = api_config.get("prompts", {})
@@ -82,49 +117,132 @@ def generate_commit_message_with_ai(
     user_template = prompts_config.get("user", DEFAULT_USER_TEMPLATE)
     user_prompt = user_template.format(diff_summary=diff_summary)
 
+    return request_completion(config, system_prompt, user_prompt, on_delta, should_cancel)
+
+
+def request_completion(
+    config: Dict[str, Any],
+    system_prompt: str,
+    user_prompt: str,
+    on_delta: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    调用 API 完成一次对话请求（先查询响应缓存）
+
+    启用响应缓存（responseCache）时，模型和提示词完全相同的请求直接返回缓存结果
+    （通过 on_delta 一次性发送）；API 成功返回后写入缓存，取消时不写入。
+
+    Args:
+        config: 配置字典（aiApi 须已通过 is_ai_api_ready 检查）
+        system_prompt: 系统提示词
+        user_prompt: 用户提示词
+        on_delta: 流式接收回调（可选），每收到一段文本调用一次
+        should_cancel: 返回 True 时停止接收流式响应（可选）
+
+    Returns:
+        包含 message 和 source（SOURCE_AI 或 SOURCE_CACHE）的字典，调用失败或取消时返回 None
+    """
+    api_config = config.get("aiApi", {})
+    base_url = api_config.get("baseUrl", "")
+    api_key = api_config.get("apiKey", "")
+    model = api_config.get("model", "gpt-3.5-turbo")
+
+    # 查询响应缓存
+    cache: Optional[ResponseCache] = None
+    cache_key = ""
+    cache_config = config.get("responseCache", {})
+    if cache_config.get("enabled", True):
+        cache = ResponseCache(
+            ttl_hours=cache_config.get("ttlHours", DEFAULT_TTL_HOURS),
+            max_entries=cache_config.get("maxEntries", DEFAULT_MAX_ENTRIES),
+        )
+        cache_key = make_cache_key(model, system_prompt, user_prompt)
+        cached = cache.load(cache_key)
+        if cached is not None:
+            if on_delta is not None:
+                on_delta(cached)
+            return {"message": cached, "source": SOURCE_CACHE}
+
     # 调用 API
-    return _call_openai_api(base_url, api_key, model, system_prompt, user_prompt)
+    message = _call_openai_api(
+        base_url, api_key, model, system_prompt, user_prompt, on_delta, should_cancel, api_config
+    )
+    if message is None or (should_cancel is not None and should_cancel()):
+        return None
 
+    if cache is not None:
+        cache.save(cache_key, message)
+    return {"message": message, "source": SOURCE_AI}
 
-def _build_diff_summary(files_with_diff: List[Dict[str, str]]) -> str:
+
+def is_ai_api_ready(api_config: Dict[str, Any]) -> bool:
+    """
+    检查 AI API 是否已启用且配置完整（SDK 未安装时输出提示）
+
+    Args:
+        api_config: 配置中的 aiApi 部分
+
+    Returns:
+        是否可以调用 API
+    """
+    if not api_config.get("enabled", False):
+        return False
+
+    if not OPENAI_AVAILABLE:
+        print("OpenAI SDK 未安装，请运行: pip install openai", file=sys.stderr)
+        return False
+
+    return bool(api_config.get("baseUrl", "") and api_config.get("apiKey", ""))
+
+
+def _build_diff_summary(
+    files_with_diff: List[Dict[str, str]], max_tokens: int = DEFAULT_MAX_DIFF_TOKENS
+) -> str:
     """
-    构建 diff 摘要字符串
+    构建 diff 摘要字符串（总长度受 token 预算限制，见 diff_summary 模块）
 
     Args:
         files_with_diff: 包含 path 和 diff 的字典列表
+        max_tokens: 摘要的 token 预算
 
     Returns:
         diff 摘要字符串
     """
-    diff_parts = []
-    for file_info in files_with_diff:
-        diff = file_info.get("diff", "")
-        if diff:
-            path = file_info.get("path", "")
-            truncated_diff = diff[:DEFAULT_MAX_DIFF_LENGTH]
-            diff_parts.append(f"文件: {path}\n变更内容:\n{truncated_diff}")
-
-    return "\n\n".join(diff_parts)
+    return summarize_diffs(files_with_diff, max_tokens)
 
 
 def _call_openai_api(
-    base_url: str, api_key: str, model: str, system_prompt: str, user_prompt: str
-) -> str:
+    base_url: str,
+    api_key: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    on_delta: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    api_config: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
     """
     调用 OpenAI API 生成提交消息
 
+    提供 on_delta 时使用流式响应（stream=True），每收到一段文本就回调一次，
+    界面可以在首个 token 到达时就开始显示。
+
     Args:
         base_url: API 基础 URL
         api_key: API 密钥
         model: 模型名称
         system_prompt: 系统提示词
         user_prompt: 用户提示词
+        on_delta: 流式接收回调（可选）
+        should_cancel: 返回 True 时停止接收流式响应（可选）
+        api_config: 配置中的 aiApi 部分（可选，用于读取超时和连接池参数）
 
     Returns:
-        生成的提交消息，失败时返回默认消息
+        生成的提交消息，调用失败或返回内容为空时返回 None
     """
     try:
-        client = OpenAIClient(api_key=api_key, base_url=base_url)
+        client = get_openai_client(base_url, api_key, api_config or {})
         response = client.chat.completions.create(
             model=model,
             messages=[
@@ -133,11 +251,17 @@ def _call_openai_api(
             ],
             temperature=DEFAULT_TEMPERATURE,
             max_tokens=DEFAULT_MAX_TOKENS,
-            timeout=DEFAULT_TIMEOUT,
+            stream=on_delta is not None,
         )
 
-        if response.choices and response.choices[0].message.content:
+        if on_delta is not None:
+            content = _read_stream(response, on_delta, should_cancel)
+        elif response.choices:
             content = response.choices[0].message.content
+        else:
+            content = None
+
+        if content:
             message = content.strip("\"'").strip()
             if message:
                 return message
@@ -153,4 +277,83 @@ def _call_openai_api(
         else:
             print(f"API 调用失败: {error_msg}", file=sys.stderr)
 
-    return DEFAULT_MESSAGE
+    return None
+
+
+def get_openai_client(base_url: str, api_key: str, api_config: Dict[str, Any]) -> "OpenAIClient":
+    """
+    获取复用的 OpenAI 客户端（按 baseUrl、apiKey 和连接参数缓存，线程安全）
+
+    客户端在进程生命周期内复用，后续请求沿用已建立的 keep-alive 连接，
+    不必每次重新建立 TCP 连接和 TLS 握手。
+
+    Args:
+        base_url: API 基础 URL
+        api_key: API 密钥
+        api_config: 配置中的 aiApi 部分（timeout、maxConnections、keepAliveExpiry）
+
+    Returns:
+        OpenAI 客户端
+    """
+    timeout = float(api_config.get("timeout", DEFAULT_TIMEOUT))
+    max_connections = int(api_config.get("maxConnections", DEFAULT_MAX_CONNECTIONS))
+    keepalive_expiry = float(api_config.get("keepAliveExpiry", DEFAULT_KEEPALIVE_EXPIRY))
+    key = (base_url, api_key, timeout, max_connections, keepalive_expiry)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            http_client = httpx.Client(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+            client = OpenAIClient(
+                api_key=api_key, base_url=base_url, timeout=timeout, http_client=http_client
+            )
+            _clients[key] = client
+        return client
+
+
+def close_openai_clients() -> None:
+    """关闭并清空所有复用的客户端（释放连接池，窗口关闭时调用）"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def _read_stream(
+    stream: Any,
+    on_delta: Callable[[str], None],
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> str:
+    """
+    读取流式响应，逐段回调并返回完整文本
+
+    Args:
+        stream: chat.completions.create(stream=True) 返回的流
+        on_delta: 每收到一段文本调用一次
+        should_cancel: 返回 True 时停止读取并关闭连接（可选）
+
+    Returns:
+        已收到的完整文本
+    """
+    parts: List[str] = []
+    try:
+        for chunk in stream:
+            if should_cancel is not None and should_cancel():
+                break
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                on_delta(text)
+    finally:
+        stream.close()
+    return "".join(parts)
@@ -0,0 +1,180 @@
+"""
+大变更集的分组概括（map-reduce）
+
+选中文件很多时，单个提示词要么超出模型上下文，要么被截断得只剩统计行。
+这里先按目录把文件分成若干组，并发地让 AI 为每组写一两句概括（map），
+再把各组概括作为 diff 摘要交给常规的提交消息生成（reduce）。
+组数和并发数都有上限，总耗时取决于最慢的一组，而不是 diff 的总大小。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .diff_summary import FileDiffSummary, summarize_diffs
+from .generator import DEFAULT_MAX_DIFF_TOKENS, request_completion
+
+# 默认配置（aiApi.mapReduce）
+DEFAULT_MIN_FILES = 50
+DEFAULT_GROUP_MAX_TOKENS = 2000
+DEFAULT_MAX_GROUPS = 8
+DEFAULT_MAX_WORKERS = 8
+
+# 分组概括使用的提示词
+MAP_SYSTEM_PROMPT = """你是一个代码变更分析助手。请用一到两句中文概括给定代码变更的目的和主要内容。
+
+只返回概括本身，不要使用提交消息格式，不要包含任何解释或额外内容。"""
+
+MAP_USER_TEMPLATE = """以下是 {group} 下 {count} 个文件的变更：
+
+{diff_summary}"""
+
+# 分组中的文件：(包含 path 和 diff 的字典, 解析结果)
+GroupedFile = Tuple[Dict[str, str], FileDiffSummary]
+
+
+def should_map_reduce(files_with_diff: List[Dict[str, str]], api_config: Dict[str, Any]) -> bool:
+    """
+    判断是否改用分组概括：文件数达到 minFiles，且 diff 总量超出单个提示词的预算
+
+    Args:
+        files_with_diff: 包含 path 和 diff 的字典列表
+        api_config: 配置中的 aiApi 部分
+
+    Returns:
+        是否使用分组概括
+    """
+    map_config = api_config.get("mapReduce", {})
+    if not map_config.get("enabled", True):
+        return False
+
+    changed = [file_info for file_info in files_with_diff if file_info.get("diff")]
+    if len(changed) < map_config.get("minFiles", DEFAULT_MIN_FILES):
+        return False
+
+    budget = api_config.get("maxDiffTokens", DEFAULT_MAX_DIFF_TOKENS)
+    total = 0
+    for file_info in changed:
+        total += FileDiffSummary(file_info["path"], file_info["diff"]).full_cost()
+        if total > budget:
+            return True
+    return False
+
+
+def group_files(
+    files_with_diff: List[Dict[str, str]], group_max_tokens: int, max_groups: int
+) -> List[List[GroupedFile]]:
+    """
+    按路径排序后把文件依次装入各组，同一目录的文件尽量在同一组
+
+    每组的 diff 总量以 group_max_tokens 为目标，组数超过 max_groups 时按比例放大目标；
+    当前组已过半且所在目录变化时提前开始新的一组。
+
+    Args:
+        files_with_diff: 包含 path 和 diff 的字典列表
+        group_max_tokens: 每组的目标 token 数
+        max_groups: 最多分组数
+
+    Returns:
+        分组列表（组内按路径排序）
+    """
+    files: List[GroupedFile] = sorted(
+        (
+            (file_info, FileDiffSummary(file_info["path"], file_info["diff"]))
+            for file_info in files_with_diff
+            if file_info.get("diff")
+        ),
+        key=lambda item: item[1].path,
+    )
+    costs = [file.full_cost() for _, file in files]
+    target = max(group_max_tokens, sum(costs) // max(max_groups, 1) + 1)
+
+    groups: List[List[GroupedFile]] = []
+    current: List[GroupedFile] = []
+    current_cost = 0
+    for item, cost in zip(files, costs):
+        if current:
+            new_dir = _parent_dir(item[1].path) != _parent_dir(current[-1][1].path)
+            if current_cost + cost > target or (new_dir and current_cost * 2 >= target):
+                groups.append(current)
+                current, current_cost = [], 0
+        current.append(item)
+        current_cost += cost
+    if current:
+        groups.append(current)
+
+    # 单个超大文件可能使组数略超上限，合并最后几组
+    while len(groups) > max_groups > 0:
+        groups[-2].extend(groups.pop())
+    return groups
+
+
+def summarize_groups(
+    files_with_diff: List[Dict[str, str]],
+    config: Dict[str, Any],
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Optional[str]:
+    """
+    并发地为各组生成概括，组合为用于生成提交消息的摘要
+
+    某组概括失败时以该组的增删统计代替；全部失败或取消时返回 None。
+
+    Args:
+        files_with_diff: 包含 path 和 diff 的字典列表
+        config: 配置字典（aiApi 须已通过 is_ai_api_ready 检查）
+        should_cancel: 返回 True 时不再发起新的请求（可选）
+
+    Returns:
+        分组概括摘要，失败或取消时返回 None
+    """
+    map_config = config.get("aiApi", {}).get("mapReduce", {})
+    group_max_tokens = map_config.get("groupMaxTokens", DEFAULT_GROUP_MAX_TOKENS)
+    groups = group_files(
+        files_with_diff, group_max_tokens, map_config.get("maxGroups", DEFAULT_MAX_GROUPS)
+    )
+    if not groups:
+        return None
+
+    def summarize(group: List[GroupedFile]) -> Optional[str]:
+        if should_cancel is not None and should_cancel():
+            return None
+        diff_summary = summarize_diffs([file_info for file_info, _ in group], group_max_tokens)
+        user_prompt = MAP_USER_TEMPLATE.format(
+            group=_group_label(group), count=len(group), diff_summary=diff_summary
+        )
+        result = request_completion(config, MAP_SYSTEM_PROMPT, user_prompt)
+        return result["message"] if result is not None else None
+
+    max_workers = min(map_config.get("maxWorkers", DEFAULT_MAX_WORKERS), len(groups))
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        summaries = list(executor.map(summarize, groups))
+
+    if (should_cancel is not None and should_cancel()) or not any(summaries):
+        return None
+
+    lines = [f"共 {sum(len(group) for group in groups)} 个文件，以下是按目录分组的变更概括："]
+    for group, summary in zip(groups, summaries):
+        added = sum(file.added for _, file in group)
+        removed = sum(file.removed for _, file in group)
+        header = f"- {_group_label(group)}（{len(group)} 个文件，+{added} -{removed}）"
+        lines.append(f"{header}：{summary}" if summary else header)
+    return "\n".join(lines)
+
+
+def _parent_dir(path: str) -> str:
+    """路径所在的目录（没有目录时为空字符串）"""
+    sep_idx = path.replace("\\", "/").rfind("/")
+    return path[:sep_idx] if sep_idx >= 0 else ""
+
+
+def _group_label(group: List[GroupedFile]) -> str:
+    """组内文件的公共目录（没有公共目录时为 "根目录"）"""
+    parts = group[0][1].path.replace("\\", "/").split("/")[:-1]
+    for _, file in group[1:]:
+        other = file.path.replace("\\", "/").split("/")[:-1]
+        common = 0
+        while common < min(len(parts), len(other)) and parts[common] == other[common]:
+            common += 1
+        parts = parts[:common]
+        if not parts:
+            break
+    return "/".join(parts) + "/" if parts else "根目录"
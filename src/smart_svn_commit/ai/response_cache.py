@@ -0,0 +1,135 @@
+"""
+AI 响应缓存
+
+以模型、系统提示词和用户提示词（包含 diff 摘要）的哈希作为缓存键，把 AI 生成的提交消息
+保存到用户缓存目录下的 sqlite 数据库。同一组 diff 再次生成时（重复点击、重新打开窗口、
+--skip-ui 重复运行）直接返回缓存结果。条目超过有效期后失效，数量超过上限时按最近使用淘汰。
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ..core.config import get_cache_dir
+
+# 缓存数据库文件名
+CACHE_DB_NAME = "ai_responses.sqlite"
+
+# 默认有效期（小时）和最多保留的条目数量
+DEFAULT_TTL_HOURS = 24.0
+DEFAULT_MAX_ENTRIES = 200
+
+# sqlite 加锁等待时间（秒）
+DB_TIMEOUT = 1.0
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str) -> str:
+    """
+    计算请求的缓存键
+
+    Args:
+        model: 模型名称
+        system_prompt: 系统提示词
+        user_prompt: 用户提示词（包含 diff 摘要）
+
+    Returns:
+        缓存键（十六进制哈希）
+    """
+    data = json.dumps([model, system_prompt, user_prompt], ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResponseCache:
+    """AI 响应缓存（sqlite 存储）"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        初始化响应缓存
+
+        Args:
+            db_path: 数据库文件路径，为 None 时使用用户缓存目录
+            ttl_hours: 有效期（小时）
+            max_entries: 最多保留的条目数量
+        """
+        self._db_path = db_path or get_cache_dir() / CACHE_DB_NAME
+        self._ttl = ttl_hours * 3600
+        self._max_entries = max_entries
+
+    def load(self, key: str) -> Optional[str]:
+        """
+        读取未过期的缓存结果
+
+        Args:
+            key: make_cache_key 返回的缓存键
+
+        Returns:
+            提交消息，未命中或已过期时返回 None
+        """
+        try:
+            with self._connect() as conn:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT message FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, now - self._ttl),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                return row[0]
+        except (sqlite3.Error, OSError) as e:
+            print(f"警告: 无法读取 AI 响应缓存: {e}", file=sys.stderr)
+            return None
+
+    def save(self, key: str, message: str) -> bool:
+        """
+        保存结果，并删除过期和最久未使用的条目
+
+        Args:
+            key: make_cache_key 返回的缓存键
+            message: 提交消息
+
+        Returns:
+            是否保存成功
+        """
+        try:
+            with self._connect() as conn:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, message, created_at, used_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, message, now, now),
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE created_at < ? OR key NOT IN "
+                    "(SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                    (now - self._ttl, self._max_entries),
+                )
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"警告: 无法保存 AI 响应缓存: {e}", file=sys.stderr)
+            return False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接（事务结束后提交并关闭），并确保表结构存在"""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._db_path), timeout=DB_TIMEOUT)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, message TEXT, created_at REAL, used_at REAL)"
+                )
+                yield conn
+        finally:
+            conn.close()
@@ -11,11 +11,12 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from smart_svn_commit import __version__
-from smart_svn_commit.ai.factory import generate_commit_message
+from smart_svn_commit.ai.factory import generate_commit_message_result
 from smart_svn_commit.core.commit import run_svn_status
 from smart_svn_commit.core.config import get_config_path, init_config, load_config
+from smart_svn_commit.core.entry_store import FileEntryStore
 from smart_svn_commit.core.parser import parse_svn_status
-from smart_svn_commit.utils.filters import apply_ignore_patterns
+from smart_svn_commit.utils.filters import apply_ignore_patterns, filter_entries
 
 # 尝试导入 UI 模块
 try:
@@ -150,6 +151,9 @@ def main() -> int:
     # 跳过 GUI
     smart-svn-commit --files="file1.cs,file2.cs" --skip-ui
 
+    # 只保留路径匹配的文件（语法与界面搜索框相同）
+    svn status | smart-svn-commit --status --grep="*.cs"
+
     # 配置管理
     smart-svn-commit --config init
     smart-svn-commit --config show
@@ -178,6 +182,10 @@ def main() -> int:
 
     parser.add_argument("--no-ignore", action="store_true", help="禁用所有忽略模式")
 
+    parser.add_argument(
+        "--grep", type=str, default="", help="只保留路径匹配的文件（普通文本或通配符，大小写不敏感）"
+    )
+
     parser.add_argument(
         "--config", type=str, choices=["init", "edit", "show"], help="配置管理操作"
     )
@@ -261,7 +269,7 @@ def main() -> int:
             return 1
         # 传入 None 表示异步加载（UI 立即显示，后台加载文件列表）
         print(f"[cli.py] 调用 show_quick_pick(None)", file=sys.stderr)
-        result = show_quick_pick(None)
+        result = show_quick_pick(None, args.grep)
         print(
             f"[cli.py] show_quick_pick 返回: {result.get('cancelled')}", file=sys.stderr
         )
@@ -274,9 +282,10 @@ def main() -> int:
     # 判断是否使用异步加载
     use_async_load = not files and not args.files and not args.status
 
-    # 应用忽略过滤（仅在非异步加载模式下）
+    # 应用忽略过滤和搜索过滤（仅在非异步加载模式下，异步加载时搜索文本交给界面）
     if not use_async_load:
         files = _apply_ignore_filters(files, args)
+        files = _apply_grep_filter(files, args.grep)
         if not files:
             output_result({"selected": [], "commitMessage": "", "cancelled": True})
             return 0
@@ -330,6 +339,23 @@ def _apply_ignore_filters(files: List[Tuple[str, str]], args) -> List[Tuple[str,
     return files
 
 
+def _apply_grep_filter(files: List[Tuple[str, str]], search_text: str) -> List[Tuple[str, str]]:
+    """
+    按搜索文本过滤文件列表（与界面搜索框使用相同的匹配规则）
+
+    Args:
+        files: (状态, 文件路径) 元组列表
+        search_text: 搜索文本，为空时不过滤
+
+    Returns:
+        过滤后的文件列表
+    """
+    if not search_text:
+        return files
+    store = FileEntryStore(files)
+    return store.items(filter_entries(search_text, store))
+
+
 def _get_selected_files(files: Optional[List[Tuple[str, str]]], args) -> Dict[str, Any]:
     """
     获取选中的文件列表和提交消息
@@ -340,14 +366,16 @@ def _get_selected_files(files: Optional[List[Tuple[str, str]]], args) -> Dict[st
 
     Returns:
         包含 selected、commitMessage、cancelled、commitResult 的字典
+        （skip-ui 模式另有 messageSource：ai、cache、keywords 或 default）
     """
     if args.skip_ui:
         # 跳过 UI 模式：自动生成提交消息
         selected = [path for _, path in files]
-        commit_msg = generate_commit_message(selected)
+        message_result = generate_commit_message_result(selected)
         return {
             "selected": selected,
-            "commitMessage": commit_msg,
+            "commitMessage": message_result["message"],
+            "messageSource": message_result["source"],
             "cancelled": False,
             "commitResult": None,  # skip-ui 模式不执行提交
         }
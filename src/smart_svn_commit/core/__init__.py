@@ -4,14 +4,17 @@
 
 from .svn_executor import SVNCommandExecutor
 from .fs_helper import FileSystemHelper
-from .parser import parse_svn_status
+from .parser import iter_svn_status_xml, parse_svn_status
 from .commit import execute_svn_commit
+from .entry_store import FileEntryStore
 from .config import load_config, save_config, get_config_path
 
 __all__ = [
     "SVNCommandExecutor",
     "FileSystemHelper",
+    "FileEntryStore",
     "parse_svn_status",
+    "iter_svn_status_xml",
     "execute_svn_commit",
     "load_config",
     "save_config",
@@ -6,7 +6,9 @@ import os
 import re
 import subprocess
 import tempfile
-from typing import Any
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 # 默认常量
 SUCCESS_MESSAGE = "提交成功"
@@ -14,6 +16,19 @@ FAILURE_MESSAGE = "提交失败"
 NO_FILES_MESSAGE = "没有选择要提交的文件"
 REVISION_PATTERN = r"Committed revision (\d+)"
 
+# 状态引擎：svn 命令行 / 直接读取 .svn/wc.db
+STATUS_ENGINE_SVN = "svn"
+STATUS_ENGINE_WCDB = "wcdb"
+
+# 分段查询时每次 svn status 传入的路径数量（避免命令行过长）
+STATUS_TARGETS_CHUNK = 100
+
+# 显式查询被忽略的路径时 svn 会报告 I 状态，普通查询不会出现
+IGNORED_STATUS = "I"
+
+# 磁盘上没有对应目录的版本化条目的状态（已删除、缺失、被其他类型占用）
+UNWALKED_STATUSES = {"D", "!", "~"}
+
 
 def execute_svn_commit(files: list[str], message: str) -> dict[str, Any]:
     """
@@ -89,27 +104,145 @@ def _safe_delete_file(file_path: str) -> None:
         pass
 
 
-def run_svn_status() -> list[tuple[str, str]]:
+def iter_svn_status_entries(
+    targets: Optional[List[str]] = None,
+    options: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    运行 svn status 命令并解析输出
+    流式运行 svn status --xml，边读取边产出状态条目
 
-    Returns:
-        (状态, 文件路径) 元组列表
+    svn 仍在遍历工作副本时即可拿到已输出的条目；生成器被提前关闭时
+    会终止 svn 进程。
+
+    Args:
+        targets: 要查询的路径列表，为 None 时查询当前目录
+        options: 额外的 svn 命令行参数（如 --depth、--config-option）
+
+    Yields:
+        包含 status、path、revision、author、treeConflict 的字典
     """
-    from .parser import parse_svn_status
+    from .parser import iter_svn_status_xml
 
     try:
-        result = subprocess.run(
-            ["svn", "status"],
-            capture_output=True,
-            text=True,
-            check=False,
-            encoding="utf-8",
-            errors="ignore",
+        process = subprocess.Popen(
+            ["svn", "status", "--xml", *(options or []), *(targets or [])],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        if result.returncode == 0:
-            return parse_svn_status(result.stdout)
     except (FileNotFoundError, OSError):
+        return
+
+    completed = False
+    try:
+        yield from iter_svn_status_xml(process.stdout)
+        completed = True
+    except ET.ParseError:
+        # svn 中途出错（如非工作副本）时输出不完整，保留已解析的条目
         pass
+    finally:
+        process.stdout.close()
+        if not completed and process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def iter_svn_status(
+    targets: Optional[List[str]] = None,
+    ignore_patterns: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    流式运行 svn status，逐条产出 (状态, 文件路径)
 
-    return []
+    提供忽略模式时将其下推到 svn：可表达的模式放入 global-ignores，
+    查询当前目录时跳过目录模式对应的目录（见 status_plan）。
+    调用方仍需用 apply_ignore_patterns 过滤结果。
+
+    Args:
+        targets: 要查询的路径列表，为 None 时查询当前目录
+        ignore_patterns: 忽略模式列表（可选）
+
+    Yields:
+        (状态, 文件路径) 元组
+    """
+    if not ignore_patterns:
+        for entry in iter_svn_status_entries(targets):
+            yield entry["status"], entry["path"]
+        return
+
+    from .status_plan import build_global_ignores_options, plan_status_targets
+
+    options = build_global_ignores_options(ignore_patterns)
+    plan = plan_status_targets(ignore_patterns) if targets is None else None
+    if plan is None:
+        for entry in iter_svn_status_entries(targets, options):
+            yield entry["status"], entry["path"]
+        return
+
+    # 先查询包含排除目录的各级目录自身及直接子项，再完整查询其余子目录；
+    # 子目录自身会在两次查询中各出现一次，只保留第一次
+    seen: Set[str] = set()
+    planned = {*plan.immediates, *plan.recursive, *plan.excluded}
+    unwalked: List[str] = []
+    for entry in _iter_planned_status(plan.immediates, "immediates", options):
+        path = entry["path"]
+        if entry["status"] == IGNORED_STATUS or path in seen:
+            continue
+        seen.add(path)
+        # 已删除或缺失的子目录不在按磁盘生成的计划中，其下的条目需要完整查询才会报告
+        if entry["status"] in UNWALKED_STATUSES and path not in planned:
+            unwalked.append(path)
+        yield entry["status"], path
+
+    for entry in _iter_planned_status(plan.recursive + unwalked, "infinity", options):
+        path = entry["path"]
+        if entry["status"] != IGNORED_STATUS and path not in seen:
+            yield entry["status"], path
+
+
+def _iter_planned_status(
+    targets: List[str], depth: str, options: List[str]
+) -> Iterator[Dict[str, Any]]:
+    """按 STATUS_TARGETS_CHUNK 分批以指定深度查询，逐条产出状态条目"""
+    for start in range(0, len(targets), STATUS_TARGETS_CHUNK):
+        chunk = targets[start : start + STATUS_TARGETS_CHUNK]
+        yield from iter_svn_status_entries(chunk, [f"--depth={depth}", *options])
+
+
+def iter_working_copy_status(
+    engine: str = STATUS_ENGINE_SVN, ignore_patterns: Optional[List[str]] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    使用指定的状态引擎逐条产出当前目录的 (状态, 文件路径)
+
+    Args:
+        engine: 状态引擎，"wcdb" 时直接读取 .svn/wc.db，不支持时自动回退到 svn 命令行
+        ignore_patterns: 下推到 svn 的忽略模式（见 iter_svn_status）
+
+    Yields:
+        (状态, 文件路径) 元组
+    """
+    if engine == STATUS_ENGINE_WCDB:
+        from .wc_db import run_wc_db_status
+
+        files = run_wc_db_status(Path.cwd())
+        if files is not None:
+            yield from files
+            return
+
+    yield from iter_svn_status(ignore_patterns=ignore_patterns)
+
+
+def run_svn_status(
+    engine: str = STATUS_ENGINE_SVN, ignore_patterns: Optional[List[str]] = None
+) -> list[tuple[str, str]]:
+    """
+    运行 svn status 命令并解析输出
+
+    Args:
+        engine: 状态引擎（见 iter_working_copy_status）
+        ignore_patterns: 下推到 svn 的忽略模式（见 iter_svn_status）
+
+    Returns:
+        (状态, 文件路径) 元组列表
+    """
+    return list(iter_working_copy_status(engine, ignore_patterns))
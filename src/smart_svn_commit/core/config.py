@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 PROJECT_CONFIG_NAME = ".smart-svn-commit.json"
 USER_CONFIG_DIR = "smart-svn-commit"
 USER_CONFIG_NAME = "config.json"
+CACHE_DIR_NAME = "cache"
 
 
 class ConfigManager:
@@ -107,6 +108,16 @@ def _get_user_config_dir() -> Path:
     return Path.home() / ".config" / USER_CONFIG_DIR
 
 
+def get_cache_dir() -> Path:
+    """
+    获取缓存目录（位于用户配置目录下）
+
+    Returns:
+        缓存目录路径
+    """
+    return _get_user_config_dir() / CACHE_DIR_NAME
+
+
 def get_default_config() -> Dict[str, Any]:
     """
     获取默认配置
@@ -151,12 +162,31 @@ def get_default_config() -> Dict[str, Any]:
                 "audio",
             ],
         },
-        "ui": {"splitterRatio": [30, 70]},
+        "ui": {
+            "splitterRatio": [30, 70],
+            "watch": {"enabled": True, "debounceMs": 500, "pollIntervalMs": 2000},
+            "speculativeGeneration": {"enabled": False, "idleMs": 1500},
+        },
+        "statusCache": {"enabled": True},
+        "diffCache": {"enabled": True, "maxMemoryMB": 16, "maxDiskMB": 64},
+        "responseCache": {"enabled": True, "ttlHours": 24, "maxEntries": 200},
+        "statusEngine": "svn",
         "aiApi": {
             "enabled": False,
             "baseUrl": "",
             "apiKey": "",
             "model": "gpt-3.5-turbo",
+            "maxDiffTokens": 3000,
+            "timeout": 30.0,
+            "maxConnections": 10,
+            "keepAliveExpiry": 60.0,
+            "mapReduce": {
+                "enabled": True,
+                "minFiles": 50,
+                "groupMaxTokens": 2000,
+                "maxGroups": 8,
+                "maxWorkers": 8,
+            },
             "prompts": {
                 "system": """你是一个专业的代码提交消息生成助手。请根据代码的 diff 内容生成符合 Conventional Commits 格式的提交消息。
 
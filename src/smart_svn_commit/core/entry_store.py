@@ -0,0 +1,390 @@
+"""
+文件条目存储 - 列式保存 SVN 状态条目
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# 条目标志位
+FLAG_DIR = 0x01
+FLAG_REMOVED = 0x02
+
+# 只有文件才会出现的状态（内容修改），判断类型时无需访问文件系统
+_FILE_ONLY_STATUSES = frozenset({"M"})
+
+# 条目已不在磁盘上的状态（缺失、已删除），类型从 wc.db 读取
+_NOT_ON_DISK_STATUSES = frozenset({"!", "D"})
+
+# 无扩展名时的排序键（确保排在最后）
+NO_EXTENSION_KEY = "~"
+
+# 排序字段：default（加载顺序）、path（路径）、natural（自然顺序路径，数字按数值比较）、
+# ext（后缀）、status（状态）
+SORT_FIELDS = ("default", "path", "natural", "ext", "status")
+
+# 自然顺序排序键中的数字片段
+_DIGITS_PATTERN = re.compile(r"\d+")
+
+
+class FileEntryStore:
+    """
+    列式文件条目存储
+
+    每个条目用整数索引表示，状态、路径以及预先计算的排序键、搜索键分别存放在
+    并行列表中。UI 和过滤逻辑直接使用条目索引，无需再从显示文本中解析路径。
+    移除的条目只打上 FLAG_REMOVED 标记，保证已分配的索引保持稳定。
+
+    条目是否为目录在加入时确定（FLAG_DIR）：磁盘上存在的条目 stat 一次，
+    缺失和已删除的条目按 wc.db 中记录的节点类型判断。路径相对于当前目录。
+    """
+
+    __slots__ = (
+        "statuses",
+        "paths",
+        "search_keys",
+        "ext_keys",
+        "flags",
+        "_index_by_path",
+        "_natural_keys",
+    )
+
+    def __init__(self, items: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        初始化存储
+
+        Args:
+            items: (状态, 文件路径) 元组序列（可选）
+        """
+        self.statuses: List[str] = []
+        self.paths: List[str] = []
+        self.search_keys: List[str] = []
+        self.ext_keys: List[str] = []
+        self.flags = bytearray()
+        self._index_by_path: Dict[str, int] = {}
+        # 自然顺序排序键在第一次按该字段排序时计算，之后只为追加的条目补齐
+        self._natural_keys: List[str] = []
+
+        if items is not None:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def append(self, status: str, path: str, is_dir: Optional[bool] = None) -> int:
+        """
+        追加条目
+
+        Args:
+            status: SVN 状态码
+            path: 文件路径
+            is_dir: 是否为目录，为 None 时按状态和磁盘上的条目判断
+                （已不在磁盘上的条目视为文件，批量追加时由 extend 按 wc.db 修正）
+
+        Returns:
+            新条目的索引
+        """
+        index = len(self.paths)
+        path = sys.intern(path)
+        if is_dir is None:
+            is_dir = _detect_dir(status, path)
+
+        self.statuses.append(sys.intern(status))
+        self.paths.append(path)
+        self.search_keys.append(_make_search_key(path))
+        self.ext_keys.append(_make_ext_key(path))
+        self.flags.append(FLAG_DIR if is_dir else 0)
+        self._index_by_path[path] = index
+
+        return index
+
+    def extend(self, items: Iterable[Tuple[str, str]]) -> range:
+        """
+        批量追加条目
+
+        Args:
+            items: (状态, 文件路径) 元组序列
+
+        Returns:
+            新条目的索引范围
+        """
+        start = len(self.paths)
+        not_on_disk: List[int] = []
+        for status, path in items:
+            index = self.append(status, path)
+            if status in _NOT_ON_DISK_STATUSES:
+                not_on_disk.append(index)
+        if not_on_disk:
+            self._mark_dirs_from_wc_db(not_on_disk)
+        return range(start, len(self.paths))
+
+    def _mark_dirs_from_wc_db(self, indices: List[int]) -> None:
+        """按 wc.db 中记录的节点类型为已不在磁盘上的条目设置 FLAG_DIR"""
+        from .wc_db import read_node_kinds
+
+        paths = self.paths
+        kinds = read_node_kinds(Path.cwd(), [paths[i] for i in indices])
+        for index in indices:
+            if kinds.get(paths[index]) == "dir":
+                self.flags[index] |= FLAG_DIR
+
+    def index_of(self, path: str) -> Optional[int]:
+        """
+        按路径查找条目索引
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            条目索引，不存在时返回 None
+        """
+        return self._index_by_path.get(path)
+
+    def set_status(self, index: int, status: str) -> None:
+        """
+        更新条目状态
+
+        Args:
+            index: 条目索引
+            status: 新的 SVN 状态码
+        """
+        self.statuses[index] = sys.intern(status)
+
+    def remove(self, index: int) -> None:
+        """
+        移除条目（标记为已移除，索引保持不变）
+
+        Args:
+            index: 条目索引
+        """
+        self.flags[index] |= FLAG_REMOVED
+        path = self.paths[index]
+        if self._index_by_path.get(path) == index:
+            del self._index_by_path[path]
+
+    def is_dir(self, index: int) -> bool:
+        """判断条目是否为目录"""
+        return bool(self.flags[index] & FLAG_DIR)
+
+    def is_removed(self, index: int) -> bool:
+        """判断条目是否已移除"""
+        return bool(self.flags[index] & FLAG_REMOVED)
+
+    def live_indices(self) -> List[int]:
+        """
+        获取所有未移除条目的索引
+
+        Returns:
+            条目索引列表（按添加顺序）
+        """
+        if len(self._index_by_path) == len(self.paths):
+            return list(range(len(self.paths)))
+        flags = self.flags
+        return [i for i in range(len(flags)) if not flags[i] & FLAG_REMOVED]
+
+    def live_count(self) -> int:
+        """返回未移除的条目数量"""
+        return len(self._index_by_path)
+
+    def sort_keys(self, field: str) -> Sequence[Any]:
+        """
+        获取排序字段对应的排序键列（按条目索引访问）
+
+        Args:
+            field: 排序字段（default 以外的 SORT_FIELDS）
+
+        Returns:
+            排序键列表
+
+        Raises:
+            ValueError: 未知的排序字段
+        """
+        if field == "path":
+            return self.paths
+        if field == "ext":
+            return self.ext_keys
+        if field == "status":
+            return self.statuses
+        if field == "natural":
+            keys = self._natural_keys
+            if len(keys) < len(self.paths):
+                keys.extend(_make_natural_key(key) for key in self.search_keys[len(keys) :])
+            return keys
+        raise ValueError(f"未知的排序字段: {field}")
+
+    def item(self, index: int) -> Tuple[str, str]:
+        """
+        获取条目的 (状态, 文件路径) 元组
+
+        Args:
+            index: 条目索引
+
+        Returns:
+            (状态, 文件路径) 元组
+        """
+        return self.statuses[index], self.paths[index]
+
+    def items(self, indices: Optional[Iterable[int]] = None) -> List[Tuple[str, str]]:
+        """
+        获取多个条目的 (状态, 文件路径) 元组列表
+
+        Args:
+            indices: 条目索引序列，为 None 时返回全部未移除的条目
+
+        Returns:
+            (状态, 文件路径) 元组列表
+        """
+        if indices is None:
+            if len(self._index_by_path) == len(self.paths):
+                return list(zip(self.statuses, self.paths))
+            indices = self.live_indices()
+        return [(self.statuses[i], self.paths[i]) for i in indices]
+
+
+def sort_entries(
+    store: FileEntryStore,
+    entries: List[int],
+    sort_by: Union[str, Sequence[str]],
+    ascending: bool = True,
+) -> None:
+    """
+    按排序字段对条目索引列表原地排序（只排列索引，稳定排序）
+
+    多个字段时按从后往前的顺序依次稳定排序，前面的字段优先，相同时保持后面字段的顺序。
+
+    Args:
+        store: 文件条目存储
+        entries: 条目索引列表
+        sort_by: 排序字段或字段序列（如 ("status", "path") 表示先按状态、再按路径）
+        ascending: 是否升序（default 字段始终按加载顺序）
+    """
+    fields = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    for field in reversed(fields):
+        if field == "default":
+            entries.sort()
+        else:
+            entries.sort(key=store.sort_keys(field).__getitem__, reverse=not ascending)
+
+
+class StatusDelta(NamedTuple):
+    """状态增量：changed 为 (条目索引, 新状态)，added 为新条目，removed 为需移除的条目索引"""
+
+    changed: List[Tuple[int, str]]
+    added: List[Tuple[str, str]]
+    removed: List[int]
+
+
+def compute_status_delta(
+    store: FileEntryStore,
+    items: Iterable[Tuple[str, str]],
+    scope: Optional[Iterable[str]] = None,
+) -> StatusDelta:
+    """
+    计算存储与最新状态结果之间的增量（不修改存储）
+
+    Args:
+        store: 文件条目存储
+        items: 在 scope 范围内重新查询得到的 (状态, 文件路径) 元组序列
+        scope: 重新查询的路径（文件或目录），为 None 时表示整个工作目录；
+            范围内不再出现在 items 中的条目视为已移除
+
+    Returns:
+        状态增量
+    """
+    latest: Dict[str, str] = {}
+    for status, path in items:
+        latest[path] = status
+
+    changed: List[Tuple[int, str]] = []
+    added: List[Tuple[str, str]] = []
+    for path, status in latest.items():
+        index = store.index_of(path)
+        if index is None:
+            added.append((status, path))
+        elif store.statuses[index] != status:
+            changed.append((index, status))
+
+    paths = store.paths
+    removed = [i for i in store.live_indices() if paths[i] not in latest]
+    if scope is not None:
+        scope_paths = {p.rstrip("/\\") for p in scope}
+        scope_prefixes = tuple(p + sep for p in scope_paths for sep in ("/", "\\"))
+        removed = [
+            i
+            for i in removed
+            if paths[i].rstrip("/\\") in scope_paths or paths[i].startswith(scope_prefixes)
+        ]
+
+    return StatusDelta(changed, added, removed)
+
+
+def _detect_dir(status: str, path: str) -> bool:
+    """
+    判断条目是否为目录（磁盘上存在的条目只 stat 一次）
+
+    Args:
+        status: SVN 状态码
+        path: 文件路径（相对于当前目录）
+
+    Returns:
+        是否为目录；已不在磁盘上的条目返回 False
+    """
+    if path.endswith(("/", "\\")):
+        return True
+    if status in _FILE_ONLY_STATUSES or status in _NOT_ON_DISK_STATUSES:
+        return False
+    return os.path.isdir(path)
+
+
+def _make_search_key(path: str) -> str:
+    """
+    生成搜索键（小写路径），已是小写时复用原字符串
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        小写路径
+    """
+    key = path.lower()
+    return path if key == path else key
+
+
+def _make_ext_key(path: str) -> str:
+    """
+    生成扩展名排序键
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        小写扩展名，无扩展名返回 "~" 以确保排在最后
+    """
+    dot_idx = path.rfind(".")
+    if dot_idx > max(path.rfind("/"), path.rfind("\\")):
+        return sys.intern(path[dot_idx + 1 :].lower())
+    return NO_EXTENSION_KEY
+
+
+def _make_natural_key(search_key: str) -> str:
+    """
+    生成自然顺序排序键（File2 排在 File10 之前）
+
+    每段数字去掉前导零后编码为"位数字符 + 数字"，较长的数字总是排在后面，
+    排序键仍是普通字符串，比较比元组快得多。
+
+    Args:
+        search_key: 小写路径
+
+    Returns:
+        排序键
+    """
+    return _DIGITS_PATTERN.sub(_encode_number, search_key)
+
+
+def _encode_number(match: "re.Match") -> str:
+    """将一段数字编码为按数值排序的字符串"""
+    digits = match.group().lstrip("0") or "0"
+    return chr(ord("0") + len(digits)) + digits
@@ -2,11 +2,33 @@
 SVN 状态解析器
 """
 
-from typing import List, Optional, Tuple
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 
 # SVN 状态码常量
 SVN_STATUS_CODES = {"M", "A", "D", "?", "!", "C", "R", "~", "S"}
 
+# svn status --xml 中 wc-status 的 item 属性到状态码的映射
+XML_ITEM_STATUS = {
+    "modified": "M",
+    "added": "A",
+    "deleted": "D",
+    "unversioned": "?",
+    "missing": "!",
+    "incomplete": "!",
+    "conflicted": "C",
+    "replaced": "R",
+    "obstructed": "~",
+    "external": "X",
+    "ignored": "I",
+}
+
+# svn status --xml 中 wc-status 的 props 属性到状态码的映射
+XML_PROPS_STATUS = {"modified": "M", "conflicted": "C"}
+
+# 从管道读取 XML 的块大小
+XML_READ_CHUNK_SIZE = 64 * 1024
+
 # 显示文本分隔符（用于 UI 显示）
 STATUS_PREFIX_SEPARATOR = "] "
 
@@ -54,6 +76,97 @@ def parse_svn_status(status_output: str) -> List[Tuple[str, str]]:
     return files
 
 
+def iter_svn_status_xml(source: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    增量解析 svn status --xml 输出
+
+    直接从管道（如 subprocess 的 stdout）按块读取，每解析完一个 <entry>
+    立即产出结果，并清理已处理的元素，不会在内存中保留整个文档。
+
+    Args:
+        source: 二进制输入流
+
+    Yields:
+        包含 status、path、revision、author、treeConflict 的字典
+
+    Raises:
+        xml.etree.ElementTree.ParseError: XML 格式错误（如 svn 中途出错）
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    # 有 read1 时只读取管道中已就绪的数据，避免等待整块填满
+    read = getattr(source, "read1", source.read)
+    # 当前包含 entry 的父元素（<target> 或 <changelist>）
+    container: Optional[ET.Element] = None
+
+    while True:
+        chunk = read(XML_READ_CHUNK_SIZE)
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+
+        for event, elem in parser.read_events():
+            if event == "start":
+                if elem.tag in ("target", "changelist"):
+                    container = elem
+                continue
+
+            if elem.tag != "entry":
+                continue
+
+            entry = _build_xml_entry(elem)
+            # 已处理的 entry 从所在的 target/changelist 中移除，保持内存占用恒定
+            if container is not None:
+                container.clear()
+            if entry is not None:
+                yield entry
+
+        if not chunk:
+            break
+
+
+def _build_xml_entry(elem: ET.Element) -> Optional[Dict[str, Any]]:
+    """
+    将 <entry> 元素转换为状态字典
+
+    状态码规则与 parse_svn_status 保持一致：优先使用内容状态，
+    纯属性变动使用 _ 前缀，仅有树冲突时使用 C。
+
+    Args:
+        elem: entry 元素
+
+    Returns:
+        状态字典，无变更的条目返回 None
+    """
+    wc_status = elem.find("wc-status")
+    path = elem.get("path", "")
+    if wc_status is None or not path:
+        return None
+
+    content_status = XML_ITEM_STATUS.get(wc_status.get("item", ""))
+    prop_status = XML_PROPS_STATUS.get(wc_status.get("props", ""))
+    tree_conflicted = wc_status.get("tree-conflicted") == "true"
+
+    status_code = content_status
+    if not status_code and prop_status:
+        status_code = f"_{prop_status}"
+    if not status_code and tree_conflicted:
+        status_code = "C"
+    if not status_code:
+        return None
+
+    commit = wc_status.find("commit")
+    author = commit.findtext("author") if commit is not None else None
+
+    return {
+        "status": status_code,
+        "path": path,
+        "revision": wc_status.get("revision"),
+        "author": author,
+        "treeConflict": tree_conflicted,
+    }
+
+
 def extract_path_from_display_text(
     display_text: str, separator: str = STATUS_PREFIX_SEPARATOR
 ) -> Optional[str]:
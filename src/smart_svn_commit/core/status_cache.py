@@ -0,0 +1,238 @@
+"""
+SVN 状态快照缓存
+
+按工作目录将上一次 svn status 的结果保存到本地 sqlite 数据库，
+以 .svn/wc.db 的修改时间和大小、目录修改时间摘要以及忽略模式作为缓存键。
+再次打开同一工作副本时可立即显示快照，随后在后台用完整的 svn status 校正。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import get_cache_dir
+
+# 缓存数据库文件名
+CACHE_DB_NAME = "status_snapshots.sqlite"
+
+# 最多保留的快照数量（按最近使用淘汰）
+MAX_SNAPSHOTS = 20
+
+# sqlite 加锁等待时间（秒）
+DB_TIMEOUT = 1.0
+
+# SVN 管理目录及数据库文件名
+SVN_ADMIN_DIR = ".svn"
+WC_DB_NAME = "wc.db"
+
+# 快照数据中字段和条目的分隔符
+FIELD_SEPARATOR = "\t"
+ENTRY_SEPARATOR = "\n"
+
+
+def find_wc_root(path: Path) -> Optional[Path]:
+    """
+    向上查找工作副本根目录（包含 .svn/wc.db 的目录）
+
+    Args:
+        path: 起始目录
+
+    Returns:
+        工作副本根目录，不在工作副本中时返回 None
+    """
+    current = path.resolve()
+    for candidate in (current, *current.parents):
+        if (candidate / SVN_ADMIN_DIR / WC_DB_NAME).is_file():
+            return candidate
+    return None
+
+
+class StatusSnapshotCache:
+    """SVN 状态快照缓存（sqlite 存储，数据使用 zlib 压缩）"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        初始化快照缓存
+
+        Args:
+            db_path: 数据库文件路径，为 None 时使用用户缓存目录
+        """
+        self._db_path = db_path or get_cache_dir() / CACHE_DB_NAME
+
+    def compute_key(self, wc_path: Path, ignore_patterns: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        计算工作目录当前状态对应的缓存键
+
+        Args:
+            wc_path: 工作目录（svn status 的执行目录）
+            ignore_patterns: 忽略模式列表
+
+        Returns:
+            缓存键字典，不在工作副本中或无法读取时返回 None
+        """
+        wc_root = find_wc_root(wc_path)
+        if wc_root is None:
+            return None
+
+        try:
+            wc_db_stat = (wc_root / SVN_ADMIN_DIR / WC_DB_NAME).stat()
+        except OSError:
+            return None
+
+        return {
+            "wcPath": str(wc_path.resolve()),
+            "wcDbMtime": wc_db_stat.st_mtime_ns,
+            "wcDbSize": wc_db_stat.st_size,
+            "dirDigest": _scan_dir_digest(wc_path, ignore_patterns),
+            "patternsDigest": _digest_patterns(ignore_patterns),
+        }
+
+    def load(self, key: Dict[str, Any]) -> Optional[List[Tuple[str, str]]]:
+        """
+        读取与缓存键完全匹配的快照
+
+        Args:
+            key: compute_key 返回的缓存键
+
+        Returns:
+            (状态, 文件路径) 元组列表，未命中时返回 None
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT wc_db_mtime, wc_db_size, dir_digest, patterns_digest, data "
+                    "FROM snapshots WHERE wc_path = ?",
+                    (key["wcPath"],),
+                ).fetchone()
+                if row is None or tuple(row[:4]) != _key_fields(key):
+                    return None
+                conn.execute(
+                    "UPDATE snapshots SET used_at = ? WHERE wc_path = ?",
+                    (time.time(), key["wcPath"]),
+                )
+                return _decode_snapshot(row[4])
+        except (sqlite3.Error, OSError, zlib.error, UnicodeDecodeError) as e:
+            print(f"警告: 无法读取状态快照: {e}", file=sys.stderr)
+            return None
+
+    def save(self, key: Dict[str, Any], files: List[Tuple[str, str]]) -> bool:
+        """
+        保存快照并淘汰最久未使用的快照
+
+        Args:
+            key: compute_key 返回的缓存键
+            files: (状态, 文件路径) 元组列表
+
+        Returns:
+            是否保存成功
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (wc_path, wc_db_mtime, wc_db_size, "
+                    "dir_digest, patterns_digest, used_at, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key["wcPath"], *_key_fields(key), time.time(), _encode_snapshot(files)),
+                )
+                conn.execute(
+                    "DELETE FROM snapshots WHERE wc_path NOT IN "
+                    "(SELECT wc_path FROM snapshots ORDER BY used_at DESC LIMIT ?)",
+                    (MAX_SNAPSHOTS,),
+                )
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"警告: 无法保存状态快照: {e}", file=sys.stderr)
+            return False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接（事务结束后提交并关闭），并确保表结构存在"""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._db_path), timeout=DB_TIMEOUT)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS snapshots ("
+                    "wc_path TEXT PRIMARY KEY, wc_db_mtime INTEGER, wc_db_size INTEGER, "
+                    "dir_digest TEXT, patterns_digest TEXT, used_at REAL, data BLOB)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+
+def _key_fields(key: Dict[str, Any]) -> Tuple[Any, ...]:
+    """缓存键中参与比较的字段（与数据库列顺序一致）"""
+    return (key["wcDbMtime"], key["wcDbSize"], key["dirDigest"], key["patternsDigest"])
+
+
+def _digest_patterns(ignore_patterns: List[str]) -> str:
+    """计算忽略模式列表的摘要"""
+    data = json.dumps(ignore_patterns, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _scan_dir_digest(wc_path: Path, ignore_patterns: List[str]) -> str:
+    """
+    扫描目录树，计算所有目录修改时间的摘要
+
+    文件的增删和重命名会更新所在目录的修改时间。跳过 .svn 以及被目录忽略模式
+    （如 Library/）覆盖的目录。
+
+    Args:
+        wc_path: 工作目录
+        ignore_patterns: 忽略模式列表
+
+    Returns:
+        摘要字符串
+    """
+    skip_prefixes = tuple(p for p in ignore_patterns if p.endswith("/"))
+    digest = hashlib.blake2b(digest_size=16)
+
+    try:
+        digest.update(str(os.stat(wc_path).st_mtime_ns).encode())
+    except OSError:
+        pass
+
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(wc_path, rel_dir) if rel_dir else wc_path) as it:
+                for entry in it:
+                    if entry.name == SVN_ADMIN_DIR or not entry.is_dir(follow_symlinks=False):
+                        continue
+                    rel_path = f"{rel_dir}{entry.name}/"
+                    if skip_prefixes and rel_path.startswith(skip_prefixes):
+                        continue
+                    mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                    digest.update(f"{rel_path}{FIELD_SEPARATOR}{mtime}{ENTRY_SEPARATOR}".encode())
+                    stack.append(rel_path)
+        except OSError:
+            continue
+
+    return digest.hexdigest()
+
+
+def _encode_snapshot(files: List[Tuple[str, str]]) -> bytes:
+    """将文件列表编码为压缩的二进制数据"""
+    text = ENTRY_SEPARATOR.join(f"{status}{FIELD_SEPARATOR}{path}" for status, path in files)
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _decode_snapshot(data: bytes) -> List[Tuple[str, str]]:
+    """将压缩的二进制数据解码为文件列表"""
+    text = zlib.decompress(data).decode("utf-8")
+    if not text:
+        return []
+    files = []
+    for line in text.split(ENTRY_SEPARATOR):
+        status, _, path = line.partition(FIELD_SEPARATOR)
+        files.append((status, path))
+    return files
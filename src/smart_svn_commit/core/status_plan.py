@@ -0,0 +1,179 @@
+"""
+svn status 查询计划 - 将忽略模式下推到 svn 本身
+
+- 不含路径分隔符的模式（*.meta、Test*.cs、Thumbs.db 等）追加到 global-ignores，
+  svn 不再输出匹配的未版本化条目
+- 目录模式（Library/ 等，从工作目录开始匹配）改为显式传入其余目录作为查询目标，
+  svn 不再遍历这些目录
+
+global-ignores 只作用于未版本化条目，结果仍需在 Python 侧用完整的忽略模式过滤。
+"""
+
+import os
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .svn_config import read_global_ignores
+
+# svn 的 global-ignores 配置项（--config-option 格式）
+GLOBAL_IGNORES_OPTION = "config:miscellany:global-ignores"
+
+# 通配符字符（目录模式和 *.ext 的后缀中出现时不下推）
+_GLOB_CHARS = set("*?[")
+
+# 目录前缀树的终止标记
+_TRIE_END = "\0"
+
+
+class StatusPlan(NamedTuple):
+    """
+    分段查询计划
+
+    immediates 中的目录以 --depth=immediates 查询（报告目录自身及直接子项，
+    包括被排除的目录本身），recursive 中的路径按默认深度完整查询，
+    excluded 为实际存在、不查询其内容的被排除目录。
+
+    计划按磁盘上的目录生成：已删除或缺失的版本化子目录不在 recursive 中，
+    需要根据 immediates 查询的结果补充完整查询（见 commit.iter_svn_status）。
+    """
+
+    immediates: List[str]
+    recursive: List[str]
+    excluded: List[str]
+
+
+def build_global_ignores_options(ignore_patterns: List[str]) -> List[str]:
+    """
+    将可由 svn 处理的模式转换为 --config-option 参数
+
+    只下推不含路径分隔符和空白、且 svn 忽略的条目一定也会被 Python 侧忽略的模式：
+    - *.ext：Python 侧按字面后缀（endswith）匹配，后缀不含通配符时与 svn 按文件名匹配等价；
+      后缀含 *、?、[ 时（如 *.cs*、*.[ch]）两侧含义不同，不下推
+    - 其他通配符：Python 侧与 svn 一样按文件名匹配
+    - 普通文本：svn 只匹配完整文件名，是 Python 侧包含匹配的子集；
+      含 [ 的普通文本在 svn 中会被当作通配符，不下推
+
+    Args:
+        ignore_patterns: 忽略模式列表
+
+    Returns:
+        svn 命令行参数列表，没有可下推的模式时返回空列表
+    """
+    eligible = [p for p in ignore_patterns if _is_global_ignore_eligible(p)]
+    if not eligible:
+        return []
+
+    # --config-option 会覆盖用户配置，需要带上原有的 global-ignores
+    patterns = read_global_ignores()
+    patterns += [p for p in eligible if p not in patterns]
+    return ["--config-option", f"{GLOBAL_IGNORES_OPTION}={' '.join(patterns)}"]
+
+
+def _is_global_ignore_eligible(pattern: str) -> bool:
+    """判断模式能否放入 global-ignores"""
+    if not pattern or "/" in pattern or "\\" in pattern:
+        return False
+    if any(c.isspace() for c in pattern):
+        return False
+    if pattern.startswith("*."):
+        return not _GLOB_CHARS & set(pattern[1:])
+    is_glob = "*" in pattern or "?" in pattern
+    return is_glob or "[" not in pattern
+
+
+def plan_status_targets(ignore_patterns: List[str], wc_path: str = ".") -> Optional[StatusPlan]:
+    """
+    根据目录模式规划查询目标，使 svn 不遍历被忽略的目录
+
+    从工作目录开始，包含被排除目录的目录以 immediates 深度查询，
+    其余子目录作为独立目标完整查询。
+
+    Args:
+        ignore_patterns: 忽略模式列表
+        wc_path: 工作目录（查询目标相对于该目录）
+
+    Returns:
+        查询计划；没有可下推的目录模式或被排除的目录都不存在时返回 None（直接完整查询）
+    """
+    trie: Dict[str, Any] = {}
+    for pattern in ignore_patterns:
+        parts = _dir_pattern_parts(pattern)
+        if parts is None:
+            continue
+        node = trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_TRIE_END] = True
+
+    if not trie:
+        return None
+
+    plan = StatusPlan([], [], [])
+    if not _plan_dir(wc_path, "", trie, plan):
+        return None
+    return plan
+
+
+def _dir_pattern_parts(pattern: str) -> Optional[List[str]]:
+    """
+    拆分可下推的目录模式（如 Assets/Generated/）
+
+    Returns:
+        路径组件列表；含通配符、空组件或 . / .. 时返回 None
+    """
+    if not pattern.endswith("/") or _GLOB_CHARS & set(pattern):
+        return None
+    parts = pattern[:-1].split("/")
+    if any(part in ("", ".", "..") for part in parts):
+        return None
+    return parts
+
+
+def _plan_dir(wc_path: str, rel_dir: str, node: Dict[str, Any], plan: StatusPlan) -> bool:
+    """
+    规划单个目录
+
+    Args:
+        wc_path: 工作目录
+        rel_dir: 当前目录（相对于工作目录，根目录为空字符串）
+        node: 当前目录在前缀树中的节点
+        plan: 查询计划（原地追加）
+
+    Returns:
+        当前目录下是否存在被排除的目录
+    """
+    try:
+        with os.scandir(os.path.join(wc_path, rel_dir) if rel_dir else wc_path) as it:
+            subdirs = sorted(
+                entry.name
+                for entry in it
+                if entry.is_dir(follow_symlinks=False) and entry.name != ".svn"
+            )
+    except OSError:
+        return False
+
+    plan.immediates.append(rel_dir or ".")
+    recursive_start = len(plan.recursive)
+    excluded_start = len(plan.excluded)
+    excluded_found = False
+
+    for name in subdirs:
+        child = node.get(name)
+        rel_path = os.path.join(rel_dir, name) if rel_dir else name
+        if child is None:
+            plan.recursive.append(rel_path)
+        elif _TRIE_END in child:
+            # 被排除的目录：自身状态由上层的 immediates 查询报告
+            plan.excluded.append(rel_path)
+            excluded_found = True
+        elif _plan_dir(wc_path, rel_path, child, plan):
+            excluded_found = True
+        else:
+            # 子树中没有实际存在的排除目录，退回为完整查询
+            plan.recursive.append(rel_path)
+
+    if not excluded_found:
+        del plan.recursive[recursive_start:]
+        del plan.excluded[excluded_start:]
+        plan.immediates.pop()
+    return excluded_found
+
@@ -0,0 +1,84 @@
+"""
+SVN 客户端配置读取
+"""
+
+import configparser
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# svn 内置的 global-ignores 默认值（用户未配置时生效）
+DEFAULT_GLOBAL_IGNORES = (
+    "*.o *.lo *.la *.al .libs *.so *.so.[0-9]* *.a *.pyc *.pyo __pycache__ "
+    "*.rej *~ #*# .#* .*.swp .DS_Store [Tt]humbs.db"
+)
+
+# 配置文件中的节和键
+MISCELLANY_SECTION = "miscellany"
+GLOBAL_IGNORES_KEY = "global-ignores"
+
+# Windows 下 TortoiseSVN 等客户端写入的注册表配置路径
+REGISTRY_CONFIG_PATH = r"Software\Tigris.org\Subversion\Config\miscellany"
+
+
+def get_svn_config_dir() -> Path:
+    """
+    获取 svn 用户配置目录
+
+    Returns:
+        配置目录路径（Windows: %APPDATA%/Subversion，其他: ~/.subversion）
+    """
+    if sys.platform == "win32":
+        appdata = os.environ.get("APPDATA")
+        base = Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
+        return base / "Subversion"
+    return Path.home() / ".subversion"
+
+
+def read_global_ignores() -> List[str]:
+    """
+    读取 svn 的 global-ignores 配置
+
+    优先级：用户配置文件 → Windows 注册表 → svn 内置默认值
+
+    Returns:
+        忽略模式列表
+    """
+    value = _read_config_file_value(get_svn_config_dir() / "config")
+    if value is None and sys.platform == "win32":
+        value = _read_registry_value()
+    if value is None:
+        value = DEFAULT_GLOBAL_IGNORES
+    return value.split()
+
+
+def _read_config_file_value(config_path: Path) -> Optional[str]:
+    """
+    从 svn 配置文件读取 global-ignores
+
+    Args:
+        config_path: 配置文件路径
+
+    Returns:
+        配置值，未配置时返回 None
+    """
+    parser = configparser.RawConfigParser()
+    try:
+        parser.read(config_path, encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    if parser.has_option(MISCELLANY_SECTION, GLOBAL_IGNORES_KEY):
+        return parser.get(MISCELLANY_SECTION, GLOBAL_IGNORES_KEY)
+    return None
+
+
+def _read_registry_value() -> Optional[str]:
+    """从 Windows 注册表读取 global-ignores"""
+    try:
+        import winreg
+
+        from ..windows.registry import get_registry_value
+    except ImportError:
+        return None
+    return get_registry_value(winreg.HKEY_CURRENT_USER, REGISTRY_CONFIG_PATH, GLOBAL_IGNORES_KEY)
@@ -0,0 +1,312 @@
+"""
+工作副本文件系统监视
+
+优先使用 watchdog（Linux 下为 inotify，Windows 下为 ReadDirectoryChangesW），
+未安装时在后台线程中定期比较各目录的修改时间（每个目录一次 stat），只重新扫描
+发生变化的目录。目录修改时间只随子项的新建、删除和重命名变化，原地写入的文件修改
+（不经过临时文件替换的保存方式）在轮询模式下无法发现，需要手动刷新。
+收集发生变化的路径，由界面防抖后只对这些路径运行 svn status。
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .status_cache import SVN_ADMIN_DIR, WC_DB_NAME, find_wc_root
+
+# 尝试导入 watchdog 库
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+
+# 默认轮询间隔（秒）
+DEFAULT_POLL_INTERVAL = 2.0
+
+# 轮询时目录的签名：只关心目录的出现和消失，子项的增删由子项自身体现，
+# 避免目录修改时间变化导致对整个目录重新查询
+_DIR_SIGNATURE = (-1, -1)
+
+# 轮询时每个目录的扫描结果：(目录修改时间, 名称 -> (修改时间, 大小) 或 _DIR_SIGNATURE)
+_DirState = Tuple[int, Dict[str, Tuple[int, int]]]
+
+
+class WorkingCopyWatcher:
+    """
+    工作目录变化监视器
+
+    变化的路径以相对于工作目录、使用系统路径分隔符的形式记录（与 svn status 输出一致）。
+    .svn 目录内的变化不单独记录：wc.db 被其他 svn 客户端修改（update、revert 等）时，
+    take_changes 返回需要完整刷新的标记。
+    """
+
+    def __init__(
+        self,
+        wc_path: Path,
+        ignore_patterns: Optional[List[str]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        初始化监视器
+
+        Args:
+            wc_path: 工作目录
+            ignore_patterns: 忽略模式列表（其中的目录模式如 Library/ 不监视）
+            poll_interval: 未安装 watchdog 时的轮询间隔（秒）
+        """
+        self._root = str(wc_path.resolve())
+        self._skip_prefixes = tuple(p for p in (ignore_patterns or []) if p.endswith("/"))
+        self._poll_interval = poll_interval
+
+        wc_root = find_wc_root(wc_path)
+        self._wc_db_path = wc_root / SVN_ADMIN_DIR / WC_DB_NAME if wc_root else None
+        self._wc_db_signature = self._read_wc_db_signature()
+
+        self._lock = threading.Lock()
+        self._changed: Set[str] = set()
+        self._last_change = 0.0
+
+        self._observer = None
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_polling(self) -> bool:
+        """是否使用轮询方式监视"""
+        return self._poll_thread is not None
+
+    def start(self) -> None:
+        """开始监视"""
+        if WATCHDOG_AVAILABLE:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_ChangeHandler(self), self._root, recursive=True)
+                self._observer.daemon = True
+                self._observer.start()
+                return
+            except OSError as e:
+                # 如 inotify 监视数量达到上限，回退到轮询
+                print(f"警告: 无法启动文件系统监视，改用轮询: {e}", file=sys.stderr)
+                self._observer = None
+
+        self._stop_event.clear()
+        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
+
+    def stop(self) -> None:
+        """停止监视"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1.0)
+            self._observer = None
+        if self._poll_thread is not None:
+            self._stop_event.set()
+            self._poll_thread.join(timeout=1.0)
+            self._poll_thread = None
+
+    def sync_wc_db(self) -> None:
+        """
+        记录当前 wc.db 的状态
+
+        svn status 本身可能更新 wc.db 中的时间戳，每次查询完成后调用，
+        避免把自身的查询误判为外部修改。
+        """
+        self._wc_db_signature = self._read_wc_db_signature()
+
+    def take_changes(self, quiet_seconds: float = 0.0) -> Optional[Tuple[Set[str], bool]]:
+        """
+        取出累计的变化（防抖：最近 quiet_seconds 秒内仍有变化时暂不取出）
+
+        Args:
+            quiet_seconds: 要求的静默时间（秒）
+
+        Returns:
+            (变化路径集合, 是否需要完整刷新)，没有可取出的变化时返回 None
+        """
+        full_refresh = self._read_wc_db_signature() != self._wc_db_signature
+
+        with self._lock:
+            if not self._changed and not full_refresh:
+                return None
+            if not full_refresh and time.monotonic() - self._last_change < quiet_seconds:
+                return None
+            changed = self._changed
+            self._changed = set()
+
+        if full_refresh:
+            self.sync_wc_db()
+        return _collapse_paths(changed), full_refresh
+
+    def record(self, abs_path: str) -> None:
+        """
+        记录发生变化的路径（可在任意线程调用）
+
+        Args:
+            abs_path: 绝对路径
+        """
+        rel_path = os.path.relpath(abs_path, self._root)
+        if rel_path == os.curdir or rel_path.startswith(os.pardir):
+            return
+        if SVN_ADMIN_DIR in rel_path.split(os.sep):
+            return
+        if self._skip_prefixes and (rel_path.replace(os.sep, "/") + "/").startswith(
+            self._skip_prefixes
+        ):
+            return
+
+        with self._lock:
+            self._changed.add(rel_path)
+            self._last_change = time.monotonic()
+
+    def _read_wc_db_signature(self) -> Optional[Tuple[int, int]]:
+        """读取 wc.db 的修改时间和大小"""
+        if self._wc_db_path is None:
+            return None
+        try:
+            st = self._wc_db_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _poll_loop(self) -> None:
+        """轮询线程：定期比较各目录的修改时间，只重新扫描发生变化的目录"""
+        dirs: Dict[str, _DirState] = {}
+        self._scan_tree("", dirs)
+        while not self._stop_event.wait(self._poll_interval):
+            for rel_dir in list(dirs):
+                if self._stop_event.is_set():
+                    return
+                state = dirs.get(rel_dir)
+                if state is None:
+                    # 已随上级目录一起移除
+                    continue
+                try:
+                    mtime = os.stat(self._abs_path(rel_dir)).st_mtime_ns
+                except OSError:
+                    # 目录本身的消失由其父目录的变化体现
+                    self._drop_tree(rel_dir, dirs)
+                    continue
+                if mtime != state[0]:
+                    self._rescan_dir(rel_dir, state[1], dirs)
+
+    def _rescan_dir(
+        self, rel_dir: str, previous: Dict[str, Tuple[int, int]], dirs: Dict[str, _DirState]
+    ) -> None:
+        """重新扫描修改时间变化的目录，记录新增、删除和变化的子项"""
+        state = self._scan_dir(rel_dir)
+        if state is None:
+            self._drop_tree(rel_dir, dirs)
+            return
+        dirs[rel_dir] = state
+
+        current = state[1]
+        for name in previous.keys() | current.keys():
+            old, new = previous.get(name), current.get(name)
+            if old == new:
+                continue
+            rel_path = os.path.join(rel_dir, name) if rel_dir else name
+            self.record(os.path.join(self._root, rel_path))
+            if old == _DIR_SIGNATURE:
+                self._drop_tree(rel_path, dirs)
+            if new == _DIR_SIGNATURE:
+                self._scan_tree(rel_path, dirs)
+
+    def _scan_tree(self, rel_dir: str, dirs: Dict[str, _DirState]) -> None:
+        """扫描目录及其下所有子目录，结果存入 dirs"""
+        stack = [rel_dir]
+        while stack and not self._stop_event.is_set():
+            current = stack.pop()
+            state = self._scan_dir(current)
+            if state is None:
+                continue
+            dirs[current] = state
+            for name, signature in state[1].items():
+                if signature == _DIR_SIGNATURE:
+                    stack.append(os.path.join(current, name) if current else name)
+
+    def _scan_dir(self, rel_dir: str) -> Optional[_DirState]:
+        """
+        扫描单个目录（.svn 和忽略的目录除外）
+
+        Returns:
+            (目录修改时间, 名称 -> (修改时间, 大小))，目录无法读取时返回 None
+        """
+        dir_path = self._abs_path(rel_dir)
+        listing: Dict[str, Tuple[int, int]] = {}
+        try:
+            # 先取目录修改时间，扫描期间发生的变化留到下一轮
+            mtime = os.stat(dir_path).st_mtime_ns
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.name == SVN_ADMIN_DIR:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        if self._skip_prefixes and (
+                            rel_path.replace(os.sep, "/") + "/"
+                        ).startswith(self._skip_prefixes):
+                            continue
+                        listing[entry.name] = _DIR_SIGNATURE
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    listing[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+        return mtime, listing
+
+    @staticmethod
+    def _drop_tree(rel_dir: str, dirs: Dict[str, _DirState]) -> None:
+        """移除目录及其下所有子目录的扫描结果"""
+        prefix = rel_dir + os.sep
+        for key in [k for k in dirs if k == rel_dir or k.startswith(prefix)]:
+            del dirs[key]
+
+    def _abs_path(self, rel_path: str) -> str:
+        """相对路径转换为绝对路径"""
+        return os.path.join(self._root, rel_path) if rel_path else self._root
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """watchdog 事件处理器，将事件路径转交给监视器"""
+
+    def __init__(self, watcher: WorkingCopyWatcher):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        # 目录内容变化时其子项也会产生事件，目录自身的修改事件无需处理
+        if event.is_directory and event.event_type == "modified":
+            return
+        self._watcher.record(os.fsdecode(event.src_path))
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self._watcher.record(os.fsdecode(dest_path))
+
+
+def _collapse_paths(paths: Set[str]) -> Set[str]:
+    """
+    合并路径集合：父目录已在集合中时去掉其子路径
+
+    Args:
+        paths: 相对路径集合
+
+    Returns:
+        合并后的路径集合
+    """
+    result: Set[str] = set()
+    for path in sorted(paths):
+        parts = path.split(os.sep)
+        if any(os.sep.join(parts[:i]) in result for i in range(1, len(parts))):
+            continue
+        result.add(path)
+    return result
@@ -0,0 +1,797 @@
+"""
+原生状态引擎 - 直接读取 .svn/wc.db 计算工作副本状态
+
+以只读方式打开 wc.db，枚举 NODES 和 ACTUAL_NODE，并将记录的 translated_size /
+last_mod_time 与磁盘上的 stat 结果比较（目录扫描和 stat 分发到线程池）。
+常见的 M/A/D/R/?/!/C/~ 状态直接得出；仅靠 stat 无法判断的文件优先与 pristine
+校验和比较，仍无法确定时才交给 svn 命令行处理。
+"""
+
+import fnmatch
+import hashlib
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .status_cache import SVN_ADMIN_DIR, WC_DB_NAME, find_wc_root
+from .svn_config import read_global_ignores
+
+# 支持的 wc.db 格式（svn 1.7 ~ 1.14）
+SUPPORTED_FORMATS = range(29, 32)
+
+# 影响工作文件内容转换的属性（存在时无法直接用校验和比较）
+TRANSLATION_PROPS = {"svn:eol-style", "svn:keywords", "svn:special"}
+
+# 忽略相关属性
+IGNORE_PROP = "svn:ignore"
+GLOBAL_IGNORES_PROP = "svn:global-ignores"
+
+# 交给 svn 命令行时每次传入的路径数量
+CLI_TARGETS_CHUNK = 100
+
+# 按路径查询节点时每条 SQL 语句的路径数量（sqlite 参数个数有上限）
+NODE_QUERY_CHUNK = 500
+
+# 计算校验和时的读取块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 磁盘条目类型
+DISK_FILE = "file"
+DISK_DIR = "dir"
+DISK_OTHER = "other"
+
+# 无法列出内容的目录（权限不足等）的扫描结果，按对象身份区分于空目录
+UNREADABLE_DIR: Dict[str, Tuple[str, int, int]] = {}
+
+# 节点元组字段索引（见 _load_nodes）
+_OP_DEPTH, _PRESENCE, _KIND, _SIZE, _MTIME, _COPIED, _EXTERNAL, _HAS_BASE, _CHECKSUM = range(9)
+
+
+def run_wc_db_status(
+    wc_path: Path, max_workers: Optional[int] = None
+) -> Optional[List[Tuple[str, str]]]:
+    """
+    使用原生引擎获取工作目录的 SVN 状态
+
+    Args:
+        wc_path: 工作目录（等同于 svn status 的执行目录）
+        max_workers: 线程池大小，为 None 时使用默认值
+
+    Returns:
+        (状态, 文件路径) 元组列表，路径相对于 wc_path；
+        不支持的工作副本（格式未知、需要 cleanup 等）返回 None，调用方应回退到 svn 命令行
+    """
+    wc_root = find_wc_root(wc_path)
+    if wc_root is None:
+        return None
+
+    try:
+        engine = WcDbStatusEngine(wc_root, max_workers)
+        try:
+            return engine.status(wc_path)
+        finally:
+            engine.close()
+    except sqlite3.Error as e:
+        print(f"警告: 无法读取 wc.db，回退到 svn 命令行: {e}", file=sys.stderr)
+        return None
+
+
+def read_node_states(wc_path: Path, paths: List[str]) -> Optional[Dict[str, str]]:
+    """
+    读取文件在 wc.db 中的节点状态摘要（不启动 svn 进程）
+
+    摘要由最上层节点的 op_depth、presence、revision（BASE 修订版本）以及本地属性修改
+    组成，svn update/commit/add/revert 或修改属性后都会变化。
+
+    Args:
+        wc_path: 工作目录（paths 相对于该目录）
+        paths: 文件路径列表
+
+    Returns:
+        路径 -> 状态摘要（未版本化的文件不包含在内）；不在工作副本中或无法读取时返回 None
+    """
+    wc_root = find_wc_root(wc_path)
+    if wc_root is None:
+        return None
+
+    try:
+        engine = WcDbStatusEngine(wc_root)
+        try:
+            return engine.node_states(_wc_relpaths(wc_path, wc_root, paths))
+        finally:
+            engine.close()
+    except sqlite3.Error as e:
+        print(f"警告: 无法读取 wc.db: {e}", file=sys.stderr)
+        return None
+
+
+def read_node_kinds(wc_path: Path, paths: List[str]) -> Dict[str, str]:
+    """
+    读取路径在 wc.db 中记录的节点类型（不启动 svn 进程）
+
+    用于判断已不在磁盘上的条目（缺失、已删除）是否为目录。
+
+    Args:
+        wc_path: 工作目录（paths 相对于该目录）
+        paths: 路径列表
+
+    Returns:
+        路径 -> 节点类型（file、dir、symlink）；没有记录、不在工作副本中或无法读取时不包含
+    """
+    wc_root = find_wc_root(wc_path)
+    if wc_root is None:
+        return {}
+
+    try:
+        engine = WcDbStatusEngine(wc_root)
+        try:
+            return engine.node_kinds(_wc_relpaths(wc_path, wc_root, paths))
+        finally:
+            engine.close()
+    except sqlite3.Error as e:
+        print(f"警告: 无法读取 wc.db: {e}", file=sys.stderr)
+        return {}
+
+
+def _wc_relpaths(wc_path: Path, wc_root: Path, paths: List[str]) -> Dict[str, str]:
+    """将相对于工作目录的路径转换为 wc.db 中的 relpath（relpath -> 原路径）"""
+    relpaths: Dict[str, str] = {}
+    for path in paths:
+        relpath = os.path.relpath(os.path.join(wc_path, path), wc_root).replace(os.sep, "/")
+        relpaths["" if relpath == "." else relpath] = path
+    return relpaths
+
+
+class WcDbStatusEngine:
+    """基于 wc.db 的状态计算引擎"""
+
+    def __init__(self, wc_root: Path, max_workers: Optional[int] = None):
+        """
+        初始化引擎并以只读方式打开 wc.db
+
+        Args:
+            wc_root: 工作副本根目录
+            max_workers: 线程池大小
+        """
+        self._wc_root = wc_root
+        self._max_workers = max_workers
+        db_uri = (wc_root / SVN_ADMIN_DIR / WC_DB_NAME).as_uri() + "?mode=ro"
+        self._conn = sqlite3.connect(db_uri, uri=True)
+        self._wc_id = 1
+        self._props_cache: Dict[str, Dict[str, bytes]] = {}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+
+    def status(self, wc_path: Path) -> Optional[List[Tuple[str, str]]]:
+        """
+        计算工作目录下所有变更条目
+
+        Args:
+            wc_path: 工作目录
+
+        Returns:
+            (状态, 文件路径) 元组列表，无法处理时返回 None
+        """
+        if not self._check_usable():
+            return None
+
+        prefix = wc_path.resolve().relative_to(self._wc_root).as_posix()
+        prefix = "" if prefix == "." else prefix
+
+        nodes = self._load_nodes(prefix)
+        if prefix not in nodes:
+            return None
+        actual = self._load_actual(prefix)
+        externals = self._load_externals(prefix)
+
+        versioned_dirs = [
+            relpath
+            for relpath, node in nodes.items()
+            if node[_KIND] == "dir" and node[_PRESENCE] == "normal" and relpath not in externals
+        ]
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            listings = dict(
+                zip(
+                    versioned_dirs,
+                    pool.map(_scan_dir, (self._abs_path(d) for d in versioned_dirs)),
+                )
+            )
+
+            statuses: Dict[str, str] = {}
+            ambiguous: List[str] = []
+            # 父目录无法列出时不能断定条目缺失，直接交给 svn 命令行判断
+            unreadable: List[str] = []
+            for relpath, node in nodes.items():
+                if relpath in externals:
+                    continue
+                if node[_EXTERNAL]:
+                    ambiguous.append(relpath)
+                    continue
+                if relpath != prefix and _parent_listing(relpath, listings) is UNREADABLE_DIR:
+                    unreadable.append(relpath)
+                    continue
+                status_code = self._node_status(relpath, node, listings, actual, prefix)
+                if status_code is None:
+                    ambiguous.append(relpath)
+                elif status_code:
+                    statuses[relpath] = status_code
+
+            # 冲突记录可能存在于没有节点的路径上（如树冲突的受害者）
+            for relpath, (_, conflict_code) in actual.items():
+                if conflict_code and relpath not in nodes:
+                    statuses[relpath] = "C"
+
+            statuses.update(self._unversioned(nodes, listings, externals, prefix))
+
+            cli_targets = self._resolve_by_checksum(ambiguous, nodes, statuses, pool)
+            cli_targets.extend(unreadable)
+
+        # 目录外部定义在 NODES 中没有记录：与 svn status 一样列出外部目录本身（X），
+        # 其中的变更由 svn 命令行递归查询
+        for relpath in externals:
+            statuses[relpath] = "X"
+        cli_targets.extend(sorted(externals))
+
+        statuses.update(self._resolve_by_cli(cli_targets, prefix))
+
+        return [
+            (statuses[relpath], self._display_path(relpath, prefix))
+            for relpath in sorted(statuses)
+        ]
+
+    def node_states(self, relpaths: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        读取节点状态摘要（见 read_node_states）
+
+        Args:
+            relpaths: relpath -> 调用方使用的路径
+
+        Returns:
+            调用方使用的路径 -> 状态摘要，格式不受支持时返回 None
+        """
+        if not self._check_usable():
+            return None
+
+        rows: Dict[str, Tuple[Any, ...]] = {}
+        keys = list(relpaths)
+        for start in range(0, len(keys), NODE_QUERY_CHUNK):
+            chunk = keys[start : start + NODE_QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self._conn.execute(
+                "SELECT n.local_relpath, n.op_depth, n.presence, n.revision, a.properties "
+                "FROM nodes n LEFT JOIN actual_node a "
+                "ON a.wc_id = n.wc_id AND a.local_relpath = n.local_relpath "
+                f"WHERE n.wc_id = ? AND n.local_relpath IN ({placeholders})",
+                (self._wc_id, *chunk),
+            ):
+                # 只保留最上层（op_depth 最大）的节点
+                current = rows.get(row[0])
+                if current is None or row[1] > current[1]:
+                    rows[row[0]] = row
+
+        states = {}
+        for relpath, op_depth, presence, revision, properties in rows.values():
+            props_digest = ""
+            if properties:
+                props_digest = hashlib.blake2b(properties, digest_size=8).hexdigest()
+            states[relpaths[relpath]] = f"{op_depth}:{presence}:{revision}:{props_digest}"
+        return states
+
+    def node_kinds(self, relpaths: Dict[str, str]) -> Dict[str, str]:
+        """
+        读取最上层节点的类型（见 read_node_kinds）
+
+        Args:
+            relpaths: relpath -> 调用方使用的路径
+
+        Returns:
+            调用方使用的路径 -> 节点类型，格式不受支持时返回空字典
+        """
+        if not self._check_usable():
+            return {}
+
+        kinds: Dict[str, str] = {}
+        keys = list(relpaths)
+        for start in range(0, len(keys), NODE_QUERY_CHUNK):
+            chunk = keys[start : start + NODE_QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            # 按 op_depth 升序读取，最上层的节点最后写入
+            for relpath, kind in self._conn.execute(
+                "SELECT local_relpath, kind FROM nodes "
+                f"WHERE wc_id = ? AND local_relpath IN ({placeholders}) ORDER BY op_depth",
+                (self._wc_id, *chunk),
+            ):
+                kinds[relpaths[relpath]] = kind
+        return kinds
+
+    def _check_usable(self) -> bool:
+        """检查 wc.db 格式是否受支持且没有待执行的工作队列"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in SUPPORTED_FORMATS:
+            return False
+        if self._conn.execute("SELECT 1 FROM work_queue LIMIT 1").fetchone():
+            return False
+        row = self._conn.execute("SELECT id FROM wcroot WHERE local_abspath IS NULL").fetchone()
+        if row is not None:
+            self._wc_id = row[0]
+        return True
+
+    def _relpath_filter(self, prefix: str) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        生成限定在 prefix 子树内的 SQL 条件
+
+        使用范围比较代替 LIKE（LIKE 对 ASCII 大小写不敏感）。
+        """
+        if not prefix:
+            return "wc_id = ?", (self._wc_id,)
+        return (
+            "wc_id = ? AND (local_relpath = ? OR (local_relpath > ? AND local_relpath < ?))",
+            (self._wc_id, prefix, prefix + "/", prefix + "0"),
+        )
+
+    def _load_nodes(self, prefix: str) -> Dict[str, Tuple[Any, ...]]:
+        """
+        读取每个路径最上层（op_depth 最大）的节点
+
+        Returns:
+            relpath -> (op_depth, presence, kind, translated_size, last_mod_time,
+            是否复制, file_external, 是否有 BASE 节点, checksum)
+        """
+        where, params = self._relpath_filter(prefix)
+        rows = self._conn.execute(
+            "SELECT local_relpath, op_depth, presence, kind, translated_size, last_mod_time, "
+            "repos_id IS NOT NULL, file_external IS NOT NULL, checksum "
+            f"FROM nodes WHERE {where} ORDER BY local_relpath, op_depth",
+            params,
+        )
+
+        nodes: Dict[str, Tuple[Any, ...]] = {}
+        for relpath, op_depth, presence, kind, size, mtime, copied, external, checksum in rows:
+            if op_depth == 0:
+                has_base = presence in ("normal", "incomplete")
+            elif relpath in nodes:
+                has_base = nodes[relpath][_HAS_BASE]
+            else:
+                has_base = False
+            nodes[relpath] = (
+                op_depth,
+                presence,
+                kind,
+                size,
+                mtime,
+                bool(copied),
+                bool(external),
+                has_base,
+                checksum,
+            )
+        return nodes
+
+    def _load_actual(self, prefix: str) -> Dict[str, Tuple[bool, str]]:
+        """
+        读取 ACTUAL_NODE 中的属性修改和冲突信息
+
+        Returns:
+            relpath -> (属性是否修改, 冲突状态码)，冲突状态码为 "C"（内容/树冲突）、
+            "_C"（仅属性冲突）或空字符串
+        """
+        # 1.7 格式使用 conflict_old 等独立列，1.8 起统一存放在 conflict_data skel 中
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(actual_node)")}
+        text_conflict = [
+            f"{c} IS NOT NULL"
+            for c in ("conflict_old", "conflict_new", "conflict_working", "tree_conflict_data")
+            if c in columns
+        ]
+        text_expr = " OR ".join(text_conflict) or "0"
+        prop_expr = "prop_reject IS NOT NULL" if "prop_reject" in columns else "0"
+        data_expr = "conflict_data" if "conflict_data" in columns else "NULL"
+
+        where, params = self._relpath_filter(prefix)
+        rows = self._conn.execute(
+            f"SELECT local_relpath, properties IS NOT NULL, {text_expr}, {prop_expr}, {data_expr} "
+            f"FROM actual_node WHERE {where}",
+            params,
+        )
+
+        actual: Dict[str, Tuple[bool, str]] = {}
+        for relpath, props_modified, text_conflicted, prop_conflicted, conflict_data in rows:
+            if conflict_data:
+                kinds = _conflict_kinds(conflict_data)
+                text_conflicted = text_conflicted or bool(kinds - {b"prop"})
+                prop_conflicted = prop_conflicted or b"prop" in kinds
+            conflict_code = "C" if text_conflicted else ("_C" if prop_conflicted else "")
+            actual[relpath] = (bool(props_modified), conflict_code)
+        return actual
+
+    def _load_externals(self, prefix: str) -> Set[str]:
+        """读取目录外部定义（外部目录是独立的工作副本，没有 NODES 记录，交给 svn 命令行处理）"""
+        where, params = self._relpath_filter(prefix)
+        try:
+            rows = self._conn.execute(
+                f"SELECT local_relpath FROM externals WHERE {where} AND kind = 'dir'", params
+            )
+            return {row[0] for row in rows}
+        except sqlite3.Error:
+            return set()
+
+    def _node_status(
+        self,
+        relpath: str,
+        node: Tuple[Any, ...],
+        listings: Dict[str, Optional[Dict[str, Tuple[str, int, int]]]],
+        actual: Dict[str, Tuple[bool, str]],
+        prefix: str,
+    ) -> Optional[str]:
+        """
+        计算单个节点的状态码
+
+        Returns:
+            状态码；空字符串表示无变更；None 表示无法仅凭 stat 判断
+        """
+        op_depth, presence, kind = node[_OP_DEPTH], node[_PRESENCE], node[_KIND]
+        content = ""
+
+        if presence == "base-deleted":
+            content = "D"
+        elif presence == "incomplete":
+            content = "!"
+        elif presence != "normal":
+            # not-present / excluded / server-excluded 不显示
+            content = ""
+        else:
+            if op_depth > 0:
+                is_op_root = op_depth == relpath.count("/") + 1
+                if is_op_root:
+                    content = "R" if node[_HAS_BASE] else "A"
+                elif not node[_COPIED]:
+                    content = "A"
+
+            disk = _lookup_disk(relpath, listings) if relpath != prefix else (DISK_DIR, 0, 0)
+            if disk is None:
+                content = "!"
+            elif disk[0] != kind and kind in (DISK_FILE, DISK_DIR):
+                content = "~"
+            elif not content and kind == "symlink":
+                return None
+            elif not content and kind == DISK_FILE:
+                modified = _compare_stat(node, disk)
+                if modified is None:
+                    return None
+                content = "M" if modified else ""
+
+        props_modified, conflict_code = actual.get(relpath, (False, ""))
+        if conflict_code == "C":
+            return "C"
+        if content:
+            return content
+        if conflict_code:
+            return conflict_code
+        return "_M" if props_modified and presence == "normal" else ""
+
+    def _unversioned(
+        self,
+        nodes: Dict[str, Tuple[Any, ...]],
+        listings: Dict[str, Optional[Dict[str, Tuple[str, int, int]]]],
+        externals: Set[str],
+        prefix: str,
+    ) -> Dict[str, str]:
+        """
+        找出版本化目录中未纳入版本控制且未被忽略的条目
+
+        Returns:
+            relpath -> "?"
+        """
+        global_ignores = read_global_ignores()
+        inherited_ignores = self._inherited_global_ignores()
+        result: Dict[str, str] = {}
+
+        for dir_relpath, listing in listings.items():
+            if not listing:
+                continue
+            if nodes[dir_relpath][_PRESENCE] != "normal":
+                continue
+
+            patterns: Optional[List[str]] = None
+            for name in listing:
+                if name == SVN_ADMIN_DIR:
+                    continue
+                relpath = f"{dir_relpath}/{name}" if dir_relpath else name
+                if relpath in nodes or relpath in externals:
+                    continue
+                if patterns is None:
+                    patterns = (
+                        global_ignores + inherited_ignores + self._dir_ignore_patterns(dir_relpath)
+                    )
+                if not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+                    result[relpath] = "?"
+
+        return result
+
+    def _dir_ignore_patterns(self, dir_relpath: str) -> List[str]:
+        """获取目录自身的 svn:ignore 以及 WC 内各级目录的 svn:global-ignores"""
+        patterns = _split_prop(self._node_props(dir_relpath).get(IGNORE_PROP))
+        current: Optional[str] = dir_relpath
+        while current is not None:
+            patterns += _split_prop(self._node_props(current).get(GLOBAL_IGNORES_PROP))
+            current = current.rpartition("/")[0] if current else None
+        return patterns
+
+    def _inherited_global_ignores(self) -> List[str]:
+        """获取从仓库中 WC 根目录以上各级继承的 svn:global-ignores"""
+        row = self._conn.execute(
+            "SELECT inherited_props FROM nodes WHERE wc_id = ? AND local_relpath = '' "
+            "AND op_depth = 0",
+            (self._wc_id,),
+        ).fetchone()
+        if not row or not row[0]:
+            return []
+
+        patterns: List[str] = []
+        skel = parse_skel(row[0])
+        for item in skel if isinstance(skel, list) else []:
+            if isinstance(item, list) and len(item) == 2 and isinstance(item[1], list):
+                props = _skel_to_props(item[1])
+                patterns += _split_prop(props.get(GLOBAL_IGNORES_PROP))
+        return patterns
+
+    def _node_props(self, relpath: str) -> Dict[str, bytes]:
+        """读取节点当前属性（ACTUAL 优先，其次最上层节点），结果缓存"""
+        if relpath in self._props_cache:
+            return self._props_cache[relpath]
+
+        row = self._conn.execute(
+            "SELECT properties FROM actual_node WHERE wc_id = ? AND local_relpath = ?",
+            (self._wc_id, relpath),
+        ).fetchone()
+        if not row or row[0] is None:
+            row = self._conn.execute(
+                "SELECT properties FROM nodes WHERE wc_id = ? AND local_relpath = ? "
+                "ORDER BY op_depth DESC LIMIT 1",
+                (self._wc_id, relpath),
+            ).fetchone()
+
+        props = _skel_to_props(parse_skel(row[0])) if row and row[0] else {}
+        self._props_cache[relpath] = props
+        return props
+
+    def _resolve_by_checksum(
+        self,
+        ambiguous: List[str],
+        nodes: Dict[str, Tuple[Any, ...]],
+        statuses: Dict[str, str],
+        pool: ThreadPoolExecutor,
+    ) -> List[str]:
+        """
+        对没有内容转换属性的文件，计算 SHA-1 与 pristine 校验和比较
+
+        Returns:
+            仍无法确定、需要交给 svn 命令行的路径列表
+        """
+        hashable: List[str] = []
+        cli_targets: List[str] = []
+        for relpath in ambiguous:
+            node = nodes.get(relpath)
+            checksum = node[_CHECKSUM] if node else None
+            if (
+                node is not None
+                and node[_KIND] == DISK_FILE
+                and not node[_EXTERNAL]
+                and checksum
+                and checksum.startswith("$sha1$")
+                and not TRANSLATION_PROPS & self._node_props(relpath).keys()
+            ):
+                hashable.append(relpath)
+            else:
+                cli_targets.append(relpath)
+
+        digests = pool.map(_sha1_file, (self._abs_path(relpath) for relpath in hashable))
+        for relpath, digest in zip(hashable, digests):
+            if digest is None:
+                cli_targets.append(relpath)
+            elif digest != nodes[relpath][_CHECKSUM][len("$sha1$") :]:
+                statuses[relpath] = "M"
+
+        return cli_targets
+
+    def _resolve_by_cli(self, relpaths: List[str], prefix: str) -> Dict[str, str]:
+        """
+        调用 svn 命令行查询无法确定的路径（目录按 svn status 默认的无限深度查询）
+
+        Returns:
+            relpath -> 状态码
+        """
+        from .commit import iter_svn_status
+
+        result: Dict[str, str] = {}
+        display_to_relpath = {self._display_path(r, prefix): r for r in relpaths}
+        targets = list(display_to_relpath)
+
+        for start in range(0, len(targets), CLI_TARGETS_CHUNK):
+            for status_code, path in iter_svn_status(targets[start : start + CLI_TARGETS_CHUNK]):
+                relpath = display_to_relpath.get(path)
+                if relpath is None:
+                    # 外部目录中的条目
+                    relpath = self._relpath_from_display(path, prefix)
+                result[relpath] = status_code
+
+        return result
+
+    def _abs_path(self, relpath: str) -> str:
+        """relpath 转换为绝对路径"""
+        return os.path.join(self._wc_root, *relpath.split("/")) if relpath else str(self._wc_root)
+
+    @staticmethod
+    def _display_path(relpath: str, prefix: str) -> str:
+        """relpath 转换为相对于工作目录的显示路径（与 svn status 输出一致）"""
+        if relpath == prefix:
+            return "."
+        rel = relpath[len(prefix) + 1 :] if prefix else relpath
+        return rel.replace("/", os.sep)
+
+    @staticmethod
+    def _relpath_from_display(path: str, prefix: str) -> str:
+        """显示路径转换回 relpath"""
+        rel = path.replace(os.sep, "/")
+        return f"{prefix}/{rel}" if prefix else rel
+
+
+def _scan_dir(dir_path: str) -> Optional[Dict[str, Tuple[str, int, int]]]:
+    """
+    列出目录内容并获取每个条目的 stat 信息（在线程池中执行）
+
+    Returns:
+        名称 -> (类型, 大小, 修改时间纳秒)，目录不存在时返回 None，
+        无法读取时返回 UNREADABLE_DIR
+    """
+    listing: Dict[str, Tuple[str, int, int]] = {}
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    kind = DISK_DIR
+                elif entry.is_file(follow_symlinks=False):
+                    kind = DISK_FILE
+                else:
+                    kind = DISK_OTHER
+                listing[entry.name] = (kind, st.st_size, st.st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError:
+        return UNREADABLE_DIR
+    return listing
+
+
+def _parent_listing(
+    relpath: str, listings: Dict[str, Optional[Dict[str, Tuple[str, int, int]]]]
+) -> Optional[Dict[str, Tuple[str, int, int]]]:
+    """获取条目父目录的扫描结果"""
+    return listings.get(relpath.rpartition("/")[0])
+
+
+def _lookup_disk(
+    relpath: str, listings: Dict[str, Optional[Dict[str, Tuple[str, int, int]]]]
+) -> Optional[Tuple[str, int, int]]:
+    """从父目录的扫描结果中查找条目"""
+    listing = _parent_listing(relpath, listings)
+    if not listing:
+        return None
+    return listing.get(relpath.rpartition("/")[2])
+
+
+def _compare_stat(node: Tuple[Any, ...], disk: Tuple[str, int, int]) -> Optional[bool]:
+    """
+    比较记录的 translated_size / last_mod_time 与磁盘 stat
+
+    Returns:
+        True 已修改；False 未修改；None 无法判断（大小相同但时间不同或未记录）
+    """
+    size, mtime = node[_SIZE], node[_MTIME]
+    if size is None or size < 0 or mtime is None:
+        return None
+    if disk[1] != size:
+        return True
+    # last_mod_time 以微秒记录
+    if disk[2] // 1000 == mtime:
+        return False
+    return None
+
+
+def _sha1_file(path: str) -> Optional[str]:
+    """计算文件 SHA-1（在线程池中执行），失败返回 None"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _split_prop(value: Optional[bytes]) -> List[str]:
+    """将多行/空白分隔的属性值拆分为模式列表"""
+    if not value:
+        return []
+    return value.decode("utf-8", errors="ignore").split()
+
+
+def _conflict_kinds(conflict_data: bytes) -> Set[bytes]:
+    """
+    从冲突 skel 中提取冲突类型
+
+    结构为 ((操作信息...) ((text ...) (prop ...) (tree ...)))，无法解析时视为内容冲突。
+    """
+    skel = parse_skel(conflict_data)
+    if not isinstance(skel, list) or len(skel) < 2 or not isinstance(skel[1], list):
+        return {b"text"}
+    return {c[0] for c in skel[1] if isinstance(c, list) and c and isinstance(c[0], bytes)}
+
+
+def _skel_to_props(skel: Any) -> Dict[str, bytes]:
+    """将属性 skel 列表 (name value name value ...) 转换为字典"""
+    if not isinstance(skel, list):
+        return {}
+    props: Dict[str, bytes] = {}
+    for i in range(0, len(skel) - 1, 2):
+        name, value = skel[i], skel[i + 1]
+        if isinstance(name, bytes) and isinstance(value, bytes):
+            props[name.decode("utf-8", errors="ignore")] = value
+    return props
+
+
+def parse_skel(data: bytes) -> Any:
+    """
+    解析 svn skel 格式数据（wc.db 中属性等字段的编码）
+
+    原子有两种形式：以字母开头的隐式原子，以及 "长度 空格 内容" 的显式原子；
+    列表用圆括号包围。
+
+    Args:
+        data: skel 二进制数据
+
+    Returns:
+        解析结果：列表（list）或原子（bytes），数据为空时返回 None
+    """
+    whitespace = b" \t\n\r\f"
+    stack: List[List[Any]] = [[]]
+    i, n = 0, len(data)
+
+    while i < n:
+        c = data[i]
+        if c in whitespace:
+            i += 1
+        elif c == 0x28:  # (
+            stack.append([])
+            i += 1
+        elif c == 0x29:  # )
+            if len(stack) == 1:
+                break
+            finished = stack.pop()
+            stack[-1].append(finished)
+            i += 1
+        elif 0x30 <= c <= 0x39:  # 显式长度原子
+            j = i
+            while j < n and 0x30 <= data[j] <= 0x39:
+                j += 1
+            length = int(data[i:j])
+            start = j + 1
+            stack[-1].append(data[start : start + length])
+            i = start + length
+        else:  # 隐式原子
+            j = i
+            while j < n and data[j] not in whitespace and data[j] not in b"()":
+                j += 1
+            stack[-1].append(data[i:j])
+            i = j
+
+    return stack[0][0] if stack[0] else None
+
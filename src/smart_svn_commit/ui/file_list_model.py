@@ -0,0 +1,282 @@
+"""
+文件列表模型模块
+
+基于列式条目存储的 Qt 模型。不为每个文件创建控件项，视图只为可见区域内的行请求数据。
+"""
+
+from typing import Iterable, List, Set
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+from ..core.entry_store import FileEntryStore
+from .constants import CANDIDATE_BG_COLOR, CHECKBOX_COLUMN, PATH_COLUMN, STATUS_COLORS
+
+# 表头文字
+HEADER_LABELS = ["", "文件路径"]
+
+# 一次移除的行数超过该值时改为重置模型
+_MAX_ROW_REMOVALS = 100
+
+# 单元格标志
+_ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemNeverHasChildren
+_CHECKBOX_FLAGS = _ITEM_FLAGS | Qt.ItemIsUserCheckable
+
+
+class FileListModel(QAbstractTableModel):
+    """
+    文件列表模型
+
+    rows 保存显示顺序下的条目索引（只包含通过过滤的条目），过滤和排序只替换这份排列；
+    复选框状态按条目索引保存在 bytearray 中（每个条目一个字节），隐藏的条目保留选中状态。
+
+    Signals:
+        checkStateChanged: 用户在视图中点击复选框时发送，参数为 (行号, 新的复选框状态)
+    """
+
+    checkStateChanged = pyqtSignal(int, int)
+
+    def __init__(self, icon_cache, parent=None):
+        """
+        初始化模型
+
+        Args:
+            icon_cache: 图标缓存（按路径获取图标）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._icon_cache = icon_cache
+        self._store = FileEntryStore()
+        self._rows: List[int] = []
+        self._checked = bytearray()
+        self._candidate_rows: Set[int] = set()
+
+        # 缓存颜色画刷
+        self._color_brushes = {color: QBrush(QColor(color)) for color in STATUS_COLORS.values()}
+        self._candidate_bg = QBrush(QColor(CANDIDATE_BG_COLOR))
+
+    # ---- Qt 模型接口 ----
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADER_LABELS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADER_LABELS[section]
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _CHECKBOX_FLAGS if index.column() == CHECKBOX_COLUMN else _ITEM_FLAGS
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        entry = self._rows[row]
+
+        if index.column() == CHECKBOX_COLUMN:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._checked[entry] else Qt.Unchecked
+            return None
+
+        if role == Qt.DisplayRole:
+            return f"[{self._store.statuses[entry]}] {self._store.paths[entry]}"
+        if role == Qt.DecorationRole:
+            # 目录和文件使用统一的颜色，只区分 SVN 状态
+            return self._icon_cache.get(self._store.paths[entry], self._store.is_dir(entry))
+        if role == Qt.ForegroundRole:
+            # 纯属性修改（_M）使用对应状态码的颜色
+            color = STATUS_COLORS.get(self._store.statuses[entry].lstrip("_"), "#000000")
+            brush = self._color_brushes.get(color)
+            if brush is None:
+                brush = self._color_brushes[color] = QBrush(QColor(color))
+            return brush
+        if role == Qt.BackgroundRole and row in self._candidate_rows:
+            return self._candidate_bg
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != CHECKBOX_COLUMN or role != Qt.CheckStateRole:
+            return False
+        state = Qt.Checked if value == Qt.Checked else Qt.Unchecked
+        self._checked[self._rows[index.row()]] = state == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.checkStateChanged.emit(index.row(), state)
+        return True
+
+    # ---- 条目与行 ----
+
+    @property
+    def store(self) -> FileEntryStore:
+        """当前条目存储"""
+        return self._store
+
+    @property
+    def rows(self) -> List[int]:
+        """显示顺序下的条目索引（只读）"""
+        return self._rows
+
+    def set_store(self, store: FileEntryStore) -> None:
+        """
+        设置条目存储并清空所有行和选中状态
+
+        Args:
+            store: 文件条目存储
+        """
+        self.beginResetModel()
+        self._store = store
+        self._rows = []
+        self._checked = bytearray(len(store))
+        self._candidate_rows = set()
+        self.endResetModel()
+
+    def entry_at(self, row: int) -> int:
+        """
+        获取行对应的条目索引
+
+        Args:
+            row: 行号
+
+        Returns:
+            条目索引
+        """
+        return self._rows[row]
+
+    def set_rows(self, rows: List[int]) -> None:
+        """
+        替换显示的行（过滤、排序后调用）
+
+        Args:
+            rows: 显示顺序下的条目索引
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._candidate_rows = set()
+        self.endResetModel()
+
+    def append_rows(self, entries: List[int]) -> None:
+        """
+        在末尾追加行
+
+        Args:
+            entries: 条目索引列表
+        """
+        if not entries:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(entries) - 1)
+        self._rows.extend(entries)
+        self.endInsertRows()
+
+    def remove_entries(self, entries: Set[int]) -> None:
+        """
+        移除条目对应的行
+
+        Args:
+            entries: 条目索引集合
+        """
+        removed_rows = [row for row, entry in enumerate(self._rows) if entry in entries]
+        if not removed_rows:
+            return
+        if len(removed_rows) > _MAX_ROW_REMOVALS:
+            self.set_rows([entry for entry in self._rows if entry not in entries])
+            return
+        for row in reversed(removed_rows):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        self._candidate_rows = set()
+
+    def refresh(self) -> None:
+        """通知视图所有行的数据已变化（状态更新后调用，视图只重绘可见行）"""
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(self._rows) - 1, len(HEADER_LABELS) - 1)
+            )
+
+    # ---- 选中状态 ----
+
+    def is_checked(self, entry: int) -> bool:
+        """判断条目是否选中"""
+        return bool(self._checked[entry])
+
+    def checked_entries(self) -> List[int]:
+        """
+        获取显示中且选中的条目
+
+        Returns:
+            条目索引列表（按显示顺序）
+        """
+        flags = self._checked
+        return [entry for entry in self._rows if flags[entry]]
+
+    def set_checked(self, entries: Iterable[int], checked: bool, notify: bool = True) -> None:
+        """
+        设置条目的选中状态（不发送 checkStateChanged）
+
+        Args:
+            entries: 条目索引序列
+            checked: 是否选中
+            notify: 是否通知视图重绘（条目尚未显示时无需通知）
+        """
+        value = 1 if checked else 0
+        flags = self._checked
+        for entry in entries:
+            flags[entry] = value
+        if notify:
+            self._emit_check_changed()
+
+    def toggle_checked(self, entries: Iterable[int]) -> None:
+        """
+        反转条目的选中状态（不发送 checkStateChanged）
+
+        Args:
+            entries: 条目索引序列
+        """
+        flags = self._checked
+        for entry in entries:
+            flags[entry] ^= 1
+        self._emit_check_changed()
+
+    def ensure_capacity(self) -> None:
+        """条目存储追加条目后扩展选中状态数组"""
+        missing = len(self._store) - len(self._checked)
+        if missing > 0:
+            self._checked.extend(bytes(missing))
+
+    def clear_checked(self) -> None:
+        """清除所有条目的选中状态"""
+        self._checked = bytearray(len(self._store))
+        self._emit_check_changed()
+
+    def _emit_check_changed(self) -> None:
+        """通知视图复选框列已变化"""
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, CHECKBOX_COLUMN),
+                self.index(len(self._rows) - 1, CHECKBOX_COLUMN),
+                [Qt.CheckStateRole],
+            )
+
+    # ---- 备选项高亮 ----
+
+    def set_candidate_rows(self, rows: Set[int]) -> None:
+        """
+        设置高亮显示的备选行
+
+        Args:
+            rows: 行号集合
+        """
+        changed = self._candidate_rows ^ rows
+        self._candidate_rows = set(rows)
+        if changed and self._rows:
+            self.dataChanged.emit(
+                self.index(min(changed), PATH_COLUMN),
+                self.index(min(max(changed), len(self._rows) - 1), PATH_COLUMN),
+                [Qt.BackgroundRole],
+            )
@@ -2,128 +2,288 @@
 文件列表控件模块
 """
 
-from typing import List, Optional, Set, Tuple
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Set, Union
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QColor, QGuiApplication
-from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem
+from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtGui import QGuiApplication
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
 
-from smart_svn_commit.core.parser import extract_path_from_display_text
+from smart_svn_commit.core.entry_store import FileEntryStore, sort_entries
+from smart_svn_commit.utils.filters import IncrementalSearch, filter_entries
+from smart_svn_commit.utils.fuzzy import FuzzyMatcher, fuzzy_filter
+from smart_svn_commit.utils.ngram_index import TrigramIndex
 
 from .icon_cache import get_global_icon_cache
-from .constants import (
-    CANDIDATE_BG_COLOR,
-    CHECKBOX_COLUMN,
-    PATH_COLUMN,
-    STATUS_COLORS,
-)
+from .constants import CHECKBOX_COLUMN
+from .file_list_model import FileListModel
 from .logger import ui_logger
 
 
+class SearchSnapshot(NamedTuple):
+    """
+    派发搜索时的状态快照（在界面线程中创建，交给 run_search 计算）
+
+    engine 是当时使用的搜索引擎实例：替换条目存储时列表改用新的实例，
+    后台线程中仍在计算的搜索不会与界面线程共享引擎状态。
+    """
+
+    store: FileEntryStore
+    size: int
+    text: str
+    fuzzy: bool
+    engine: Union[IncrementalSearch, FuzzyMatcher]
+    index: Optional[TrigramIndex]
+
+
+class SearchResult(NamedTuple):
+    """搜索结果：store 与 size 为计算时的条目存储及条目数，fuzzy 表示 indices 按得分排序"""
+
+    store: FileEntryStore
+    text: str
+    fuzzy: bool
+    indices: List[int]
+    size: int
+
+
 class FileListWidget:
-    """带复选框的文件列表控件"""
+    """
+    带复选框的文件列表控件
+
+    使用 QTableView 显示 FileListModel，列表只保存条目索引的排列，不为每个文件创建控件项。
+    （QTreeView 布局时会逐行查询模型，行数很多时重置一次需要数秒；QTableView 行高固定，
+    布局和绘制只涉及可见区域内的行。）
+    搜索过滤和排序只替换模型中的行排列；选中、计数和批量操作只作用于显示中的行。
+    模糊搜索模式下匹配项按得分排列。
+    """
 
     def __init__(self, parent=None):
-        self.tree = QTreeWidget(parent)
-        self._setup_tree()
+        self.view = QTableView(parent)
+        self.store = FileEntryStore()
+        # 列表中的全部条目（按当前排序），以及其中匹配搜索文本的条目
+        self._order: List[int] = []
+        self._listed: Set[int] = set()
+        self._visible: Set[int] = set()
+        self._search = IncrementalSearch()
+        self._search_index: Optional[TrigramIndex] = None
+        self._search_text = ""
+        self._fuzzy = FuzzyMatcher()
+        self._fuzzy_enabled = False
+        self._sort_by: Union[str, Sequence[str]] = "default"
+        self._ascending = True
         self._icon_cache = get_global_icon_cache(parent.style() if parent else None)
+        self.model = FileListModel(self._icon_cache, self.view)
+        self._setup_view()
 
-        # 缓存颜色画刷
-        self._color_brushes = {
-            color: QBrush(QColor(color)) for color in STATUS_COLORS.values()
-        }
-
-        # 备选范围相关
+        # 备选范围相关（行号）
         self.candidate_indices: Set[int] = set()
         self.shift_start_index: int = -1
 
-        # 缓存背景色
-        self._candidate_bg = QBrush(QColor(CANDIDATE_BG_COLOR))
-        self._default_bg = QBrush()
+    def _setup_view(self) -> None:
+        """初始化视图配置（外观与单列列表一致）"""
+        view = self.view
+        view.setModel(self.model)
+        view.setShowGrid(False)
+        view.setWordWrap(False)
+        view.setAlternatingRowColors(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SingleSelection)
+        view.setColumnWidth(CHECKBOX_COLUMN, 30)
+
+        # 行号表头隐藏，行高固定（视图无需逐行计算尺寸）
+        rows_header = view.verticalHeader()
+        rows_header.hide()
+        rows_header.setSectionResizeMode(QHeaderView.Fixed)
+        rows_header.setDefaultSectionSize(view.fontMetrics().height() + 6)
+
+        columns_header = view.horizontalHeader()
+        columns_header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        columns_header.setHighlightSections(False)
+        columns_header.setStretchLastSection(True)
+
+    def set_store(self, store: FileEntryStore) -> None:
+        """
+        设置条目存储（不会自动重建列表）
 
-    def _setup_tree(self) -> None:
-        """初始化树控件配置"""
-        self.tree.setHeaderLabels(["", "文件路径"])
-        self.tree.setColumnWidth(CHECKBOX_COLUMN, 30)
-        self.tree.setAlternatingRowColors(True)
-        self.tree.setRootIsDecorated(False)
+        Args:
+            store: 文件条目存储
+        """
+        self.store = store
+        self._order = []
+        self._listed = set()
+        self._visible = set()
+        # 创建新的搜索引擎而不是重置：后台线程可能仍在使用旧的实例
+        self._search = IncrementalSearch()
+        self._search_index = None
+        self._fuzzy = FuzzyMatcher()
+        self.model.set_store(store)
+        self.candidate_indices.clear()
+        self.shift_start_index = -1
 
-    def add_item(self, status: str, path: str) -> None:
-        """添加文件项"""
-        tree_item = QTreeWidgetItem()
-        tree_item.setFlags(tree_item.flags() | Qt.ItemIsUserCheckable)
-        tree_item.setCheckState(CHECKBOX_COLUMN, Qt.Unchecked)
+    def set_fuzzy_enabled(self, enabled: bool) -> None:
+        """
+        切换模糊搜索模式（不会自动重新过滤）
 
-        # 设置状态文字和路径
-        tree_item.setText(PATH_COLUMN, f"[{status}] {path}")
+        Args:
+            enabled: 是否启用模糊搜索
+        """
+        self._fuzzy_enabled = enabled
 
-        # 设置文件图标（目录和文件使用统一的颜色，只区分 SVN 状态）
-        icon = self._icon_cache.get(path)
-        tree_item.setIcon(PATH_COLUMN, icon)
+    def set_search_index(self, store: FileEntryStore, index: Optional[TrigramIndex]) -> None:
+        """
+        设置搜索使用的三元组索引
 
-        # 使用状态颜色作为字体颜色，文件和目录统一
-        # 纯属性修改（_M）使用对应状态码的颜色
-        color_key = status.lstrip("_")
-        color = STATUS_COLORS.get(color_key, "#000000")
-        if color not in self._color_brushes:
-            self._color_brushes[color] = QBrush(QColor(color))
-        tree_item.setForeground(PATH_COLUMN, self._color_brushes[color])
+        Args:
+            store: 建立索引时使用的条目存储（与当前存储不同时忽略）
+            index: 三元组索引
+        """
+        if store is self.store:
+            self._search_index = index
+
+    def clear(self) -> None:
+        """清空列表（保留当前搜索文本）"""
+        self._order = []
+        self._listed = set()
+        self._visible = set()
+        self.model.set_rows([])
+        self.candidate_indices.clear()
+        self.shift_start_index = -1
 
-        self.tree.addTopLevelItem(tree_item)
+    def add_entries(self, indices: Iterable[int], checked_paths: Set[str]) -> None:
+        """
+        批量添加条目，路径在 checked_paths 中的项设为选中，匹配当前搜索文本的项追加到末尾
 
-    def get_checked_items(self) -> List[str]:
+        Args:
+            indices: 条目索引序列
+            checked_paths: 需要选中的文件路径集合
         """
-        获取选中的文件路径
+        indices = [i for i in indices if i not in self._listed]
+        if not indices:
+            return
+
+        paths = self.store.paths
+        ext_keys = self.store.ext_keys
+        # 每种后缀取一个路径，一次性获取这批条目涉及的图标
+        self._icon_cache.warm({ext_keys[i]: paths[i] for i in indices}.values())
+
+        self.model.ensure_capacity()
+        self.model.set_checked(indices, False, notify=False)
+        if checked_paths:
+            checked = [i for i in indices if paths[i] in checked_paths]
+            self.model.set_checked(checked, True, notify=False)
+
+        if self._search_text:
+            matched_set = set(self._match(self._search_text, indices))
+            matched = [i for i in indices if i in matched_set]
+        else:
+            matched = indices
+
+        self._order.extend(indices)
+        self._listed.update(indices)
+        self._visible.update(matched)
+        self.model.append_rows(matched)
+
+    def update_entries(self, indices: Set[int]) -> None:
+        """
+        按存储中的最新状态刷新已显示的条目（视图只重绘可见区域）
+
+        Args:
+            indices: 状态发生变化的条目索引集合
+        """
+        if indices & self._visible:
+            self.model.refresh()
+
+    def remove_entries(self, indices: Set[int]) -> None:
+        """
+        移除条目对应的行（保留滚动位置，备选项按条目重新定位到新的行号）
+
+        Args:
+            indices: 需要移除的条目索引集合
+        """
+        indices = indices & self._listed
+        if not indices:
+            return
+
+        rows = self.model.rows
+        candidates = {rows[i] for i in self.candidate_indices if i < len(rows)} - indices
+        anchor = rows[self.shift_start_index] if 0 <= self.shift_start_index < len(rows) else -1
+        scroll_bar = self.view.verticalScrollBar()
+        scroll = scroll_bar.value()
+
+        self._order = [i for i in self._order if i not in indices]
+        self._listed -= indices
+        self._visible -= indices
+        self.model.remove_entries(indices)
+        scroll_bar.setValue(scroll)
+
+        self.candidate_indices.clear()
+        self.shift_start_index = -1
+        if candidates or anchor >= 0:
+            for row, index in enumerate(self.model.rows):
+                if index in candidates:
+                    self.candidate_indices.add(row)
+                elif index == anchor:
+                    self.shift_start_index = row
+        self.update_candidate_highlight()
+
+    def entry_index(self, index: QModelIndex) -> int:
+        """
+        获取模型索引对应的条目索引
+
+        Args:
+            index: 模型索引（视图中的单元格）
 
         Returns:
-            选中的文件路径列表
+            条目索引
+        """
+        return self.model.entry_at(index.row())
+
+    def entry_path(self, index: QModelIndex) -> str:
+        """
+        获取模型索引对应的文件路径
+
+        Args:
+            index: 模型索引（视图中的单元格）
+
+        Returns:
+            文件路径
         """
-        checked_paths = []
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item.checkState(CHECKBOX_COLUMN) == Qt.Checked:
-                path = extract_path_from_display_text(item.text(PATH_COLUMN))
-                if path:
-                    checked_paths.append(path)
-        return checked_paths
+        return self.store.paths[self.entry_index(index)]
 
-    def _set_all_check_state(self, state: Qt.CheckState) -> None:
+    def is_row_checked(self, row: int) -> bool:
         """
-        设置所有项的复选框状态
+        判断行是否选中
 
         Args:
-            state: 复选框状态
+            row: 行号
+
+        Returns:
+            是否选中
         """
-        self.tree.blockSignals(True)
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            item.setCheckState(CHECKBOX_COLUMN, state)
-        self.tree.blockSignals(False)
+        return self.model.is_checked(self.model.entry_at(row))
+
+    def get_checked_items(self) -> List[str]:
+        """
+        获取选中的文件路径（只包含显示中的项）
+
+        Returns:
+            选中的文件路径列表
+        """
+        paths = self.store.paths
+        return [paths[i] for i in self.model.checked_entries()]
 
     def select_all(self) -> None:
         """全选"""
-        self._set_all_check_state(Qt.Checked)
+        self.model.set_checked(self.model.rows, True)
 
     def clear_selection(self) -> None:
         """清空选择"""
-        self._set_all_check_state(Qt.Unchecked)
+        self.model.set_checked(self.model.rows, False)
 
     def invert_selection(self) -> None:
-        """反选"""
-        self.tree.blockSignals(True)
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            new_state = (
-                Qt.Unchecked
-                if item.checkState(CHECKBOX_COLUMN) == Qt.Checked
-                else Qt.Checked
-            )
-            item.setCheckState(CHECKBOX_COLUMN, new_state)
-        self.tree.blockSignals(False)
-
-    def filter_by_text(
-        self, search_text: str, all_items_data: List[Tuple[str, str]]
-    ) -> None:
+        """反选（只作用于显示中的项）"""
+        self.model.toggle_checked(self.model.rows)
+
+    def filter_by_text(self, search_text: str) -> None:
         """
         根据搜索文本过滤
 
@@ -131,174 +291,153 @@ class FileListWidget:
         - 普通文本：大小写不敏感的包含匹配
         - 通配符：*.cs 匹配所有 .cs 文件，Test*.cs 匹配以 Test 开头的 .cs 文件
 
+        新文本是上一次的细化时只在上一次结果中过滤，过滤结果只替换模型中的行排列。
+        模糊搜索模式下匹配项按得分排列；清空搜索文本后恢复之前的排序。
+
         Args:
             search_text: 搜索文本
-            all_items_data: 所有项目数据
         """
-        # 保存当前选中状态
-        checked_paths = set(self.get_checked_items())
-
-        self.tree.clear()
+        self.set_search_text(search_text)
+        self.apply_search_result(run_search(self.prepare_search(search_text)))
 
-        # 根据搜索文本过滤
-        if search_text:
-            filtered = self._apply_filter(search_text, all_items_data)
-        else:
-            filtered = all_items_data
+    def set_search_text(self, search_text: str) -> None:
+        """
+        设置当前搜索文本（之后追加的条目按该文本决定是否显示），不立即过滤
 
-        # 重新添加项并恢复选中状态
-        for status, path in filtered:
-            self.add_item(status, path)
-            if path in checked_paths:
-                last_item = self.tree.topLevelItem(self.tree.topLevelItemCount() - 1)
-                last_item.setCheckState(CHECKBOX_COLUMN, Qt.Checked)
+        Args:
+            search_text: 搜索文本
+        """
+        self._search_text = search_text
 
-    def _apply_filter(
-        self, search_text: str, items: List[Tuple[str, str]]
-    ) -> List[Tuple[str, str]]:
+    def prepare_search(self, search_text: str) -> SearchSnapshot:
         """
-        应用过滤规则
+        记录当前的条目存储、条目数、搜索模式和索引（在界面线程调用）
 
         Args:
-            search_text: 搜索文本（支持通配符）
-            items: 原始项目列表
+            search_text: 搜索文本
 
         Returns:
-            过滤后的项目列表
+            搜索状态快照，由 run_search 计算结果
         """
-        # 检查是否为通配符模式
-        if "*" in search_text or "?" in search_text:
-            return self._wildcard_filter(search_text, items)
-        return self._text_filter(search_text, items)
-
-    def _wildcard_filter(
-        self, pattern: str, items: List[Tuple[str, str]]
-    ) -> List[Tuple[str, str]]:
+        fuzzy = self._fuzzy_enabled and bool(search_text.strip())
+        return SearchSnapshot(
+            self.store,
+            len(self.store),
+            search_text,
+            fuzzy,
+            self._fuzzy if fuzzy else self._search,
+            self._search_index,
+        )
+
+    def apply_search_result(self, result: SearchResult) -> bool:
         """
-        使用通配符过滤
+        将搜索结果应用到列表（替换模型中的行排列，不创建或删除控件项）
 
-        支持的通配符模式：
-        - *.cs : 匹配所有 .cs 文件
-        - Test*.cs : 匹配以 Test 开头且以 .cs 结尾的文件
-        - *Test : 匹配以 Test 结尾的文件
-        - *.cs* : 匹配包含 .cs 的文件
+        计算结果之后才追加的条目保持 add_entries 时按搜索文本决定的可见性。
 
         Args:
-            pattern: 通配符模式
-            items: 原始项目列表
+            result: run_search 返回的搜索结果
 
         Returns:
-            过滤后的项目列表
+            是否已应用（条目存储、搜索文本或搜索模式已变化时丢弃）
         """
-        from smart_svn_commit.utils.filters import wildcard_filter
+        fuzzy = self._fuzzy_enabled and bool(self._search_text.strip())
+        if (
+            result.store is not self.store
+            or result.text != self._search_text
+            or result.fuzzy != fuzzy
+        ):
+            return False
+
+        listed = self._listed
+        ranked = [i for i in result.indices if i in listed]
+        matched = set(ranked)
+        late = {i for i in self._visible if i >= result.size}
+        matched |= late
+        self._visible = matched
+
+        if result.fuzzy:
+            # 计算结果之后追加的条目排在有得分的条目后面
+            self._set_rows(ranked + [i for i in self._order if i in late])
+        else:
+            self._set_rows(self._filtered_order())
+        return True
+
+    def _filtered_order(self) -> List[int]:
+        """按当前排序列出匹配搜索文本的条目"""
+        if len(self._visible) == len(self._order):
+            return list(self._order)
+        visible = self._visible
+        return [i for i in self._order if i in visible]
+
+    def _set_rows(self, rows: List[int]) -> None:
+        """替换模型中的行（行号变化后清空备选项）"""
+        if rows != self.model.rows:
+            self.model.set_rows(rows)
+            self.candidate_indices.clear()
+            self.shift_start_index = -1
 
-        return wildcard_filter(pattern, items)
+    def _match(self, search_text: str, indices: List[int]) -> List[int]:
+        """按当前搜索模式计算候选条目中匹配搜索文本的条目"""
+        if self._fuzzy_enabled and search_text.strip():
+            return fuzzy_filter(search_text, self.store, indices)
+        return filter_entries(search_text, self.store, indices)
 
-    def _text_filter(
-        self, search_text: str, items: List[Tuple[str, str]]
-    ) -> List[Tuple[str, str]]:
+    def filter_indices(
+        self, search_text: str, candidates: Optional[Iterable[int]] = None
+    ) -> List[int]:
         """
-        使用普通文本过滤（大小写不敏感）
+        计算匹配搜索文本的条目索引
 
         Args:
-            search_text: 搜索文本
-            items: 原始项目列表
+            search_text: 搜索文本（支持通配符），为空时匹配全部
+            candidates: 候选条目索引，为 None 时使用全部未移除的条目
 
         Returns:
-            过滤后的项目列表
+            匹配的条目索引列表
         """
-        from smart_svn_commit.utils.filters import text_filter
-
-        return text_filter(search_text, items)
+        if not search_text:
+            return self.store.live_indices() if candidates is None else list(candidates)
+        return filter_entries(search_text, self.store, candidates)
 
     def count(self) -> int:
         """
-        返回项数
+        返回可见项数
 
         Returns:
-            项总数
+            可见项总数
         """
-        return int(self.tree.topLevelItemCount())
+        return self.model.rowCount()
 
-    def get_widget(self) -> QTreeWidget:
+    def get_widget(self) -> QTableView:
         """
         获取底层控件
 
         Returns:
-            树控件对象
+            列表视图对象
         """
-        return self.tree
+        return self.view
 
-    def sort_items(self, sort_by: str, ascending: bool = True) -> None:
+    def sort_items(self, sort_by: Union[str, Sequence[str]], ascending: bool = True) -> None:
         """
-        对列表项进行排序
-
-        Args:
-            sort_by: 排序字段，'path'（路径）、'ext'（后缀）、'status'（状态）
-            ascending: 是否升序
-        """
-        # 收集所有项
-        items_data = []
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            display_text = item.text(PATH_COLUMN)
-            status = (
-                display_text[1]
-                if len(display_text) > 1 and display_text[0] == "["
-                else ""
-            )
-            path = extract_path_from_display_text(display_text)
-            check_state = item.checkState(CHECKBOX_COLUMN)
-            items_data.append((status, path, check_state))
-
-        # 根据排序字段进行排序
-        if sort_by == "path":
-            items_data.sort(key=lambda x: x[1] or "", reverse=not ascending)
-        elif sort_by == "ext":
-            items_data.sort(key=self._get_extension, reverse=not ascending)
-        elif sort_by == "status":
-            items_data.sort(key=lambda x: x[0] or "", reverse=not ascending)
-
-        # 清空并重新添加排序后的项
-        self.tree.blockSignals(True)
-        self.tree.clear()
-        for status, path, check_state in items_data:
-            if path:
-                self.add_item(status, path)
-            if self.tree.topLevelItemCount() > 0:
-                last_item = self.tree.topLevelItem(self.tree.topLevelItemCount() - 1)
-                last_item.setCheckState(CHECKBOX_COLUMN, check_state)
-        self.tree.blockSignals(False)
-
-    def _get_extension(self, item: Tuple[str, str, Qt.CheckState]) -> str:
-        """
-        获取文件扩展名用于排序
+        对列表项进行排序（只重新排列条目索引，不重建行）
 
         Args:
-            item: (status, path, check_state) 元组
-
-        Returns:
-            扩展名，无扩展名返回 "~" 以确保排在最后
+            sort_by: 排序字段或字段序列，字段为 'default'（加载顺序）、'path'（路径）、
+                'natural'（自然顺序路径）、'ext'（后缀）、'status'（状态）；
+                序列如 ('status', 'path') 表示先按状态、状态相同时按路径
+            ascending: 是否升序（默认顺序时忽略）
         """
-        path = item[1]
-        if not path:
-            return "~"
-        dot_idx = path.rfind(".")
-        if dot_idx > path.rfind("/"):
-            return path[dot_idx + 1 :].lower()
-        return "~"
+        self._sort_by = sort_by
+        self._ascending = ascending
+
+        # 使用存储中缓存的排序键
+        sort_entries(self.store, self._order, sort_by, ascending)
+        self._set_rows(self._filtered_order())
 
     def update_candidate_highlight(self) -> None:
         """更新备选项的高亮显示"""
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item:
-                bg = (
-                    self._candidate_bg
-                    if i in self.candidate_indices
-                    else self._default_bg
-                )
-                item.setBackground(PATH_COLUMN, bg)
+        self.model.set_candidate_rows(self.candidate_indices)
 
     def clear_candidates(self) -> None:
         """清空备选项"""
@@ -334,19 +473,14 @@ class FileListWidget:
         if new_state is None:
             return
 
-        self.tree.blockSignals(True)
-
+        rows = self.model.rows
         if self.candidate_indices:
-            for i in self.candidate_indices:
-                item = self.tree.topLevelItem(i)
-                if item:
-                    item.setCheckState(CHECKBOX_COLUMN, new_state)
+            entries = [rows[i] for i in self.candidate_indices if i < len(rows)]
+        elif 0 <= index < len(rows):
+            entries = [rows[index]]
         else:
-            item = self.tree.topLevelItem(index)
-            if item:
-                item.setCheckState(CHECKBOX_COLUMN, new_state)
-
-        self.tree.blockSignals(False)
+            return
+        self.model.set_checked(entries, new_state == Qt.Checked)
 
     def _handle_path_click(self, index: int) -> None:
         """
@@ -390,3 +524,21 @@ class FileListWidget:
                 self.candidate_indices = set(range(start, end + 1))
                 self.update_candidate_highlight()
             self.shift_start_index = -1
+
+
+def run_search(snapshot: SearchSnapshot) -> SearchResult:
+    """
+    按快照计算搜索结果（不访问界面控件，可在后台线程调用；同一引擎同一时间只能有一个调用）
+
+    Args:
+        snapshot: FileListWidget.prepare_search 返回的快照
+
+    Returns:
+        搜索结果
+    """
+    store, size, text = snapshot.store, snapshot.size, snapshot.text
+    if snapshot.fuzzy:
+        indices = snapshot.engine.search(text, store, size)
+    else:
+        indices = snapshot.engine.search(text, store, size, snapshot.index)
+    return SearchResult(store, text, snapshot.fuzzy, indices, size)
@@ -4,16 +4,48 @@
 提供文件类型图标获取和缓存功能（支持 LRU 限制）
 """
 
-from pathlib import Path
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Iterable, Optional
 
-from PyQt5.QtCore import QFileInfo
+from PyQt5.QtCore import QFileInfo, QMimeDatabase
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QStyle, QFileIconProvider
 
+# 目录和无后缀文件的缓存键
+DIR_KEY = "dir:folder"
+UNKNOWN_KEY = "unknown"
+
+
+def icon_key(file_path: str, is_dir: Optional[bool] = None) -> str:
+    """
+    根据路径字符串生成图标缓存键（不访问文件系统）
+
+    Args:
+        file_path: 文件路径
+        is_dir: 是否为目录，为 None 时按末尾的路径分隔符判断
+
+    Returns:
+        缓存键字符串
+    """
+    if is_dir is None:
+        is_dir = file_path.endswith(("/", "\\"))
+    if is_dir:
+        return DIR_KEY
+
+    name = file_path[max(file_path.rfind("/"), file_path.rfind("\\")) + 1 :]
+    dot_idx = name.rfind(".")
+    # 与 Path.suffix 一致：以点开头的文件名（.gitignore）和以点结尾的文件名没有后缀
+    if 0 < dot_idx < len(name) - 1:
+        return f"ext:{name[dot_idx:].lower()}"
+    return UNKNOWN_KEY
+
 
 class IconCache:
-    """图标缓存，避免重复获取相同类型的图标（支持 LRU 限制）"""
+    """
+    图标缓存，避免重复获取相同类型的图标（支持 LRU 限制）
+
+    缓存键只由路径字符串决定（目录或小写后缀），获取图标时不访问文件系统。
+    """
 
     # 默认最大缓存大小
     DEFAULT_MAX_SIZE = 100
@@ -26,92 +58,89 @@ class IconCache:
             parent_style: 父控件的 style 对象，用于获取标准图标
             max_size: 最大缓存大小，默认 100
         """
-        self._cache: Dict[str, QIcon] = {}
+        self._cache: "OrderedDict[str, QIcon]" = OrderedDict()
         self._max_size = max_size
-        self._access_order: List[str] = []
         self._icon_provider = QFileIconProvider()
+        self._mime_db = QMimeDatabase()
         self._style = parent_style
+        self.hits = 0
+        self.misses = 0
 
-    def get(self, file_path: str) -> QIcon:
+    def get(self, file_path: str, is_dir: Optional[bool] = None) -> QIcon:
         """
         获取文件图标（带 LRU 缓存）
 
         Args:
             file_path: 文件路径
+            is_dir: 是否为目录，为 None 时按末尾的路径分隔符判断
 
         Returns:
             文件图标
         """
-        cache_key = self._get_cache_key(file_path)
-
-        if cache_key not in self._cache:
-            self._ensure_cache_size()
-            self._cache[cache_key] = self._fetch_icon(file_path)
+        cache_key = icon_key(file_path, is_dir)
 
-        # 更新访问顺序（LRU）
-        self._update_access_order(cache_key)
+        icon = self._cache.get(cache_key)
+        if icon is not None:
+            self.hits += 1
+            self._cache.move_to_end(cache_key)
+            return icon
 
-        return self._cache[cache_key]
+        self.misses += 1
+        return self._store(cache_key, file_path)
 
-    def _update_access_order(self, cache_key: str) -> None:
+    def warm(self, file_paths: Iterable[str]) -> int:
         """
-        更新访问顺序（将缓存键移到末尾）
+        预先获取一批路径涉及的所有图标（每种后缀只获取一次）
 
         Args:
-            cache_key: 缓存键
-        """
-        if cache_key in self._access_order:
-            self._access_order.remove(cache_key)
-        self._access_order.append(cache_key)
-
-    def _ensure_cache_size(self) -> None:
-        """确保缓存不超过最大大小（LRU 淘汰）"""
-        while len(self._cache) >= self._max_size:
-            oldest = self._access_order.pop(0)
-            del self._cache[oldest]
-
-    def _get_cache_key(self, file_path: str) -> str:
-        """
-        生成缓存键
-
-        Args:
-            file_path: 文件路径
+            file_paths: 文件路径序列（每种后缀提供一个路径即可）
 
         Returns:
-            缓存键字符串
+            新获取的图标数量（不超过最大缓存大小）
         """
-        path_obj = Path(file_path)
-
-        if path_obj.is_dir():
-            return "dir:folder"
-
-        ext = path_obj.suffix.lower()
-        return f"ext:{ext}" if ext else "unknown"
+        fetched = 0
+        for file_path in file_paths:
+            cache_key = icon_key(file_path)
+            if cache_key in self._cache:
+                continue
+            if fetched >= self._max_size:
+                break
+            self._store(cache_key, file_path)
+            fetched += 1
+        return fetched
+
+    def _store(self, cache_key: str, file_path: str) -> QIcon:
+        """获取图标并加入缓存（超过最大大小时淘汰最久未使用的图标）"""
+        while len(self._cache) >= self._max_size:
+            self._cache.popitem(last=False)
+        icon = self._cache[cache_key] = self._fetch_icon(cache_key, file_path)
+        return icon
 
-    def _fetch_icon(self, file_path: str) -> QIcon:
+    def _fetch_icon(self, cache_key: str, file_path: str) -> QIcon:
         """
-        获取图标（按后缀名获取，不检查文件是否存在）
+        获取图标（按缓存键获取，不检查文件是否存在）
 
         优先级：
-        1. 系统图标（QFileIconProvider，按后缀名/类型获取）
-        2. 标准图标（QStyle）
-        3. 空图标
+        1. 目录图标 / 按文件名推断的 MIME 类型主题图标
+        2. 系统图标（QFileIconProvider，按后缀名获取，每种后缀只调用一次）
+        3. 标准图标（QStyle）
+        4. 空图标
 
         Args:
+            cache_key: 缓存键
             file_path: 文件路径
 
         Returns:
             图标对象
         """
         try:
-            file_info = QFileInfo(file_path)
-
-            # 直接根据类型获取图标（不检查文件是否存在）
-            if file_info.isDir():
+            if cache_key == DIR_KEY:
                 icon = self._icon_provider.icon(QFileIconProvider.Folder)
             else:
-                # 按文件扩展名获取类型图标
-                icon = self._icon_provider.icon(file_info)
+                # 只按文件名推断类型，不读取文件内容
+                icon = self._mime_icon(file_path)
+                if icon.isNull():
+                    icon = self._icon_provider.icon(QFileInfo(file_path))
 
             if not icon.isNull():
                 return icon
@@ -125,10 +154,22 @@ class IconCache:
         # 最后的降级：空图标
         return QIcon()
 
+    def _mime_icon(self, file_path: str) -> QIcon:
+        """按文件名推断 MIME 类型并获取主题图标（主题不可用时返回空图标）"""
+        mime_types = self._mime_db.mimeTypesForFileName(file_path)
+        if not mime_types:
+            return QIcon()
+        mime_type = mime_types[0]
+        icon = QIcon.fromTheme(mime_type.iconName())
+        if icon.isNull():
+            icon = QIcon.fromTheme(mime_type.genericIconName())
+        return icon
+
     def clear(self) -> None:
-        """清空缓存"""
+        """清空缓存和命中统计"""
         self._cache.clear()
-        self._access_order.clear()
+        self.hits = 0
+        self.misses = 0
 
     @property
     def size(self) -> int:
@@ -5,10 +5,11 @@
 import json
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QEvent, QObject, Qt, QTimer, pyqtSlot
-from PyQt5.QtGui import QGuiApplication
+from PyQt5.QtGui import QGuiApplication, QTextCursor
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
@@ -23,39 +24,33 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QSplitter,
     QTextEdit,
-    QTreeWidget,
     QVBoxLayout,
     QWidget,
 )
 
-from ..ai.factory import generate_commit_message
+from ..ai.factory import (
+    STAGE_CALLING_API,
+    STAGE_COLLECTING_DIFFS,
+    STAGE_FALLBACK,
+    STAGE_SUMMARIZING_GROUPS,
+)
+from ..ai.generator import SOURCE_AI, SOURCE_CACHE, close_openai_clients
 from ..core.commit import execute_svn_commit
-from ..core.parser import extract_path_from_display_text
+from ..core.config import load_config
+from ..core.entry_store import FileEntryStore, StatusDelta, compute_status_delta
 from ..core.svn_executor import SVNCommandExecutor
 from ..core.fs_helper import FileSystemHelper
+from ..core.watcher import WorkingCopyWatcher
 from ..__init__ import __version__
-from .constants import CHECKBOX_COLUMN, PATH_COLUMN
+from .constants import PATH_COLUMN
 from .context_menu import ContextMenuBuilder
-from .file_list_widget import FileListWidget
+from .file_list_widget import FileListWidget, SearchResult
 from .logger import ui_logger
+from .message_worker import MessageWorker
+from .search_worker import SearchIndexBuilder, SearchWorker
 from .settings_dialog import SettingsDialog
 from .styles import UIStyles
-from .svn_loader import SVNStatusLoader
-
-
-def _extract_status_from_display_text(display_text: str) -> str:
-    """
-    从显示文本中提取 SVN 状态码
-
-    Args:
-        display_text: 显示文本，格式如 "[M] file.cs"
-
-    Returns:
-        SVN 状态码（M/A/D/? 等）
-    """
-    if len(display_text) > 1 and display_text[0] == "[":
-        return display_text[1]
-    return ""
+from .svn_loader import SVNStatusDeltaLoader, SVNStatusLoader
 
 
 def check_pyqt5_available(items: Optional[List[Tuple[str, str]]]) -> bool:
@@ -102,10 +97,51 @@ class MainWindow(QMainWindow):
     FILE_LIST_STRETCH = 7
 
     # 排序选项
-    SORT_OPTIONS = ["默认顺序", "按路径", "按后缀", "按状态"]
-    SORT_FIELDS = ["default", "path", "ext", "status"]
-
-    def __init__(self, items: Optional[List[Tuple[str, str]]] = None):
+    SORT_OPTIONS = ["默认顺序", "按路径", "按路径（自然顺序）", "按后缀", "按状态", "按状态和路径"]
+    SORT_FIELDS = [
+        ("default",),
+        ("path",),
+        ("natural",),
+        ("ext",),
+        ("status",),
+        ("status", "natural"),
+    ]
+
+    # 停止加载器时等待的最长时间（毫秒）
+    LOADER_STOP_TIMEOUT_MS = 500
+
+    # 监视模式默认配置：防抖时间、轮询间隔（毫秒）
+    WATCH_DEBOUNCE_MS = 500
+    WATCH_POLL_INTERVAL_MS = 2000
+
+    # 一次变化的路径超过该数量时改为完整刷新
+    WATCH_MAX_INCREMENTAL_PATHS = 500
+
+    # 文件数达到该数量时在后台建立搜索索引（较少时直接扫描已足够快）
+    SEARCH_INDEX_MIN_ENTRIES = 20000
+
+    # 文件数达到该数量时搜索改在后台线程计算，并在输入停止后才开始（防抖，毫秒）
+    SEARCH_ASYNC_MIN_ENTRIES = 5000
+    SEARCH_DEBOUNCE_MS = 150
+
+    # 提交消息输入框的提示文字（空闲时、生成中）
+    MESSAGE_PLACEHOLDER = '点击"AI 生成提交消息"自动生成，或手动输入...'
+    GENERATING_PLACEHOLDER = "正在调用 AI 生成提交消息，请稍候..."
+
+    # 后台预生成：选中的文件保持不变多久后开始生成（毫秒，可通过 ui.speculativeGeneration 配置）
+    SPECULATIVE_IDLE_MS = 1500
+
+    # 生成提交消息各阶段在状态栏显示的文字
+    GENERATION_STAGE_TEXTS = {
+        STAGE_COLLECTING_DIFFS: "正在获取 diff...",
+        STAGE_SUMMARIZING_GROUPS: "文件较多，正在按目录分组概括变更...",
+        STAGE_CALLING_API: "正在调用 AI 生成提交消息...",
+        STAGE_FALLBACK: "正在按文件路径生成提交消息...",
+    }
+
+    def __init__(
+        self, items: Optional[List[Tuple[str, str]]] = None, search_text: str = ""
+    ):
         print("[MainWindow] __init__ 开始执行", file=sys.stderr)
         super().__init__()
         print("[MainWindow] super().__init__() 完成", file=sys.stderr)
@@ -113,14 +149,35 @@ class MainWindow(QMainWindow):
         pass
 
         self._items = items
-        self._original_items: List[Tuple[str, str]] = []
-        self._items_for_display: List[Tuple[str, str]] = []
+        self._store = FileEntryStore()
         self._result: Dict[str, Any] = {
             "selected": [],
             "commitMessage": "",
             "cancelled": False,
         }
         self._svn_loader: Optional[SVNStatusLoader] = None
+        self._delta_loader: Optional[SVNStatusDeltaLoader] = None
+        self._index_builder: Optional[SearchIndexBuilder] = None
+        self._search_worker: Optional[SearchWorker] = None
+        self._message_worker: Optional[MessageWorker] = None
+        self._cancelled_message_workers: List[MessageWorker] = []
+        # 后台预生成的线程、对应的选中文件及结果
+        self._speculative_timer: Optional[QTimer] = None
+        self._speculative_worker: Optional[MessageWorker] = None
+        self._speculative_files: Optional[Tuple[str, ...]] = None
+        self._speculative_result: Optional[Dict[str, str]] = None
+        self._search_generation = 0
+        self._search_running = False
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self._on_search_timer)
+        self._watcher: Optional[WorkingCopyWatcher] = None
+        self._watch_timer: Optional[QTimer] = None
+        self._watch_debounce_ms = self.WATCH_DEBOUNCE_MS
+        self._pending_checked_paths: Set[str] = set()
+        self._showing_snapshot = False
+        self._reconciling = False
+        self._search_indexed = False
         self._svn_executor = SVNCommandExecutor()
         self._fs_helper = FileSystemHelper()
         self._menu_builder = ContextMenuBuilder(
@@ -135,6 +192,7 @@ class MainWindow(QMainWindow):
         self.cancel_btn: QPushButton
         self.status_label: QLabel
         self.search_input: QLineEdit
+        self.fuzzy_checkbox: QCheckBox
         self.sort_combo: QComboBox
         self.ascending_checkbox: QCheckBox
 
@@ -143,15 +201,15 @@ class MainWindow(QMainWindow):
         self._init_window()
         self._init_ui()
         self._connect_signals()
+        self._init_speculative_generation()
 
-        # 加载数据
+        # 预先填入搜索文本（命令行 --grep）
+        if search_text:
+            self.search_input.setText(search_text)
+
+        # 加载数据（items 为 None 时由 show_quick_pick 在窗口显示后启动异步加载）
         if items is not None:
             self._load_items(items)
-        else:
-            pass
-            self._start_async_load()
-
-        pass
 
     def _init_window(self) -> None:
         """初始化窗口基本属性"""
@@ -214,9 +272,7 @@ class MainWindow(QMainWindow):
         top_layout.addWidget(msg_label)
 
         self.commit_message_input = QTextEdit()
-        self.commit_message_input.setPlaceholderText(
-            '点击"AI 生成提交消息"自动生成，或手动输入...'
-        )
+        self.commit_message_input.setPlaceholderText(self.MESSAGE_PLACEHOLDER)
         self.commit_message_input.setMinimumHeight(60)
         top_layout.addWidget(self.commit_message_input)
 
@@ -252,6 +308,13 @@ class MainWindow(QMainWindow):
         )
         layout.addWidget(self.search_input)
 
+        self.fuzzy_checkbox = QCheckBox("模糊")
+        self.fuzzy_checkbox.setToolTip(
+            "按字符顺序模糊匹配并按相关度排序（如 plctrl 匹配 PlayerController.cs），"
+            "空格分隔多个词"
+        )
+        layout.addWidget(self.fuzzy_checkbox)
+
         return container
 
     def _create_sort_container(self) -> QWidget:
@@ -334,32 +397,50 @@ class MainWindow(QMainWindow):
 
         # 搜索和排序信号
         self.search_input.textChanged.connect(self._on_search_changed)
+        self.fuzzy_checkbox.toggled.connect(self._on_fuzzy_toggled)
 
-        # 树控件信号
-        self.file_list.tree.itemChanged.connect(self._on_tree_item_changed)
+        # 复选框信号（用户点击复选框时由模型发送）
+        self.file_list.model.checkStateChanged.connect(self._on_check_state_changed)
 
-        # 禁用双击自动展开，启用自定义上下文菜单
-        self.file_list.tree.setExpandsOnDoubleClick(False)
-        self.file_list.tree.setContextMenuPolicy(Qt.CustomContextMenu)
+        # 启用自定义上下文菜单
+        self.file_list.view.setContextMenuPolicy(Qt.CustomContextMenu)
 
         # 连接双击、点击和右键菜单信号
-        self.file_list.tree.itemClicked.connect(self._on_tree_item_clicked)
-        self.file_list.tree.itemDoubleClicked.connect(self._on_tree_double_click)
-        self.file_list.tree.customContextMenuRequested.connect(
-            self._on_tree_context_menu
+        self.file_list.view.clicked.connect(self._on_item_clicked)
+        self.file_list.view.doubleClicked.connect(self._on_item_double_click)
+        self.file_list.view.customContextMenuRequested.connect(
+            self._on_item_context_menu
         )
 
         # 快捷键
         self.confirm_btn.setShortcut(self.CONFIRM_BUTTON_SHORTCUT)
         self.cancel_btn.setShortcut(self.CANCEL_BUTTON_SHORTCUT)
 
+    def _init_speculative_generation(self) -> None:
+        """根据配置启用后台预生成（ui.speculativeGeneration），监听列表中选中状态和行的变化"""
+        speculative_config = load_config().get("ui", {}).get("speculativeGeneration", {})
+        if not speculative_config.get("enabled", False):
+            return
+
+        self._speculative_timer = QTimer(self)
+        self._speculative_timer.setSingleShot(True)
+        self._speculative_timer.setInterval(
+            speculative_config.get("idleMs", self.SPECULATIVE_IDLE_MS)
+        )
+        self._speculative_timer.timeout.connect(self._on_speculative_timer)
+
+        # 选中的文件只包含显示中的行，搜索过滤和列表增删也会改变选择
+        model = self.file_list.model
+        model.dataChanged.connect(self._on_model_data_changed)
+        model.rowsInserted.connect(self._schedule_speculative_generation)
+        model.rowsRemoved.connect(self._schedule_speculative_generation)
+        model.modelReset.connect(self._schedule_speculative_generation)
+
     def _load_items(self, items: List[Tuple[str, str]]) -> None:
         """加载文件列表数据"""
-        self._original_items = list(items)
-        self._items_for_display = list(items)
-
-        for status, path in items:
-            self.file_list.add_item(status, path)
+        self._set_store(FileEntryStore(items))
+        self.file_list.add_entries(range(len(self._store)), set())
+        self._start_index_builder()
 
         if len(items) == 0:
             self.status_label.setText("当前没有变更文件")
@@ -367,45 +448,240 @@ class MainWindow(QMainWindow):
             self.status_label.setText(f"共 {len(items)} 个文件")
 
     def _start_async_load(self) -> None:
-        """启动异步加载"""
+        """
+        启动异步加载
+
+        列表中已有文件时只在后台重新查询，完成后按路径与当前列表比对，
+        只插入、移除或更新有变化的行（保留选中状态、滚动位置和备选项）；
+        否则清空列表，按批次显示加载结果。
+        """
         # 停止现有加载器
-        if self._svn_loader is not None and self._svn_loader.isRunning():
-            self._svn_loader.terminate()
-            self._svn_loader.wait()
+        self._stop_svn_loader()
+        self._stop_delta_loader()
 
-        # 创建并启动新加载器
+        self._showing_snapshot = False
+        self._reconciling = self._store.live_count() > 0
         self._svn_loader = SVNStatusLoader()
+        if not self._reconciling:
+            self._stop_thread(self._index_builder)
+            # 保存当前选中状态，批量追加时恢复
+            self._pending_checked_paths = set(self.file_list.get_checked_items())
+            self._set_store(FileEntryStore())
+            self.file_list.clear()
+            self._svn_loader.snapshotReady.connect(self._on_snapshot_loaded)
+            self._svn_loader.batchReady.connect(self._on_files_batch)
+
+        # 启动新加载器
         self._svn_loader.finished.connect(self._on_files_loaded)
         self._svn_loader.error.connect(self._on_load_error)
         self._svn_loader.start()
 
-        self.status_label.setText("正在加载...")
+        self.status_label.setText("正在刷新..." if self._reconciling else "正在加载...")
+
+    def _set_store(self, store: FileEntryStore) -> None:
+        """设置当前条目存储并同步给文件列表"""
+        self._store = store
+        self._search_indexed = False
+        self.file_list.set_store(store)
+
+    def _stop_svn_loader(self) -> None:
+        """停止正在运行的加载器（先请求中断，超时后强制终止）"""
+        self._stop_thread(self._svn_loader)
+
+    def _stop_delta_loader(self) -> None:
+        """停止正在运行的增量加载器"""
+        self._stop_thread(self._delta_loader)
+
+    def _stop_thread(self, thread) -> None:
+        """请求线程中断并等待，超时后强制终止"""
+        if thread is not None and thread.isRunning():
+            thread.requestInterruption()
+            if not thread.wait(self.LOADER_STOP_TIMEOUT_MS):
+                thread.terminate()
+                thread.wait()
 
     def _refresh_file_list(self) -> None:
         """刷新文件列表（使用异步加载）"""
         self._start_async_load()
 
+    @pyqtSlot(list)
+    def _on_snapshot_loaded(self, files: List[Tuple[str, str]]) -> None:
+        """状态快照加载完成槽函数 - 立即显示快照，等待后台 svn status 校正"""
+        if self.sender() is not self._svn_loader:
+            return
+
+        self._showing_snapshot = True
+        self._show_files(files, self._pending_checked_paths)
+        self.status_label.setText(f"共 {len(files)} 个文件（缓存，正在后台刷新...）")
+
+    def _show_files(self, files: List[Tuple[str, str]], checked_paths: Set[str]) -> None:
+        """
+        用新的文件列表替换当前列表（保留搜索过滤）
+
+        Args:
+            files: (状态, 文件路径) 元组列表
+            checked_paths: 需要选中的文件路径集合
+        """
+        self._set_store(FileEntryStore(files))
+        self.file_list.clear()
+        self.file_list.add_entries(range(len(self._store)), checked_paths)
+
+    @pyqtSlot(list)
+    def _on_files_batch(self, batch: List[Tuple[str, str]]) -> None:
+        """一批文件加载完成槽函数 - 追加到列表并更新计数"""
+        # 忽略已被替换的旧加载器发出的信号
+        if self.sender() is not self._svn_loader:
+            return
+
+        new_indices = self._store.extend(batch)
+
+        # 加载过程中已输入搜索文本时，不匹配的项隐藏追加，并恢复选中状态
+        self.file_list.add_entries(new_indices, self._pending_checked_paths)
+
+        self.status_label.setText(f"正在加载... 已加载 {len(self._store)} 个文件")
+
     @pyqtSlot(list)
     def _on_files_loaded(self, files: List[Tuple[str, str]]) -> None:
-        """文件列表加载完成槽函数"""
-        self._original_items = list(files)
-        self._items_for_display = list(files)
-
-        # 保存当前选中状态
-        checked_paths = set(self.file_list.get_checked_items())
-
-        # 重建列表
-        self.file_list.tree.clear()
-        for status, path in files:
-            self.file_list.add_item(status, path)
-            # 恢复选中状态
-            if path in checked_paths:
-                last_item = self.file_list.tree.topLevelItem(
-                    self.file_list.tree.topLevelItemCount() - 1
-                )
-                last_item.setCheckState(CHECKBOX_COLUMN, Qt.Checked)
+        """文件列表加载完成槽函数（各批次已在 _on_files_batch 中显示）"""
+        if self.sender() is not self._svn_loader:
+            return
+
+        if self._reconciling or self._showing_snapshot:
+            # 刷新或之前显示的是快照：只应用与最新结果之间的差异
+            self._reconciling = False
+            self._showing_snapshot = False
+            self._apply_status_delta(compute_status_delta(self._store, files))
+            # 追加的条目由搜索引擎逐项扫描，已有索引时无需重建
+            builder = self._index_builder
+            if not self._search_indexed and (builder is None or not builder.isRunning()):
+                self._start_index_builder()
+        else:
+            self._update_count_label()
+            self._start_index_builder()
+
+        self._pending_checked_paths = set()
+        self._invalidate_speculative_generation()
 
-        self.status_label.setText(f"共 {len(files)} 个文件")
+        # 首次加载完成后开始监视工作目录；之后每次刷新后重新记录 wc.db 状态
+        if self._watcher is None:
+            self._start_watcher()
+        else:
+            self._watcher.sync_wc_db()
+
+    def _start_index_builder(self) -> None:
+        """文件较多时在后台为当前条目存储建立搜索索引"""
+        self._stop_thread(self._index_builder)
+        self._index_builder = None
+        if len(self._store) < self.SEARCH_INDEX_MIN_ENTRIES:
+            return
+
+        self._index_builder = SearchIndexBuilder(self._store)
+        self._index_builder.finished.connect(self._on_search_index_built)
+        self._index_builder.start()
+
+    @pyqtSlot(object, object)
+    def _on_search_index_built(self, store: FileEntryStore, index) -> None:
+        """搜索索引建立完成槽函数（条目存储已被替换时丢弃）"""
+        if store is not self._store:
+            return
+        self._search_indexed = True
+        self.file_list.set_search_index(store, index)
+        ui_logger.info(f"[搜索] 已为 {index.size} 个文件建立索引")
+
+    def _update_count_label(self) -> None:
+        """更新文件数量提示"""
+        count = self._store.live_count()
+        if count == 0:
+            self.status_label.setText("当前没有变更文件")
+        else:
+            self.status_label.setText(f"共 {count} 个文件")
+
+    def _start_watcher(self) -> None:
+        """根据配置启动工作目录监视（ui.watch），变化经防抖后增量刷新"""
+        config = load_config()
+        watch_config = config.get("ui", {}).get("watch", {})
+        if not watch_config.get("enabled", True):
+            return
+
+        poll_interval_ms = watch_config.get("pollIntervalMs", self.WATCH_POLL_INTERVAL_MS)
+        self._watcher = WorkingCopyWatcher(
+            Path.cwd(), config.get("ignorePatterns", []), poll_interval_ms / 1000
+        )
+        self._watcher.start()
+
+        self._watch_debounce_ms = watch_config.get("debounceMs", self.WATCH_DEBOUNCE_MS)
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setInterval(self._watch_debounce_ms)
+        self._watch_timer.timeout.connect(self._on_watch_timer)
+        self._watch_timer.start()
+
+        mode = "轮询" if self._watcher.is_polling else "文件系统事件"
+        ui_logger.info(f"[监视] 已开始监视工作目录（{mode}）")
+
+    def _stop_watcher(self) -> None:
+        """停止工作目录监视"""
+        if self._watch_timer is not None:
+            self._watch_timer.stop()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def _on_watch_timer(self) -> None:
+        """定时检查监视到的变化（有加载正在进行时推迟到下一次）"""
+        for loader in (self._svn_loader, self._delta_loader):
+            if loader is not None and loader.isRunning():
+                return
+
+        changes = self._watcher.take_changes(self._watch_debounce_ms / 1000)
+        if changes is None:
+            return
+
+        paths, full_refresh = changes
+        if full_refresh or len(paths) > self.WATCH_MAX_INCREMENTAL_PATHS:
+            ui_logger.info("[监视] 工作副本元数据变化或变化过多，完整刷新")
+            self._start_async_load()
+            return
+
+        ui_logger.info(f"[监视] {len(paths)} 个路径发生变化，增量刷新")
+        self._delta_loader = SVNStatusDeltaLoader(sorted(paths))
+        self._delta_loader.finished.connect(self._on_delta_loaded)
+        self._delta_loader.error.connect(self._on_delta_error)
+        self._delta_loader.start()
+
+    @pyqtSlot(list, list)
+    def _on_delta_loaded(self, targets: List[str], files: List[Tuple[str, str]]) -> None:
+        """增量状态加载完成槽函数 - 原地更新列表"""
+        if self.sender() is not self._delta_loader:
+            return
+
+        self._apply_status_delta(compute_status_delta(self._store, files, targets))
+        if self._watcher is not None:
+            self._watcher.sync_wc_db()
+        # 文件内容可能已变化，预生成的结果不再可靠
+        self._invalidate_speculative_generation()
+
+    @pyqtSlot(str)
+    def _on_delta_error(self, error_msg: str) -> None:
+        """增量加载错误槽函数（不打断用户，仅记录日志）"""
+        ui_logger.warning(f"[监视] {error_msg}")
+
+    def _apply_status_delta(self, delta: StatusDelta) -> None:
+        """
+        将状态增量应用到存储和列表（保留选中状态和当前过滤）
+
+        Args:
+            delta: 状态增量
+        """
+        for index, status in delta.changed:
+            self._store.set_status(index, status)
+        for index in delta.removed:
+            self._store.remove(index)
+        new_indices = self._store.extend(delta.added)
+
+        self.file_list.update_entries({index for index, _ in delta.changed})
+        self.file_list.remove_entries(set(delta.removed))
+        self.file_list.add_entries(new_indices, set())
+
+        self._update_count_label()
 
     @pyqtSlot(str)
     def _on_load_error(self, error_msg: str) -> None:
@@ -479,121 +755,305 @@ class MainWindow(QMainWindow):
         self.close()
 
     def _on_generate_message(self) -> None:
-        """生成提交消息"""
+        """生成提交消息（正在生成时点击按钮则取消）"""
+        if self._message_worker is not None:
+            self._cancel_message_generation()
+            return
+
         selected_files = self.file_list.get_checked_items()
-        if selected_files:
-            # 显示加载提示
-            self.commit_message_input.setPlainText(
-                "正在调用 AI 生成提交消息...\n\n请稍候..."
-            )
-            self.generate_msg_btn.setEnabled(False)
+        if not selected_files:
+            self.commit_message_input.setPlainText("chore: 提交变更")
+            return
 
-            # 强制刷新 UI
-            QApplication.processEvents()
+        if self._speculative_files != tuple(selected_files):
+            self._discard_speculative_generation()
+        elif self._speculative_result is not None:
+            # 后台已按相同的选择生成完毕
+            self.commit_message_input.setPlainText(self._speculative_result["message"])
+            self._show_message_source(self._speculative_result["source"], speculative=True)
+            return
 
-            # 调用生成函数
-            commit_message = generate_commit_message(selected_files)
+        # 清空输入框，AI 的流式响应逐段追加
+        self.commit_message_input.clear()
+        self.commit_message_input.setPlaceholderText(self.GENERATING_PLACEHOLDER)
+        self.generate_msg_btn.setText("取消生成")
+        self.generate_msg_btn.setStyleSheet(UIStyles.CANCEL_BUTTON_STYLE)
+
+        worker = self._speculative_worker
+        if worker is not None:
+            # 接管仍在进行的预生成（之前的流式片段已错过，只在完成时填入结果）
+            self._speculative_worker = None
+            self._speculative_files = None
+            self.status_label.setText("正在等待后台生成的提交消息...")
+        else:
+            worker = MessageWorker(selected_files, self)
+            worker.delta.connect(self._on_message_delta)
+        self._message_worker = worker
+        worker.progress.connect(self._on_message_progress)
+        worker.finished.connect(self._on_message_generated)
+        worker.error.connect(self._on_message_error)
+        if not worker.isRunning():
+            worker.start()
+
+    def _cancel_message_generation(self) -> None:
+        """取消正在进行的生成（不等待线程结束，其后续结果会被忽略）"""
+        worker = self._message_worker
+        if worker is None:
+            return
+        worker.requestInterruption()
+        self._cancelled_message_workers = [
+            w for w in self._cancelled_message_workers if w.isRunning()
+        ]
+        self._cancelled_message_workers.append(worker)
+        self._finish_message_generation()
+        self.status_label.setText("已取消生成提交消息")
+
+    def _finish_message_generation(self) -> None:
+        """生成结束后恢复按钮和输入框提示"""
+        self._message_worker = None
+        self.generate_msg_btn.setText("AI 生成提交消息")
+        self.generate_msg_btn.setStyleSheet(UIStyles.AI_BUTTON_STYLE)
+        self.commit_message_input.setPlaceholderText(self.MESSAGE_PLACEHOLDER)
 
-            # 填入输入框
-            self.commit_message_input.setPlainText(commit_message)
-            self.generate_msg_btn.setEnabled(True)
+    @pyqtSlot(str)
+    def _on_message_progress(self, stage: str) -> None:
+        """生成进入新阶段 - 在状态栏显示"""
+        if self.sender() is not self._message_worker:
+            return
+        self.status_label.setText(self.GENERATION_STAGE_TEXTS.get(stage, stage))
+
+    @pyqtSlot(str)
+    def _on_message_delta(self, text: str) -> None:
+        """收到一段 AI 响应 - 追加到输入框末尾"""
+        if self.sender() is not self._message_worker:
+            return
+        self.commit_message_input.moveCursor(QTextCursor.End)
+        self.commit_message_input.insertPlainText(text)
+
+    @pyqtSlot(dict)
+    def _on_message_generated(self, result: Dict[str, str]) -> None:
+        """生成完成 - 以最终结果替换输入框内容（AI 失败时为降级结果）"""
+        if self.sender() is not self._message_worker:
+            return
+        self.commit_message_input.setPlainText(result["message"])
+        self._finish_message_generation()
+        self._show_message_source(result["source"])
+
+    def _show_message_source(self, source: str, speculative: bool = False) -> None:
+        """
+        在状态栏显示提交消息的来源
+
+        Args:
+            source: 生成结果中的 source
+            speculative: 是否为后台预生成的结果
+        """
+        if source not in (SOURCE_AI, SOURCE_CACHE):
+            self.status_label.setText("AI 不可用，已按文件路径生成提交消息")
+        elif speculative:
+            self.status_label.setText("✓ 已使用后台预先生成的 AI 提交消息")
+        elif source == SOURCE_AI:
+            self.status_label.setText("✓ 已由 AI 生成提交消息")
         else:
-            self.commit_message_input.setPlainText("chore: 提交变更")
+            self.status_label.setText("✓ 已使用缓存的 AI 提交消息（相同的变更之前生成过）")
+
+    @pyqtSlot(str)
+    def _on_message_error(self, error_msg: str) -> None:
+        """生成失败"""
+        if self.sender() is not self._message_worker:
+            return
+        self.commit_message_input.setPlainText("chore: 提交变更")
+        self.status_label.setText(f"生成提交消息失败: {error_msg}")
+        self._finish_message_generation()
+
+    def _on_model_data_changed(self, top_left, bottom_right, roles: List[int]) -> None:
+        """列表数据变化 - 选中状态变化（或状态整体刷新）时重新计时"""
+        if not roles or Qt.CheckStateRole in roles:
+            self._schedule_speculative_generation()
+
+    def _schedule_speculative_generation(self) -> None:
+        """选择可能发生变化，重新开始等待空闲（未启用预生成时不做任何事）"""
+        if self._speculative_timer is not None:
+            self._speculative_timer.start()
+
+    def _on_speculative_timer(self) -> None:
+        """选择保持不变一段时间后，按当前选择在后台生成提交消息"""
+        if self._message_worker is not None:
+            return
+
+        selected_files = tuple(self.file_list.get_checked_items())
+        if selected_files == self._speculative_files:
+            return
+        self._discard_speculative_generation()
+        if not selected_files:
+            return
+
+        ui_logger.info(f"[预生成] 选择已稳定，后台为 {len(selected_files)} 个文件生成提交消息")
+        self._speculative_files = selected_files
+        self._speculative_worker = MessageWorker(list(selected_files), self)
+        self._speculative_worker.finished.connect(self._on_speculative_generated)
+        self._speculative_worker.error.connect(self._on_speculative_error)
+        self._speculative_worker.start()
+
+    def _discard_speculative_generation(self) -> None:
+        """取消进行中的预生成并丢弃已有结果"""
+        worker = self._speculative_worker
+        if worker is not None:
+            worker.requestInterruption()
+            self._cancelled_message_workers = [
+                w for w in self._cancelled_message_workers if w.isRunning()
+            ]
+            self._cancelled_message_workers.append(worker)
+        self._speculative_worker = None
+        self._speculative_files = None
+        self._speculative_result = None
+
+    def _invalidate_speculative_generation(self) -> None:
+        """文件内容或状态可能已变化：丢弃预生成的结果，等待空闲后重新生成"""
+        if self._speculative_timer is None:
+            return
+        self._discard_speculative_generation()
+        self._schedule_speculative_generation()
+
+    @pyqtSlot(dict)
+    def _on_speculative_generated(self, result: Dict[str, str]) -> None:
+        """预生成完成 - 保存结果，等待用户点击生成按钮"""
+        if self.sender() is not self._speculative_worker:
+            return
+        self._speculative_worker = None
+        self._speculative_result = result
+        ui_logger.info(f"[预生成] 提交消息已生成（来源: {result['source']}）")
+
+    @pyqtSlot(str)
+    def _on_speculative_error(self, error_msg: str) -> None:
+        """预生成失败（不打断用户，点击生成按钮时重新生成）"""
+        if self.sender() is not self._speculative_worker:
+            return
+        self._speculative_worker = None
+        self._speculative_files = None
+        ui_logger.warning(f"[预生成] {error_msg}")
 
     def _on_search_changed(self, text: str) -> None:
-        """搜索文本变化处理"""
-        self.file_list.filter_by_text(text, self._original_items)
-        if text:
+        """
+        搜索文本变化处理
+
+        文件较少时直接过滤；较多时防抖后在后台线程计算，每次变化递增搜索序号，
+        只应用最新序号的结果。
+        """
+        self._search_generation += 1
+        self.file_list.set_search_text(text)
+
+        if len(self._store) < self.SEARCH_ASYNC_MIN_ENTRIES and not self._search_running:
+            self._search_timer.stop()
+            self.file_list.filter_by_text(text)
+            self._update_search_label()
+            return
+
+        self._search_timer.start(self.SEARCH_DEBOUNCE_MS)
+
+    def _on_search_timer(self) -> None:
+        """搜索防抖结束 - 启动后台搜索（已有搜索在运行时，等它完成后再启动）"""
+        if not self._search_running:
+            self._start_search_worker()
+
+    def _start_search_worker(self) -> None:
+        """为当前搜索文本启动后台搜索"""
+        # 上一个线程已发出结果，等待其 run() 返回后再替换
+        if self._search_worker is not None:
+            self._search_worker.wait()
+
+        self._search_running = True
+        self._search_worker = SearchWorker(
+            self.file_list.prepare_search(self.search_input.text()), self._search_generation
+        )
+        self._search_worker.finished.connect(self._on_search_finished)
+        self._search_worker.error.connect(self._on_search_error)
+        self._search_worker.start()
+
+    @pyqtSlot(int, object)
+    def _on_search_finished(self, generation: int, result: SearchResult) -> None:
+        """后台搜索完成槽函数 - 只应用最新的结果，过期时重新计算最新文本"""
+        self._search_running = False
+        if generation == self._search_generation:
+            self.file_list.apply_search_result(result)
+            self._update_search_label()
+        elif not self._search_timer.isActive():
+            self._start_search_worker()
+
+    @pyqtSlot(int, str)
+    def _on_search_error(self, generation: int, error_msg: str) -> None:
+        """后台搜索失败槽函数"""
+        self._search_running = False
+        ui_logger.error(f"[搜索] {error_msg}")
+        if generation != self._search_generation and not self._search_timer.isActive():
+            self._start_search_worker()
+
+    def _update_search_label(self) -> None:
+        """更新搜索过滤后的文件数量提示"""
+        if self.search_input.text():
             self.status_label.setText(
-                f"过滤: {self.file_list.count()} / {len(self._original_items)}"
+                f"过滤: {self.file_list.count()} / {self._store.live_count()}"
             )
         else:
-            self.status_label.setText(f"共 {len(self._original_items)} 个文件")
+            self.status_label.setText(f"共 {self._store.live_count()} 个文件")
+
+    def _on_fuzzy_toggled(self, checked: bool) -> None:
+        """模糊搜索开关切换处理 - 按新模式重新过滤"""
+        self.file_list.set_fuzzy_enabled(checked)
+        self._on_search_changed(self.search_input.text())
 
     def _on_sort(self) -> None:
         """执行排序"""
         sort_index = self.sort_combo.currentIndex()
         ascending = self.ascending_checkbox.isChecked()
 
-        sort_by = self.SORT_FIELDS[sort_index] if sort_index > 0 else None
+        self.file_list.sort_items(self.SORT_FIELDS[sort_index], ascending)
 
-        if sort_by:
-            self.file_list.sort_items(sort_by, ascending)
-        else:
-            # 恢复默认顺序
-            checked_paths = set(self.file_list.get_checked_items())
-            self.file_list.tree.clear()
-            for status, path in self._original_items:
-                self.file_list.add_item(status, path)
-                if path in checked_paths:
-                    last_item = self.file_list.tree.topLevelItem(
-                        self.file_list.tree.topLevelItemCount() - 1
-                    )
-                    last_item.setCheckState(CHECKBOX_COLUMN, Qt.Checked)
-
-    def _on_tree_item_clicked(self, item, column: int) -> None:
+    def _on_item_clicked(self, index) -> None:
         """处理点击事件 - 路径列点击时检测Shift键"""
-        if column == PATH_COLUMN and item:
-            index = self.file_list.tree.indexOfTopLevelItem(item)
-            display_text = item.text(PATH_COLUMN)
-            file_path = (
-                extract_path_from_display_text(display_text) if display_text else ""
-            )
+        if index.isValid() and index.column() == PATH_COLUMN:
+            row = index.row()
 
             # 检测Shift键
             modifiers = QGuiApplication.keyboardModifiers()
             is_shift = modifiers & Qt.ShiftModifier
 
             if is_shift:
-                self.file_list.handle_item_click(index, None, is_checkbox=False)
+                self.file_list.handle_item_click(row, None, is_checkbox=False)
             else:
                 # 段通点击切换复选框状态
-                current_state = item.checkState(CHECKBOX_COLUMN)
-                new_state = Qt.Unchecked if current_state == Qt.Checked else Qt.Checked
-                self.file_list.handle_item_click(index, new_state, is_checkbox=False)
-
-    def _on_tree_item_changed(self, item, column: int) -> None:
-        """树控件项改变事件"""
-        if column == CHECKBOX_COLUMN:
-            index = self.file_list.tree.indexOfTopLevelItem(item)
-            new_state = item.checkState(CHECKBOX_COLUMN)
-            self.file_list.handle_item_click(index, new_state)
-
-    def _on_tree_double_click(self, item, column: int) -> None:
+                is_checked = self.file_list.is_row_checked(row)
+                new_state = Qt.Unchecked if is_checked else Qt.Checked
+                self.file_list.handle_item_click(row, new_state, is_checkbox=False)
+
+    def _on_check_state_changed(self, row: int, state: int) -> None:
+        """复选框状态改变事件"""
+        self.file_list.handle_item_click(row, Qt.CheckState(state))
+
+    def _on_item_double_click(self, index) -> None:
         """处理双击事件 - 打开 SVN diff"""
-        if item and column == PATH_COLUMN:
-            display_text = item.text(PATH_COLUMN)
-            file_path = (
-                extract_path_from_display_text(display_text) if display_text else ""
-            )
-            if file_path:
-                self._svn_executor.diff(file_path)
+        if index.isValid() and index.column() == PATH_COLUMN:
+            self._svn_executor.diff(self.file_list.entry_path(index))
 
-    def _on_tree_context_menu(self, pos) -> None:
+    def _on_item_context_menu(self, pos) -> None:
         """显示右键菜单"""
-        item = self.file_list.tree.itemAt(pos)
+        index = self.file_list.view.indexAt(pos)
 
-        # 如果 itemAt 返回 None，可能是：
+        # 如果 indexAt 返回无效索引，可能是：
         # 1. 点击空白处 → 不显示菜单
-        # 2. 键盘触发（pos 为无效坐标）→ 使用 currentItem
-        if not item:
+        # 2. 键盘触发（pos 为无效坐标）→ 使用 currentIndex
+        if not index.isValid():
             if pos.x() == 0 and pos.y() == 0:
-                item = self.file_list.tree.currentItem()
+                index = self.file_list.view.currentIndex()
             else:
                 return
 
-        if item:
-            display_text = item.text(PATH_COLUMN)
-            file_path = (
-                extract_path_from_display_text(display_text) if display_text else ""
-            )
-            status = _extract_status_from_display_text(display_text)
+        if index.isValid():
+            entry_index = self.file_list.entry_index(index)
+            file_path = self._store.paths[entry_index]
+            status = self._store.statuses[entry_index]
 
-            if file_path:
-                menu = self._menu_builder.build_menu(
-                    file_path, status, self.file_list.tree
-                )
-                menu.exec_(self.file_list.tree.viewport().mapToGlobal(pos))
+            menu = self._menu_builder.build_menu(file_path, status, self.file_list.view)
+            menu.exec_(self.file_list.view.viewport().mapToGlobal(pos))
 
     def _show_log_dialog(self) -> None:
         """显示日志对话框"""
@@ -778,9 +1238,19 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event) -> None:
         """窗口关闭事件 - 清理资源"""
-        if self._svn_loader is not None and self._svn_loader.isRunning():
-            self._svn_loader.terminate()
-            self._svn_loader.wait()
+        self._stop_watcher()
+        self._stop_svn_loader()
+        self._stop_thread(self._index_builder)
+        self._search_timer.stop()
+        self._stop_thread(self._search_worker)
+        self._stop_delta_loader()
+        if self._speculative_timer is not None:
+            self._speculative_timer.stop()
+        workers = [self._message_worker, self._speculative_worker, *self._cancelled_message_workers]
+        for worker in workers:
+            self._stop_thread(worker)
+        # 生成线程都已结束，释放复用的 AI 客户端连接池
+        close_openai_clients()
         event.accept()
 
     def get_result(self) -> Dict[str, Any]:
@@ -788,12 +1258,15 @@ class MainWindow(QMainWindow):
         return self._result
 
 
-def show_quick_pick(items: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
+def show_quick_pick(
+    items: Optional[List[Tuple[str, str]]] = None, search_text: str = ""
+) -> Dict[str, Any]:
     """
     使用 PyQt5 显示 QuickPick 界面。
 
     Args:
         items: (状态, 文件路径) 元组列表，如果为 None 则异步加载
+        search_text: 初始搜索文本
 
     Returns:
         包含 selected、commitMessage、cancelled、commitResult 的字典
@@ -812,7 +1285,7 @@ def show_quick_pick(items: Optional[List[Tuple[str, str]]] = None) -> Dict[str,
         f"[show_quick_pick] 开始创建MainWindow, items: {len(items) if items else 0}"
     )
     print(f"[show_quick_pick] 开始创建MainWindow", file=sys.stderr)
-    window = MainWindow(items)
+    window = MainWindow(items, search_text)
     window.show()
 
     # 如果没有提供 items，延迟启动异步加载
@@ -0,0 +1,59 @@
+"""
+提交消息生成线程模块
+
+在后台线程中获取 diff 并调用 AI（流式响应），避免生成期间阻塞界面。
+"""
+
+from typing import List
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..ai.factory import generate_commit_message_result
+
+
+class MessageWorker(QThread):
+    """
+    提交消息生成线程
+
+    生成过程依次经过获取 diff、调用 AI、降级为关键词匹配等阶段，每进入一个阶段发送 progress；
+    AI 的流式响应通过 delta 信号逐段发送。调用 requestInterruption() 取消后，
+    线程尽快停止（终止 svn diff、关闭 AI 响应），且不再发送 finished。
+
+    Signals:
+        progress: 进入新阶段时发送，参数为阶段（ai.factory.STAGE_* 常量）
+        delta: 收到一段 AI 响应时发送，参数为新增的文本
+        finished: 生成完成时发送，参数为包含 message 和 source 的字典
+        error: 生成失败时发送，参数为错误消息
+    """
+
+    progress = pyqtSignal(str)
+    delta = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, files: List[str], parent=None) -> None:
+        """
+        初始化生成线程
+
+        Args:
+            files: 选中的文件路径列表（启动时的快照，之后列表中的选择变化不影响本次生成）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._files = files
+
+    def run(self) -> None:
+        """生成提交消息（在后台线程中运行）"""
+        try:
+            result = generate_commit_message_result(
+                self._files,
+                on_delta=self.delta.emit,
+                on_progress=self.progress.emit,
+                should_cancel=self.isInterruptionRequested,
+            )
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.error.emit(str(e))
+            return
+        if result is not None and not self.isInterruptionRequested():
+            self.finished.emit(result)
@@ -0,0 +1,81 @@
+"""
+搜索相关的后台线程模块
+
+- SearchIndexBuilder：为文件列表建立三元组索引，建立完成后交给搜索引擎使用
+- SearchWorker：在后台线程中计算搜索结果，由主线程应用到列表
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..core.entry_store import FileEntryStore
+from ..utils.ngram_index import TrigramIndex
+from .file_list_widget import SearchSnapshot, run_search
+
+
+class SearchIndexBuilder(QThread):
+    """
+    三元组索引建立线程
+
+    建立时使用的是启动时刻的搜索键副本，之后追加的条目由搜索引擎逐项扫描。
+
+    Signals:
+        finished: 建立完成时发送，参数为 (条目存储, 三元组索引)
+    """
+
+    finished = pyqtSignal(object, object)
+
+    def __init__(self, store: FileEntryStore, parent=None) -> None:
+        """
+        初始化索引建立线程
+
+        Args:
+            store: 文件条目存储
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._store = store
+        self._keys = list(store.search_keys)
+
+    def run(self) -> None:
+        """建立索引（在后台线程中运行），调用 requestInterruption() 可中止"""
+        index = TrigramIndex.build(self._keys, self.isInterruptionRequested)
+        if index is not None:
+            self.finished.emit(self._store, index)
+
+
+class SearchWorker(QThread):
+    """
+    搜索计算线程
+
+    按派发时的快照（FileListWidget.prepare_search）调用 run_search，不访问界面控件。
+    快照中的搜索引擎带有状态，同一时间只能运行一个 SearchWorker，
+    也不能与主线程中的 filter_by_text 同时运行。
+
+    Signals:
+        finished: 计算完成时发送，参数为 (搜索序号, SearchResult)
+        error: 计算失败时发送，参数为 (搜索序号, 错误消息)
+    """
+
+    finished = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+
+    def __init__(self, snapshot: SearchSnapshot, generation: int, parent=None) -> None:
+        """
+        初始化搜索线程
+
+        Args:
+            snapshot: 派发搜索时的状态快照
+            generation: 搜索序号（用于丢弃过期结果）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._snapshot = snapshot
+        self.generation = generation
+
+    def run(self) -> None:
+        """计算搜索结果（在后台线程中运行）"""
+        try:
+            result = run_search(self._snapshot)
+            self.finished.emit(self.generation, result)
+        except Exception as e:
+            self.error.emit(self.generation, f"搜索失败: {str(e)}")
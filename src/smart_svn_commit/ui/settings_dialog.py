@@ -189,8 +189,9 @@ class SettingsDialog(QDialog):
         return True, ""
 
     def _build_ai_config(self) -> Dict[str, Any]:
-        """从表单构建 AI 配置"""
+        """从表单构建 AI 配置（保留表单中没有的配置项）"""
         return {
+            **self._config.get("aiApi", {}),
             "enabled": self._enabled_checkbox.isChecked(),
             "baseUrl": self._base_url_input.text().strip(),
             "apiKey": self._api_key_input.text().strip(),
@@ -4,11 +4,14 @@ SVN 状态异步加载器模块
 使用 PyQt5 QThread 在后台线程中执行 SVN 状态查询，避免阻塞 UI。
 """
 
+import time
+from pathlib import Path
 from typing import List, Tuple, Optional
 from PyQt5.QtCore import QThread, pyqtSignal
 
-from ..core.commit import run_svn_status
+from ..core.commit import STATUS_ENGINE_SVN, iter_svn_status, iter_working_copy_status
 from ..core.config import load_config
+from ..core.status_cache import StatusSnapshotCache
 from ..utils.filters import apply_ignore_patterns
 
 
@@ -16,16 +19,28 @@ class SVNStatusLoader(QThread):
     """
     SVN 状态加载工作线程
 
-    在后台线程中执行 svn status 命令，完成后通过信号通知主线程更新 UI。
+    在后台线程中流式读取状态引擎（svn 命令行或 wc.db）的输出，每累计 BATCH_SIZE 个条目或间隔
+    BATCH_INTERVAL_MS 毫秒发送一批，主线程可以边加载边显示。
+
+    启用状态快照缓存时，先发送与当前工作副本状态匹配的快照，再在后台运行完整的
+    svn status 校正（此时不再分批发送），完成后更新快照。
 
     Signals:
-        finished: 加载成功时发送，参数为文件列表
+        snapshotReady: 命中状态快照时发送，参数为快照文件列表
+        batchReady: 一批条目就绪时发送，参数为本批文件列表（已应用忽略模式）
+        finished: 加载成功时发送，参数为完整文件列表
         error: 加载失败时发送，参数为错误消息
     """
 
+    snapshotReady = pyqtSignal(list)
+    batchReady = pyqtSignal(list)
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
 
+    # 批量发送阈值
+    BATCH_SIZE = 500
+    BATCH_INTERVAL_MS = 100
+
     def __init__(self, parent=None) -> None:
         """
         初始化加载器
@@ -39,19 +54,142 @@ class SVNStatusLoader(QThread):
         """
         执行 SVN 状态查询
 
-        此方法在后台线程中运行，完成后发送 finished 或 error 信号。
+        此方法在后台线程中运行，过程中发送 snapshotReady 或多次发送 batchReady，
+        完成后发送 finished 或 error 信号。调用 requestInterruption() 可提前结束。
         """
         try:
-            # 执行 svn status 命令
-            files: List[Tuple[str, str]] = run_svn_status()
-
-            # 应用忽略模式
             config = load_config()
             ignore_patterns = config.get("ignorePatterns", [])
-            files = apply_ignore_patterns(files, ignore_patterns)
+
+            snapshot_cache: Optional[StatusSnapshotCache] = None
+            if config.get("statusCache", {}).get("enabled", True):
+                snapshot_cache = StatusSnapshotCache()
+                snapshot_shown = self._emit_snapshot(snapshot_cache, ignore_patterns)
+            else:
+                snapshot_shown = False
+
+            files: List[Tuple[str, str]] = []
+            batch: List[Tuple[str, str]] = []
+            last_emit = time.monotonic()
+
+            status_iter = iter_working_copy_status(
+                config.get("statusEngine", STATUS_ENGINE_SVN), ignore_patterns
+            )
+            try:
+                for item in status_iter:
+                    if self.isInterruptionRequested():
+                        return
+                    batch.append(item)
+
+                    # 已显示快照时不分批发送，结束后整体校正
+                    if snapshot_shown:
+                        continue
+                    elapsed_ms = (time.monotonic() - last_emit) * 1000
+                    if len(batch) >= self.BATCH_SIZE or elapsed_ms >= self.BATCH_INTERVAL_MS:
+                        self._emit_batch(batch, files, ignore_patterns)
+                        batch = []
+                        last_emit = time.monotonic()
+            finally:
+                # 提前退出时关闭生成器，终止 svn 进程
+                status_iter.close()
+
+            if snapshot_shown:
+                files = apply_ignore_patterns(batch, ignore_patterns)
+            elif batch:
+                self._emit_batch(batch, files, ignore_patterns)
 
             # 发送成功信号
             self.finished.emit(files)
+
+            if snapshot_cache is not None:
+                # svn status 完成后再计算缓存键，避免其写入 wc.db 导致键立即失效
+                key = snapshot_cache.compute_key(Path.cwd(), ignore_patterns)
+                if key is not None:
+                    snapshot_cache.save(key, files)
         except Exception as e:
             # 发送错误信号
             self.error.emit(f"加载 SVN 状态失败: {str(e)}")
+
+    def _emit_snapshot(
+        self, snapshot_cache: StatusSnapshotCache, ignore_patterns: List[str]
+    ) -> bool:
+        """
+        读取并发送匹配当前工作副本状态的快照
+
+        Args:
+            snapshot_cache: 状态快照缓存
+            ignore_patterns: 忽略模式列表
+
+        Returns:
+            是否命中并发送了快照
+        """
+        key = snapshot_cache.compute_key(Path.cwd(), ignore_patterns)
+        snapshot = snapshot_cache.load(key) if key is not None else None
+        if snapshot is None:
+            return False
+        self.snapshotReady.emit(snapshot)
+        return True
+
+    def _emit_batch(
+        self,
+        batch: List[Tuple[str, str]],
+        files: List[Tuple[str, str]],
+        ignore_patterns: List[str],
+    ) -> None:
+        """
+        过滤并发送一批条目
+
+        Args:
+            batch: 本批原始条目
+            files: 累计的完整文件列表（原地追加）
+            ignore_patterns: 忽略模式列表
+        """
+        filtered = apply_ignore_patterns(batch, ignore_patterns)
+        if filtered:
+            files.extend(filtered)
+            self.batchReady.emit(filtered)
+
+
+class SVNStatusDeltaLoader(QThread):
+    """
+    增量 SVN 状态加载工作线程
+
+    只对发生变化的路径运行 svn status（按 TARGETS_CHUNK 分批传入路径）。
+
+    Signals:
+        finished: 加载成功时发送，参数为 (查询的路径列表, 结果文件列表（已应用忽略模式）)
+        error: 加载失败时发送，参数为错误消息
+    """
+
+    finished = pyqtSignal(list, list)
+    error = pyqtSignal(str)
+
+    # 每次 svn status 传入的路径数量（避免命令行过长）
+    TARGETS_CHUNK = 100
+
+    def __init__(self, targets: List[str], parent=None) -> None:
+        """
+        初始化加载器
+
+        Args:
+            targets: 需要查询的路径列表（相对于当前目录）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._targets = targets
+
+    def run(self) -> None:
+        """执行增量 SVN 状态查询（在后台线程中运行）"""
+        try:
+            ignore_patterns = load_config().get("ignorePatterns", [])
+
+            files: List[Tuple[str, str]] = []
+            for start in range(0, len(self._targets), self.TARGETS_CHUNK):
+                if self.isInterruptionRequested():
+                    return
+                chunk = self._targets[start : start + self.TARGETS_CHUNK]
+                files.extend(iter_svn_status(chunk, ignore_patterns))
+
+            self.finished.emit(self._targets, apply_ignore_patterns(files, ignore_patterns))
+        except Exception as e:
+            self.error.emit(f"刷新 SVN 状态失败: {str(e)}")
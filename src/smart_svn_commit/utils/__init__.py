@@ -3,9 +3,11 @@
 """
 
 from .regex_cache import RegexCache
-from .filters import apply_ignore_patterns
+from .filters import IgnoreMatcher, apply_ignore_patterns, compile_ignore_patterns
 
 __all__ = [
     "RegexCache",
+    "IgnoreMatcher",
     "apply_ignore_patterns",
+    "compile_ignore_patterns",
 ]
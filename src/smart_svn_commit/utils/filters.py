@@ -3,15 +3,38 @@
 """
 
 import re
-from pathlib import Path
-from typing import List, Optional, Tuple
+import sys
+from bisect import bisect_left
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
 
+from .ngram_index import TrigramIndex, indexed_candidates
 from .regex_cache import get_global_cache
 
+if TYPE_CHECKING:
+    from ..core.entry_store import FileEntryStore
+
 
 # 全局正则缓存实例
 _regex_cache = get_global_cache()
 
+# 忽略模式匹配器缓存（按模式列表）
+_MATCHER_CACHE_SIZE = 16
+_matcher_cache: Dict[Tuple[str, ...], "IgnoreMatcher"] = {}
+
+# 目录前缀树的终止标记（不会与路径组件冲突）
+_TRIE_END = "\0"
+
+# Path.match 使用的路径分隔符（Windows 下同时接受 / 和 \\）
+_SEPARATORS = "/\\" if sys.platform == "win32" else "/"
+_SEP_CLASS = "[" + re.escape(_SEPARATORS) + "]"
+_NON_SEP_CLASS = "[^" + re.escape(_SEPARATORS) + "]"
+
+_BACKSLASH_IS_SEP = sys.platform == "win32"
+
+# Path.match 在 Windows 下大小写不敏感
+_GLOB_FLAGS = re.IGNORECASE if sys.platform == "win32" else 0
+
 
 def apply_ignore_patterns(
     files: List[Tuple[str, str]], ignore_patterns: List[str]
@@ -29,47 +52,246 @@ def apply_ignore_patterns(
     if not ignore_patterns:
         return files
 
-    filtered = []
-    for status, file_path in files:
-        if not _should_ignore_file(file_path, ignore_patterns):
-            filtered.append((status, file_path))
-
-    return filtered
+    return compile_ignore_patterns(ignore_patterns).filter(files)
 
 
-def _should_ignore_file(file_path: str, ignore_patterns: List[str]) -> bool:
+def compile_ignore_patterns(ignore_patterns: Iterable[str]) -> "IgnoreMatcher":
     """
-    判断文件是否应该被忽略
+    获取忽略模式列表对应的匹配器（按模式列表缓存，只编译一次）
 
     Args:
-        file_path: 文件路径
         ignore_patterns: 忽略模式列表
 
     Returns:
-        True 如果应该忽略，否则 False
+        忽略模式匹配器
     """
-    for pattern in ignore_patterns:
-        if pattern.endswith("/"):
-            # 目录模式
-            if file_path.startswith(pattern):
+    key = tuple(ignore_patterns)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        if len(_matcher_cache) >= _MATCHER_CACHE_SIZE:
+            _matcher_cache.clear()
+        matcher = _matcher_cache[key] = IgnoreMatcher(key)
+    return matcher
+
+
+class IgnoreMatcher:
+    """
+    预编译的忽略模式匹配器
+
+    模式语义与逐条匹配时一致：
+    - 目录模式（以 / 结尾）：路径以该模式开头，使用按路径组件建立的前缀树匹配
+    - 扩展名模式（*.ext）：路径以 .ext 结尾，单级扩展名使用哈希集合查找
+    - 其他通配符模式：等同于 Path.match（从右侧逐组件匹配）。单组件模式合并为一个
+      正则只匹配文件名，多组件模式合并为一个正则匹配路径末尾
+    - 普通文本：包含匹配，合并为一个正则表达式
+    """
+
+    __slots__ = (
+        "_dir_trie",
+        "_ext_set",
+        "_suffixes",
+        "_name_regex",
+        "_tail_regex",
+        "_text_regex",
+        "_fallback_globs",
+    )
+
+    def __init__(self, ignore_patterns: Iterable[str]):
+        """
+        编译忽略模式
+
+        Args:
+            ignore_patterns: 忽略模式列表
+        """
+        self._dir_trie: Dict[str, Any] = {}
+        self._ext_set: Set[str] = set()
+        suffixes: List[str] = []
+        name_globs: List[str] = []
+        tail_globs: List[str] = []
+        texts: List[str] = []
+        self._fallback_globs: List[str] = []
+
+        for pattern in ignore_patterns:
+            if pattern.endswith("/"):
+                self._add_dir_pattern(pattern)
+            elif pattern.startswith("*."):
+                suffix = pattern[1:]
+                if "." in suffix[1:] or "/" in suffix:
+                    suffixes.append(suffix)
+                else:
+                    self._ext_set.add(suffix)
+            elif "*" in pattern or "?" in pattern:
+                parts = _translate_path_glob(pattern)
+                if parts is None:
+                    self._fallback_globs.append(pattern)
+                elif len(parts) == 1:
+                    name_globs.append(parts[0])
+                else:
+                    tail_globs.append(_SEP_CLASS.join(parts))
+            else:
+                texts.append(re.escape(pattern))
+
+        self._suffixes = tuple(suffixes)
+        self._name_regex = _compile_alternatives(name_globs, _GLOB_FLAGS)
+        self._tail_regex = _compile_alternatives(
+            tail_globs, _GLOB_FLAGS | re.DOTALL, prefix=f"(?:.*{_SEP_CLASS})?", suffix="\\Z"
+        )
+        self._text_regex = _compile_alternatives(texts, 0)
+
+    def _add_dir_pattern(self, pattern: str) -> None:
+        """将目录模式加入前缀树（末尾组件节点标记为终止）"""
+        node = self._dir_trie
+        for part in pattern[:-1].split("/"):
+            node = node.setdefault(part, {})
+        node[_TRIE_END] = True
+
+    def matches(self, file_path: str) -> bool:
+        """
+        判断文件是否应该被忽略
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            True 如果应该忽略，否则 False
+        """
+        return self._match_dir(file_path) or self._match_file(file_path)
+
+    def _match_file(self, file_path: str) -> bool:
+        """匹配目录模式以外的模式（扩展名、通配符、普通文本）"""
+        if self._ext_set:
+            dot_idx = file_path.rfind(".")
+            if dot_idx >= 0 and file_path[dot_idx:] in self._ext_set:
                 return True
-        elif pattern.startswith("*."):
-            # 扩展名模式
-            if file_path.endswith(pattern[1:]):
+
+        if self._suffixes and file_path.endswith(self._suffixes):
+            return True
+
+        if self._name_regex is not None:
+            name_idx = file_path.rfind("/") + 1
+            if _BACKSLASH_IS_SEP:
+                name_idx = max(name_idx, file_path.rfind("\\") + 1)
+            if self._name_regex.fullmatch(file_path, name_idx):
                 return True
-        elif "*" in pattern or "?" in pattern:
-            # 通配符模式
+
+        if self._tail_regex is not None and self._tail_regex.match(file_path):
+            return True
+
+        if self._text_regex is not None and self._text_regex.search(file_path):
+            return True
+
+        for pattern in self._fallback_globs:
             try:
                 if Path(file_path).match(pattern):
                     return True
             except (ValueError, RuntimeError):
                 pass
-        else:
-            # 完整路径或部分匹配
-            if pattern in file_path:
+
+        return False
+
+    def _match_dir(self, file_path: str) -> bool:
+        """沿前缀树匹配路径组件（最后一个组件之后没有 /，不参与匹配）"""
+        node = self._dir_trie
+        if not node:
+            return False
+        parts = file_path.split("/")
+        for part in parts[:-1]:
+            node = node.get(part)
+            if node is None:
+                return False
+            if _TRIE_END in node:
                 return True
+        return False
+
+    def filter(self, files: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        过滤掉应被忽略的文件
+
+        Args:
+            files: (状态, 文件路径) 元组序列
+
+        Returns:
+            过滤后的文件列表
+        """
+        # 目录模式只取决于最后一个 / 之前的部分，同一目录下的文件共享结果
+        dir_results: Dict[str, bool] = {}
+        match_dir = self._match_dir
+        match_file = self._match_file
+
+        filtered = []
+        for item in files:
+            file_path = item[1]
+            dir_part = file_path[: file_path.rfind("/") + 1]
+            dir_ignored = dir_results.get(dir_part)
+            if dir_ignored is None:
+                dir_ignored = dir_results[dir_part] = match_dir(dir_part)
+            if not dir_ignored and not match_file(file_path):
+                filtered.append(item)
+        return filtered
+
 
-    return False
+def _compile_alternatives(
+    alternatives: List[str], flags: int, prefix: str = "", suffix: str = ""
+) -> Optional[Pattern]:
+    """将多个正则表达式合并为一个（列表为空时返回 None）"""
+    if not alternatives:
+        return None
+    return re.compile(f"{prefix}(?:{'|'.join(alternatives)}){suffix}", flags)
+
+
+def _translate_path_glob(pattern: str) -> Optional[List[str]]:
+    """
+    将 Path.match 通配符模式按路径组件转换为正则表达式
+
+    相对模式从路径右侧逐组件匹配：* 和 ? 不跨越路径分隔符。
+
+    Args:
+        pattern: 通配符模式
+
+    Returns:
+        各组件的正则表达式列表；绝对模式等无法等价转换时返回 None（回退到 Path.match）
+    """
+    try:
+        pure = PurePath(pattern)
+    except (TypeError, ValueError):
+        return None
+    if pure.anchor or not pure.parts:
+        return None
+    return [_translate_component(part) for part in pure.parts]
+
+
+def _translate_component(part: str) -> str:
+    """将单个路径组件的 fnmatch 模式转换为正则表达式（不匹配分隔符）"""
+    result = []
+    i, n = 0, len(part)
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == "*":
+            result.append(f"{_NON_SEP_CLASS}*")
+        elif c == "?":
+            result.append(_NON_SEP_CLASS)
+        elif c == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                result.append("\\[")
+                continue
+            stuff = part[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if stuff.startswith("!"):
+                stuff = "^" + _SEPARATORS.replace("\\", "\\\\") + stuff[1:]
+            elif stuff.startswith(("^", "[")):
+                stuff = "\\" + stuff
+            result.append(f"[{stuff}]")
+        else:
+            result.append(re.escape(c))
+    return "".join(result)
 
 
 def wildcard_filter(
@@ -91,18 +313,32 @@ def wildcard_filter(
     Returns:
         过滤后的项目列表
     """
-    # 将通配符模式转换为正则表达式
+    regex = _compile_wildcard(pattern)
+    if regex is None:
+        return []
+    return [(status, path) for status, path in items if regex.search(path)]
+
+
+def _compile_wildcard(pattern: str) -> Optional[Pattern]:
+    """
+    将通配符模式编译为正则表达式（大小写不敏感，使用缓存）
+
+    Args:
+        pattern: 通配符模式
+
+    Returns:
+        编译后的正则表达式，模式无效时返回 None
+    """
     regex_pattern = re.escape(pattern)
     regex_pattern = regex_pattern.replace(r"\*", ".*")
     regex_pattern = regex_pattern.replace(r"\?", ".")
     regex_pattern = f"^{regex_pattern}$"
 
     try:
-        regex = _regex_cache.get(regex_pattern)
-        return [(status, path) for status, path in items if regex.search(path)]
+        return _regex_cache.get(regex_pattern)
     except re.error:
-        # 正则表达式无效，返回空列表
-        return []
+        # 正则表达式无效
+        return None
 
 
 def text_filter(
@@ -120,3 +356,169 @@ def text_filter(
     """
     search_lower = search_text.lower()
     return [(status, path) for status, path in items if search_lower in path.lower()]
+
+
+def is_wildcard_pattern(search_text: str) -> bool:
+    """判断搜索文本是否为通配符模式"""
+    return "*" in search_text or "?" in search_text
+
+
+def filter_entries(
+    search_text: str,
+    store: "FileEntryStore",
+    candidates: Optional[Iterable[int]] = None,
+) -> List[int]:
+    """
+    按搜索文本过滤条目索引（普通文本或通配符，大小写不敏感）
+
+    直接使用存储中预先计算的小写搜索键，不再逐项转换大小写。
+
+    Args:
+        search_text: 搜索文本（支持通配符）
+        store: 文件条目存储
+        candidates: 候选条目索引，为 None 时过滤全部未移除的条目
+
+    Returns:
+        匹配的条目索引列表（保持候选顺序）
+    """
+    indices = store.live_indices() if candidates is None else candidates
+    keys = store.search_keys
+
+    if is_wildcard_pattern(search_text):
+        regex = _compile_wildcard(search_text)
+        if regex is None:
+            return []
+        return [i for i in indices if regex.search(keys[i])]
+
+    search_lower = search_text.lower()
+    return [i for i in indices if search_lower in keys[i]]
+
+
+class IncrementalSearch:
+    """
+    增量搜索引擎
+
+    记住上一次的查询及结果。新查询是上一次的细化（追加字符、更窄的通配符）时，
+    只在上一次的结果（以及之后新追加的条目）中过滤；提供三元组索引时，
+    用索引缩小候选范围（取两者中较小的一个），再逐项验证。
+    实例不加锁，同一时间只能在一个线程中使用。
+    """
+
+    def __init__(self):
+        self._store: Optional["FileEntryStore"] = None
+        self._query = ""
+        self._result: List[int] = []
+        self._size = 0
+
+    def reset(self) -> None:
+        """清空记住的查询（条目存储被替换时自动调用）"""
+        self._store = None
+        self._query = ""
+        self._result = []
+        self._size = 0
+
+    def search(
+        self,
+        search_text: str,
+        store: "FileEntryStore",
+        size: Optional[int] = None,
+        index: Optional[TrigramIndex] = None,
+    ) -> List[int]:
+        """
+        按搜索文本过滤条目索引
+
+        Args:
+            search_text: 搜索文本（支持通配符），为空时匹配全部未移除的条目
+            store: 文件条目存储
+            size: 只处理前 size 个条目，为 None 时使用当前全部条目
+                （可在后台线程调用，期间主线程可能继续追加）
+            index: 条目存储对应的三元组索引（可选）
+
+        Returns:
+            匹配的条目索引列表（按条目顺序）
+        """
+        if store is not self._store:
+            self.reset()
+            self._store = store
+
+        size = len(store) if size is None else size
+        if not search_text:
+            live = store.live_indices()
+            result = live[: bisect_left(live, size)]
+        else:
+            candidates = indexed_candidates(index, search_text, store, size)
+            if self._size and is_search_refinement(self._query, search_text):
+                # 上次结果之后追加的条目也需要参与过滤；取两者中较小的候选集
+                previous = self._result + list(range(self._size, size))
+                if candidates is None or len(previous) < len(candidates):
+                    candidates = previous
+            if candidates is None:
+                candidates = range(size)
+
+            # 候选中可能包含已移除的条目
+            result = [
+                i
+                for i in filter_entries(search_text, store, candidates)
+                if not store.is_removed(i)
+            ]
+
+        self._query = search_text
+        self._result = result
+        self._size = size
+        return result
+
+
+def is_search_refinement(old_text: str, new_text: str) -> bool:
+    """
+    判断新查询的匹配结果是否一定是旧查询结果的子集
+
+    普通文本按包含匹配，视为 *文本* 通配符；比较前统一转为小写。
+
+    Args:
+        old_text: 上一次的搜索文本
+        new_text: 新的搜索文本
+
+    Returns:
+        True 表示可以只在旧结果中过滤
+    """
+    if not old_text:
+        return True
+    return _glob_subsumes(_as_search_glob(old_text), _as_search_glob(new_text))
+
+
+def _as_search_glob(search_text: str) -> str:
+    """将搜索文本转换为等价的小写通配符模式"""
+    text = search_text.lower()
+    return text if is_wildcard_pattern(text) else f"*{text}*"
+
+
+def _glob_subsumes(general: str, specific: str) -> bool:
+    """
+    判断通配符 general 是否覆盖 specific 能匹配的所有字符串（充分条件）
+
+    把 specific 中的 * 和 ? 当作符号：general 的 * 可吸收任意符号序列，
+    ? 可匹配字面字符或 ?，字面字符只匹配相同的字面字符。
+
+    Args:
+        general: 较宽的通配符模式
+        specific: 较窄的通配符模式
+
+    Returns:
+        True 表示 specific 的匹配结果一定被 general 匹配
+    """
+    n, m = len(general), len(specific)
+    # covered[j]：general[i:] 能否覆盖 specific[j:]（按 i 从后向前滚动）
+    covered = [False] * m + [True]
+    for i in range(n - 1, -1, -1):
+        g = general[i]
+        row = [False] * (m + 1)
+        for j in range(m, -1, -1):
+            if g == "*":
+                row[j] = covered[j] or (j < m and row[j + 1])
+            elif j < m:
+                c = specific[j]
+                matched = c != "*" if g == "?" else c == g
+                row[j] = matched and covered[j + 1]
+        covered = row
+    return covered[0]
+
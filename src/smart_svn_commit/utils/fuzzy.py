@@ -0,0 +1,317 @@
+"""
+模糊搜索（类似 fzf）
+
+查询按空白拆分为多个词，每个词的字符需按顺序出现在路径中（不要求连续）。
+匹配位置位于路径组件开头、单词边界、驼峰或数字开头时加分，连续匹配加分，
+间隔扣分；整个词落在文件名中时额外加分。结果按得分从高到低排序。
+
+小写搜索键按批拼接为以换行分隔的长字符串并缓存，每个词对整批只运行一次正则，
+由正则引擎完成逐条目的子序列匹配，只对命中的条目计分。
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Pattern, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from ..core.entry_store import FileEntryStore
+
+# 计分参数
+SCORE_MATCH = 16
+BONUS_PATH_BOUNDARY = 10
+BONUS_WORD_BOUNDARY = 8
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+BONUS_BASENAME = 20
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+# 每批拼接的条目数
+BATCH_SIZE = 4096
+
+# 细化查询的候选数不超过条目数的该比例时逐条匹配，否则整批匹配
+_REFINE_FRACTION = 0.125
+
+# 路径分隔符和单词分隔符
+_PATH_SEPARATORS = "/\\"
+_WORD_SEPARATORS = "_-. "
+
+# 查询词正则缓存
+_PATTERN_CACHE_SIZE = 256
+_pattern_cache: Dict[str, Pattern] = {}
+
+
+class _Batch:
+    """一批搜索键拼接成的文本及各条目的起始偏移"""
+
+    __slots__ = ("start", "text", "offsets")
+
+    def __init__(self, start: int, keys: Sequence[str]):
+        self.start = start
+        self.offsets: List[int] = []
+        pos = 0
+        for key in keys:
+            self.offsets.append(pos)
+            pos += len(key) + 1
+        self.text = "\n".join(keys) + "\n"
+
+
+class FuzzyMatcher:
+    """
+    模糊搜索引擎
+
+    为条目存储缓存按批拼接的搜索键（条目追加后补齐最后一批），
+    并记住上一次的查询：新查询以旧查询开头时只在上一次的结果中匹配。
+    实例不加锁，同一时间只能在一个线程中使用。
+    """
+
+    def __init__(self):
+        self._store: Optional["FileEntryStore"] = None
+        self._batches: List[_Batch] = []
+        self._query = ""
+        self._result: List[int] = []
+        self._size = 0
+
+    def reset(self) -> None:
+        """清空缓存（条目存储被替换时自动调用）"""
+        self._store = None
+        self._batches = []
+        self._query = ""
+        self._result = []
+        self._size = 0
+
+    def search(self, query: str, store: "FileEntryStore", size: Optional[int] = None) -> List[int]:
+        """
+        模糊匹配并按得分排序
+
+        Args:
+            query: 查询文本（按空白拆分为多个词，全部匹配才算命中）
+            store: 文件条目存储
+            size: 只处理前 size 个条目，为 None 时使用当前全部条目
+                （可在后台线程调用，期间主线程可能继续追加）
+
+        Returns:
+            匹配的条目索引列表（得分从高到低，同分时路径较短的在前）；查询为空时返回空列表
+        """
+        if store is not self._store:
+            self.reset()
+            self._store = store
+
+        terms = query.lower().split()
+        if not terms:
+            return []
+
+        size = len(store) if size is None else size
+        candidates: Optional[List[int]] = None
+        if self._size and self._query.strip() and query.startswith(self._query):
+            # 新查询是旧查询的延伸：匹配结果一定是旧结果（及之后追加的条目）的子集
+            candidates = self._result + list(range(self._size, size))
+            if len(candidates) > size * _REFINE_FRACTION:
+                candidates = None
+        if candidates is None:
+            candidates = self._match_batches(terms, size)
+
+        result = fuzzy_filter(query, store, [i for i in candidates if not store.is_removed(i)])
+
+        self._query = query
+        self._result = sorted(result)
+        self._size = size
+        return result
+
+    def _match_batches(self, terms: List[str], size: int) -> List[int]:
+        """
+        对所有批次运行正则，得到全部词都能匹配的条目
+
+        Args:
+            terms: 查询词列表（小写）
+            size: 只考虑前 size 个条目
+
+        Returns:
+            条目索引列表（升序，可能包含已移除的条目）
+        """
+        self._update_batches(size)
+        patterns = [_compile_term(term) for term in terms]
+        result: List[int] = []
+        for batch in self._batches:
+            matched: Optional[Set[int]] = None
+            for pattern in patterns:
+                lines = _match_lines(pattern, batch)
+                matched = lines if matched is None else matched & lines
+                if not matched:
+                    break
+            if matched:
+                result.extend(sorted(matched))
+        return result[: bisect_left(result, size)]
+
+    def _update_batches(self, size: int) -> None:
+        """为前 size 个条目中新追加的条目补齐批次（最后一个不满的批次重新拼接）"""
+        keys = self._store.search_keys
+        batches = self._batches
+        if batches:
+            last = batches[-1]
+            if last.start + len(last.offsets) >= size:
+                return
+            if len(last.offsets) < BATCH_SIZE:
+                batches.pop()
+        start = len(batches) * BATCH_SIZE
+        for begin in range(start, size, BATCH_SIZE):
+            batches.append(_Batch(begin, keys[begin : min(begin + BATCH_SIZE, size)]))
+
+
+def _match_lines(pattern: Pattern, batch: _Batch) -> Set[int]:
+    """
+    在一批拼接文本中查找能匹配正则的条目（每个条目最多匹配一次）
+
+    Args:
+        pattern: 查询词正则（不会跨越换行）
+        batch: 条目批次
+
+    Returns:
+        条目索引集合
+    """
+    text, offsets = batch.text, batch.offsets
+    search = pattern.search
+    lines = set()
+    match = search(text)
+    while match is not None:
+        line = bisect_right(offsets, match.start()) - 1
+        lines.add(batch.start + line)
+        # 从下一条目开始继续查找
+        next_line = line + 1
+        if next_line >= len(offsets):
+            break
+        match = search(text, offsets[next_line])
+    return lines
+
+
+def fuzzy_filter(
+    query: str, store: "FileEntryStore", candidates: Sequence[int]
+) -> List[int]:
+    """
+    在给定候选中模糊匹配并按得分排序（不使用批次缓存，适合少量候选）
+
+    Args:
+        query: 查询文本
+        store: 文件条目存储
+        candidates: 候选条目索引
+
+    Returns:
+        匹配的条目索引列表（得分从高到低）
+    """
+    terms = query.lower().split()
+    if not terms:
+        return list(candidates)
+    scored = score_entries(terms, store, candidates)
+    scored.sort()
+    return [index for _, _, index in scored]
+
+
+def score_entries(
+    terms: List[str], store: "FileEntryStore", candidates: Sequence[int]
+) -> List[Tuple[int, int, int]]:
+    """
+    对候选条目逐个确认匹配并计分
+
+    Args:
+        terms: 查询词列表（小写）
+        store: 文件条目存储
+        candidates: 候选条目索引
+
+    Returns:
+        (-得分, 路径长度, 条目索引) 元组列表（未排序），不匹配的条目不包含在内
+    """
+    patterns = [_compile_term(term) for term in terms]
+    keys = store.search_keys
+    paths = store.paths
+    scored = []
+
+    for index in candidates:
+        key = keys[index]
+        path = paths[index]
+        base_start = max(key.rfind("/"), key.rfind("\\")) + 1
+
+        total = 0
+        for pattern in patterns:
+            # 优先在文件名中匹配
+            match = pattern.search(key, base_start)
+            bonus = BONUS_BASENAME if match else 0
+            if match is None:
+                match = pattern.search(key)
+                if match is None:
+                    break
+            positions = [match.start(g) for g in range(1, pattern.groups + 1)]
+            total += bonus + _score_positions(path, positions)
+        else:
+            scored.append((-total, len(key), index))
+
+    return scored
+
+
+def _compile_term(term: str) -> Pattern:
+    """
+    将查询词编译为按顺序、最短间隔匹配各字符的正则（每个字符一个分组，不跨越换行）
+
+    Args:
+        term: 查询词（小写）
+
+    Returns:
+        编译后的正则表达式
+    """
+    pattern = _pattern_cache.get(term)
+    if pattern is None:
+        if len(_pattern_cache) >= _PATTERN_CACHE_SIZE:
+            _pattern_cache.clear()
+        parts = [f"({re.escape(term[0])})"]
+        for c in term[1:]:
+            escaped = re.escape(c)
+            parts.append(f"[^\\n{escaped}]*({escaped})")
+        pattern = _pattern_cache[term] = re.compile("".join(parts))
+    return pattern
+
+
+def _score_positions(path: str, positions: List[int]) -> int:
+    """
+    按匹配位置计分
+
+    Args:
+        path: 原始路径（用于判断驼峰边界）
+        positions: 各查询字符的匹配位置（升序）
+
+    Returns:
+        得分
+    """
+    score = 0
+    previous = -2
+    for n, pos in enumerate(positions):
+        bonus = _position_bonus(path, pos)
+        if n == 0:
+            bonus *= BONUS_FIRST_CHAR_MULTIPLIER
+        score += SCORE_MATCH + bonus
+
+        gap = pos - previous - 1
+        if n > 0:
+            if gap == 0:
+                score += BONUS_CONSECUTIVE
+            else:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (gap - 1)
+        previous = pos
+    return score
+
+
+def _position_bonus(path: str, pos: int) -> int:
+    """匹配位置的边界加分"""
+    if pos == 0:
+        return BONUS_PATH_BOUNDARY
+    if pos >= len(path):
+        # 小写转换改变了长度（极少见），无法对应到原始路径
+        return 0
+    prev = path[pos - 1]
+    if prev in _PATH_SEPARATORS:
+        return BONUS_PATH_BOUNDARY
+    if prev in _WORD_SEPARATORS:
+        return BONUS_WORD_BOUNDARY
+    c = path[pos]
+    if (c.isupper() and prev.islower()) or (c.isdigit() and not prev.isdigit()):
+        return BONUS_CAMEL
+    return 0
@@ -0,0 +1,193 @@
+"""
+路径搜索的三元组（trigram）索引
+
+将每个条目的小写搜索键拆分为长度为 3 的子串，记录包含该子串的条目索引（倒排表）。
+查询时取搜索文本中各字面片段的三元组，求倒排表交集得到候选条目，再逐项验证。
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from ..core.entry_store import FileEntryStore
+
+# 三元组长度
+NGRAM_SIZE = 3
+
+# 倒排表数组类型（无符号 32 位整数）
+POSTING_TYPECODE = "I"
+
+# 候选数量不超过该值时不再求交集，直接逐项验证
+_VERIFY_THRESHOLD = 64
+
+# 下一个倒排表比当前候选大过该倍数时停止求交集（逐项验证更快）
+_INTERSECT_MAX_RATIO = 4
+
+# 最短的倒排表超过索引条目数的该比例时不使用索引（直接扫描更快）
+_MAX_CANDIDATE_FRACTION = 0.25
+
+
+class TrigramIndex:
+    """
+    三元组倒排索引
+
+    索引覆盖条目 [0, size)，倒排表按条目索引升序保存。条目的搜索键不会变化，
+    移除的条目和之后追加的条目由调用方处理。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self.size = 0
+
+    @classmethod
+    def build(cls, keys: Sequence[str], is_cancelled=None) -> Optional["TrigramIndex"]:
+        """
+        为搜索键列表建立索引
+
+        Args:
+            keys: 小写搜索键列表（条目索引即列表下标）
+            is_cancelled: 可选的取消检查函数，返回 True 时中止建立
+
+        Returns:
+            索引对象，被取消时返回 None
+        """
+        index = cls()
+        if not index.extend(keys, is_cancelled):
+            return None
+        return index
+
+    def extend(self, keys: Sequence[str], is_cancelled=None) -> bool:
+        """
+        将 keys[size:] 追加到索引
+
+        Args:
+            keys: 小写搜索键列表
+            is_cancelled: 可选的取消检查函数
+
+        Returns:
+            是否完成（被取消时返回 False，索引保持不变）
+        """
+        start, end = self.size, len(keys)
+        lists: Dict[str, List[int]] = {}
+        n = NGRAM_SIZE
+
+        for i in range(start, end):
+            if is_cancelled is not None and i % 4096 == 0 and is_cancelled():
+                return False
+            key = keys[i]
+            for gram in {key[j : j + n] for j in range(len(key) - n + 1)}:
+                posting = lists.get(gram)
+                if posting is None:
+                    lists[gram] = [i]
+                else:
+                    posting.append(i)
+
+        postings = self._postings
+        for gram, indices in lists.items():
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array(POSTING_TYPECODE, indices)
+            else:
+                posting.extend(indices)
+        self.size = end
+        return True
+
+    def candidates(self, search_text: str) -> Optional[List[int]]:
+        """
+        计算可能匹配搜索文本的条目索引
+
+        普通文本与通配符中长度不小于 3 的字面片段都会参与求交集。
+
+        Args:
+            search_text: 搜索文本（支持通配符，大小写不敏感）
+
+        Returns:
+            升序的候选条目索引（均小于 size，需要再验证）；
+            没有可用的三元组或无法有效缩小范围时返回 None
+        """
+        n = NGRAM_SIZE
+        grams = set()
+        for segment in literal_segments(search_text.lower()):
+            grams.update(segment[j : j + n] for j in range(len(segment) - n + 1))
+        if not grams:
+            return None
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        if len(postings[0]) > self.size * _MAX_CANDIDATE_FRACTION:
+            return None
+
+        result: List[int] = list(postings[0])
+        for posting in postings[1:]:
+            if len(result) <= _VERIFY_THRESHOLD:
+                break
+            if len(posting) > len(result) * _INTERSECT_MAX_RATIO:
+                break
+            result = _intersect(result, posting)
+        return result
+
+
+def literal_segments(search_text: str) -> List[str]:
+    """
+    拆分搜索文本中的字面片段（以通配符 * 和 ? 分隔）
+
+    Args:
+        search_text: 搜索文本
+
+    Returns:
+        非空字面片段列表
+    """
+    return [s for s in search_text.replace("?", "*").split("*") if s]
+
+
+def _intersect(sorted_indices: List[int], posting: array) -> List[int]:
+    """
+    求升序索引列表与倒排表的交集
+
+    Args:
+        sorted_indices: 升序条目索引列表（较短的一方）
+        posting: 升序倒排表
+
+    Returns:
+        交集（升序）
+    """
+    # 只需考虑倒排表中落在候选范围内的部分
+    lo = bisect_left(posting, sorted_indices[0])
+    hi = bisect_left(posting, sorted_indices[-1] + 1, lo)
+    members = set(posting[lo:hi])
+    return [i for i in sorted_indices if i in members]
+
+
+def indexed_candidates(
+    index: Optional[TrigramIndex],
+    search_text: str,
+    store: "FileEntryStore",
+    size: Optional[int] = None,
+) -> Optional[List[int]]:
+    """
+    使用索引计算候选条目（包括索引建立之后追加、尚未进入索引的条目）
+
+    Args:
+        index: 三元组索引（可为 None）
+        search_text: 搜索文本
+        store: 文件条目存储
+        size: 只考虑前 size 个条目，为 None 时考虑全部条目
+
+    Returns:
+        候选条目索引（可能包含已移除的条目），无法使用索引时返回 None
+    """
+    if size is None:
+        size = len(store)
+    if index is None or index.size > size:
+        return None
+    candidates = index.candidates(search_text)
+    if candidates is None:
+        return None
+    candidates.extend(range(index.size, size))
+    return candidates
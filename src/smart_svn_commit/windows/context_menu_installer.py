@@ -97,12 +97,12 @@ def handle_context_menu(path: str) -> None:
 
         # 获取 SVN 状态
         print("[handle_context_menu] 开始获取 SVN 状态...", file=sys.stderr)
-        files = run_svn_status()
+        config = load_config()
+        ignore_patterns = config.get("ignorePatterns", [])
+        files = run_svn_status(config.get("statusEngine", "svn"), ignore_patterns)
         print(f"[handle_context_menu] 获取到 {len(files)} 个文件", file=sys.stderr)
 
         # 应用忽略模式
-        config = load_config()
-        ignore_patterns = config.get("ignorePatterns", [])
         files = apply_ignore_patterns(files, ignore_patterns)
         print(f"[handle_context_menu] 过滤后 {len(files)} 个文件", file=sys.stderr)
 
@@ -0,0 +1,76 @@
+"""
+测试公共工具：在临时目录中创建 svn 仓库和工作副本
+
+依赖 svn 和 svnadmin 命令行，缺少时相关测试跳过。
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+# 使测试无需安装即可导入 src 下的包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+SVN_AVAILABLE = shutil.which("svn") is not None and shutil.which("svnadmin") is not None
+
+requires_svn = pytest.mark.skipif(not SVN_AVAILABLE, reason="需要 svn 和 svnadmin 命令行")
+
+
+def svn(*args: str, cwd: Path) -> str:
+    """在 cwd 中运行 svn 命令（非交互），返回标准输出"""
+    result = subprocess.run(
+        ["svn", "--non-interactive", *args],
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    return result.stdout.decode("utf-8")
+
+
+def write_file(path: Path, content: str) -> None:
+    """写入文件（自动创建父目录）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def sorted_status(files) -> List[tuple]:
+    """按路径排序的 (状态, 路径) 列表，用于比较不同来源的结果"""
+    return sorted(files, key=lambda item: (item[1], item[0]))
+
+
+@pytest.fixture
+def svn_repo(tmp_path: Path) -> str:
+    """创建空的 svn 仓库，返回仓库 URL"""
+    repo = tmp_path / "repo"
+    subprocess.run(["svnadmin", "create", str(repo)], check=True)
+    return repo.as_uri()
+
+
+@pytest.fixture
+def make_wc(tmp_path: Path, svn_repo: str):
+    """
+    创建工作副本的工厂：make_wc(name, files) 在仓库的 name 目录下提交 files
+    （相对路径 -> 内容，以 / 结尾的路径为空目录），检出后返回工作副本路径
+    """
+
+    def factory(name: str, files: dict) -> Path:
+        wc = tmp_path / f"wc_{name}"
+        svn("mkdir", "--parents", "-m", f"create {name}", f"{svn_repo}/{name}", cwd=tmp_path)
+        svn("checkout", f"{svn_repo}/{name}", str(wc), cwd=tmp_path)
+        for relpath, content in files.items():
+            if relpath.endswith("/"):
+                (wc / relpath).mkdir(parents=True, exist_ok=True)
+            else:
+                write_file(wc / relpath, content)
+        if files:
+            svn("add", "--force", ".", cwd=wc)
+            svn("commit", "-m", f"add {name} files", cwd=wc)
+            svn("update", cwd=wc)
+        return wc
+
+    return factory
@@ -0,0 +1,117 @@
+"""
+批量 diff 拆分（ai.diff）测试
+"""
+
+import io
+
+from smart_svn_commit.ai import diff as diff_module
+from smart_svn_commit.ai.diff import get_batched_diff, split_diff_output
+
+SEPARATOR = "=" * 67 + "\n"
+
+DIFF_OUTPUT = (
+    "Index: src/a.py\n" + SEPARATOR + "--- src/a.py\t(revision 1)\n"
+    "+++ src/a.py\t(working copy)\n"
+    "@@ -1 +1 @@\n"
+    "-old\n"
+    "+new\n"
+    "\n"
+    "Property changes on: src/a.py\n"
+    "___________________________________________________________________\n"
+    "Added: svn:eol-style\n"
+    "## -0,0 +1 ##\n"
+    "+native\n"
+    "Index: lib/sub/b.txt\n" + SEPARATOR + "--- lib/sub/b.txt\t(revision 1)\n"
+    "+++ lib/sub/b.txt\t(working copy)\n"
+    "@@ -1 +1 @@\n"
+    "-b\n"
+    "+B\n"
+    "Property changes on: docs\n"
+    "___________________________________________________________________\n"
+    "Modified: svn:ignore\n"
+    "## -1 +1,2 ##\n"
+    " build\n"
+    "+dist\n"
+    "Index: unrelated.txt\n" + SEPARATOR + "+ignored\n"
+)
+
+
+def test_split_by_index_and_property_headers():
+    records = split_diff_output(io.StringIO(DIFF_OUTPUT), ["src/a.py", "lib", "docs", "c.txt"])
+
+    assert set(records.diffs) == {"src/a.py", "lib", "docs"}
+    # 同一文件的内容变更和属性变更归入同一段
+    assert records.diffs["src/a.py"].startswith("Index: src/a.py")
+    assert records.diffs["src/a.py"].endswith("+native")
+    # 目录目标包含其下文件的 diff
+    assert records.diffs["lib"].startswith("Index: lib/sub/b.txt")
+    assert records.diffs["lib"].endswith("+B")
+    assert records.diffs["docs"].startswith("Property changes on: docs")
+    assert "unrelated" not in "".join(records.diffs.values())
+    assert records.last_path is None
+
+
+def test_split_matches_windows_separators():
+    output = DIFF_OUTPUT.replace("src/a.py", "src\\a.py").replace(
+        "lib/sub/b.txt", "lib\\sub\\b.txt"
+    )
+    records = split_diff_output(io.StringIO(output), ["src\\a.py", "lib\\"])
+
+    assert set(records.diffs) == {"src\\a.py", "lib\\"}
+    assert records.diffs["lib\\"].endswith("+B")
+
+
+class FakeProcess:
+    """按给定输出和退出码模拟 svn diff 进程"""
+
+    def __init__(self, output: str, returncode: int):
+        self.stdout = io.StringIO(output)
+        self._returncode = returncode
+
+    def wait(self):
+        return self._returncode
+
+    def kill(self):
+        pass
+
+
+def test_batched_diff_fills_unchanged_files(monkeypatch):
+    monkeypatch.setattr(
+        diff_module.subprocess, "Popen", lambda *a, **k: FakeProcess(DIFF_OUTPUT, 0)
+    )
+
+    diffs = get_batched_diff(["src/a.py", "lib", "clean.txt"])
+
+    assert set(diffs) == {"src/a.py", "lib", "clean.txt"}
+    assert diffs["clean.txt"] == ""
+
+
+def test_batched_diff_drops_last_file_on_error(monkeypatch):
+    # svn 中途出错时最后一个文件的输出可能不完整，交给调用方逐个获取
+    truncated = DIFF_OUTPUT[: DIFF_OUTPUT.index("Property changes on: docs")]
+    monkeypatch.setattr(diff_module.subprocess, "Popen", lambda *a, **k: FakeProcess(truncated, 1))
+
+    diffs = get_batched_diff(["src/a.py", "lib", "docs"])
+
+    assert set(diffs) == {"src/a.py"}
+
+
+def test_multiple_files_fall_back_for_missing(monkeypatch):
+    monkeypatch.setattr(diff_module, "load_config", lambda: {"diffCache": {"enabled": False}})
+    monkeypatch.setattr(diff_module, "get_batched_diff", lambda paths, cancel=None: {"a": "da"})
+    fetched = []
+
+    def fake_file_diff(path):
+        fetched.append(path)
+        return f"d{path}"
+
+    monkeypatch.setattr(diff_module, "get_file_diff", fake_file_diff)
+
+    result = diff_module.get_multiple_files_diff(["b", "a", "c"])
+
+    assert result == [
+        {"path": "b", "diff": "db"},
+        {"path": "a", "diff": "da"},
+        {"path": "c", "diff": "dc"},
+    ]
+    assert sorted(fetched) == ["b", "c"]
@@ -0,0 +1,109 @@
+"""
+diff 缓存（ai.diff_cache）测试
+"""
+
+import os
+import threading
+
+import pytest
+
+from smart_svn_commit.ai import diff_cache
+from smart_svn_commit.ai.diff_cache import DiffCache
+
+
+@pytest.fixture
+def node_states(monkeypatch):
+    """wc.db 中的节点状态摘要（路径 -> 摘要），测试中可修改"""
+    states = {"a.txt": "0:normal:1:", "b.txt": "0:normal:1:", "dir": "0:normal:1:"}
+    monkeypatch.setattr(
+        diff_cache,
+        "read_node_states",
+        lambda path, paths: {p: states[p] for p in paths if p in states},
+    )
+    return states
+
+
+@pytest.fixture
+def wc(tmp_path, node_states):
+    """带两个已版本化文件、一个目录和一个未版本化文件的工作目录"""
+    wc_path = tmp_path / "wc"
+    (wc_path / "dir").mkdir(parents=True)
+    (wc_path / "a.txt").write_text("a\n", encoding="utf-8")
+    (wc_path / "b.txt").write_text("b\n", encoding="utf-8")
+    (wc_path / "unversioned.txt").write_text("u\n", encoding="utf-8")
+    return wc_path
+
+
+def make_cache(tmp_path, **kwargs) -> DiffCache:
+    return DiffCache(db_path=tmp_path / "cache" / "diff.sqlite", **kwargs)
+
+
+def test_compute_keys_only_for_versioned_files(wc):
+    keys = make_cache(wc).compute_keys(["a.txt", "dir", "missing.txt", "unversioned.txt"], wc)
+    assert list(keys) == ["a.txt"]
+
+
+def test_hit_from_memory_and_disk(wc, tmp_path):
+    cache = make_cache(tmp_path)
+    keys = cache.compute_keys(["a.txt", "b.txt"], wc)
+    cache.put_many({"a.txt": (keys["a.txt"], "diff a")}, wc)
+
+    assert cache.get_many(keys, wc) == {"a.txt": "diff a"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 新实例没有内存缓存，从磁盘读取
+    reopened = make_cache(tmp_path)
+    assert reopened.get_many(keys, wc) == {"a.txt": "diff a"}
+
+
+def test_key_changes_invalidate(wc, node_states, tmp_path):
+    cache = make_cache(tmp_path)
+    keys = cache.compute_keys(["a.txt", "b.txt"], wc)
+    cache.put_many({path: (key, f"diff {path}") for path, key in keys.items()}, wc)
+
+    (wc / "a.txt").write_text("a changed\n", encoding="utf-8")
+    node_states["b.txt"] = "0:normal:2:"
+    new_keys = cache.compute_keys(["a.txt", "b.txt"], wc)
+
+    assert new_keys["a.txt"] != keys["a.txt"]
+    assert new_keys["b.txt"] != keys["b.txt"]
+    assert cache.get_many(new_keys, wc) == {}
+    assert make_cache(tmp_path).get_many(new_keys, wc) == {}
+
+
+def test_memory_and_disk_eviction(wc, tmp_path):
+    # 内存上限约 10 个字符：只保留最近使用的 diff
+    cache = make_cache(tmp_path, max_memory_mb=10 / (1024 * 1024), max_disk_mb=0)
+    cache.put_many({"a.txt": ("ka", "aaaaaa")}, wc)
+    cache.put_many({"b.txt": ("kb", "bbbbbb")}, wc)
+
+    assert cache.get_many({"a.txt": "ka", "b.txt": "kb"}, wc) == {"b.txt": "bbbbbb"}
+    assert cache._memory_size == 6
+    # 磁盘上限为 0 时所有条目都被淘汰
+    assert make_cache(tmp_path).get_many({"a.txt": "ka", "b.txt": "kb"}, wc) == {}
+
+
+def test_concurrent_access_keeps_memory_consistent(wc, tmp_path):
+    cache = make_cache(tmp_path, max_memory_mb=200 / (1024 * 1024))
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                path = f"f{(n * 7 + i) % 30}.txt"
+                cache.put_many({path: (f"k{i}", "x" * (i % 13 + 1))}, wc)
+                cache.get_many({path: f"k{i}"}, wc)
+        except Exception as e:  # pragma: no cover - 失败时记录
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache._memory_size == sum(len(diff) for _, diff in cache._memory.values())
+    assert cache._memory_size <= 200
+    assert cache.hits + cache.misses == 6 * 50
+    assert all(os.path.isabs(path) for path in cache._memory)
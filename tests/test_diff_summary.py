@@ -0,0 +1,83 @@
+"""
+按 token 预算生成 diff 摘要（ai.diff_summary）测试
+"""
+
+import random
+
+import pytest
+
+from smart_svn_commit.ai.diff_summary import (
+    OMITTED_MARK,
+    allocate_budget,
+    estimate_tokens,
+    summarize_diffs,
+)
+
+
+def make_diff(path: str, hunks: int, rng: random.Random) -> str:
+    lines = [f"Index: {path}", "=" * 67, f"--- {path}\t(revision 1)", f"+++ {path}\t(working copy)"]
+    for h in range(hunks):
+        lines.append(f"@@ -{h * 30 + 1},7 +{h * 30 + 1},8 @@")
+        for _ in range(20):
+            prefix = rng.choice("   +-")
+            lines.append(prefix + "x" * rng.randint(0, 80) + rng.choice(["", "中文"]))
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("file_count", [1, 5, 40, 300])
+@pytest.mark.parametrize("max_tokens", [60, 300, 3000])
+def test_summary_stays_within_budget(file_count, max_tokens):
+    rng = random.Random(file_count * 1000 + max_tokens)
+    files = [
+        {
+            "path": f"dir{i % 7}/file{i}.{rng.choice(['py', 'cs', 'meta'])}",
+            "diff": make_diff(f"file{i}", rng.randint(1, 10), rng),
+        }
+        for i in range(file_count)
+    ]
+
+    summary = summarize_diffs(files, max_tokens)
+
+    assert summary
+    assert estimate_tokens(summary) <= max_tokens
+
+
+def test_small_diff_kept_whole():
+    diff = "Index: a.py\n" + "=" * 67 + "\n--- a.py\n+++ a.py\n@@ -1,2 +1,2 @@\n ctx\n-old\n+new"
+
+    summary = summarize_diffs([{"path": "a.py", "diff": diff}, {"path": "b.py", "diff": ""}])
+
+    assert summary == "文件: a.py (+1 -1)\n变更内容:\n@@ -1,2 +1,2 @@\n ctx\n-old\n+new"
+
+
+def test_large_diff_keeps_changes_before_context():
+    body = "\n".join([" context"] * 200 + ["+added line"] + [" context"] * 200)
+    diff = "@@ -1,400 +1,401 @@\n" + body
+
+    summary = summarize_diffs([{"path": "big.py", "diff": diff}], 120)
+
+    assert "+added line" in summary
+    assert OMITTED_MARK in summary
+    assert estimate_tokens(summary) <= 120
+
+
+def test_files_without_budget_listed_as_stats():
+    rng = random.Random(1)
+    files = [{"path": f"f{i}.py", "diff": make_diff(f"f{i}.py", 5, rng)} for i in range(200)]
+    files.append({"path": "img.png", "diff": "Cannot display: file marked as a binary type."})
+
+    summary = summarize_diffs(files, 200)
+
+    assert "其他文件（仅统计）:" in summary
+    assert "另有" in summary
+    assert estimate_tokens(summary) <= 200
+
+
+def test_allocate_budget():
+    # 需求小于公平份额的文件获得全部需求，剩余预算按权重分给其他文件
+    allocations = allocate_budget([10, 1000, 1000], [1.0, 1.0, 0.25], 510)
+
+    assert allocations[0] == 10
+    assert allocations[1] == 400
+    assert allocations[2] == 100
+    assert sum(allocations) <= 510
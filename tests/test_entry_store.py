@@ -0,0 +1,110 @@
+"""
+文件条目存储（core.entry_store）测试
+"""
+
+from smart_svn_commit.core import wc_db
+from smart_svn_commit.core.entry_store import (
+    FileEntryStore,
+    compute_status_delta,
+    sort_entries,
+)
+
+
+def test_append_and_lookup():
+    store = FileEntryStore([("M", "src/Main.CS"), ("?", "README")])
+    index = store.append("A", "lib/util.py")
+
+    assert len(store) == 3
+    assert index == 2
+    assert store.index_of("README") == 1
+    assert store.index_of("missing") is None
+    assert store.item(0) == ("M", "src/Main.CS")
+    assert store.search_keys[0] == "src/main.cs"
+    assert store.ext_keys == ["cs", "~", "py"]
+
+
+def test_remove_keeps_indices_stable():
+    store = FileEntryStore([("M", "a"), ("M", "b"), ("M", "c")])
+    store.remove(1)
+
+    assert store.is_removed(1)
+    assert store.index_of("b") is None
+    assert store.live_indices() == [0, 2]
+    assert store.live_count() == 2
+    assert store.items() == [("M", "a"), ("M", "c")]
+    assert store.append("A", "d") == 3
+
+
+def test_set_status():
+    store = FileEntryStore([("M", "a")])
+    store.set_status(0, "C")
+    assert store.items() == [("C", "a")]
+
+
+def test_sort_entries_by_fields():
+    store = FileEntryStore(
+        [("M", "b/File10.txt"), ("A", "b/File2.txt"), ("M", "a/file1.cs"), ("A", "Makefile")]
+    )
+    entries = store.live_indices()
+
+    sort_entries(store, entries, "natural")
+    assert [store.paths[i] for i in entries] == [
+        "a/file1.cs",
+        "b/File2.txt",
+        "b/File10.txt",
+        "Makefile",
+    ]
+
+    sort_entries(store, entries, ("status", "ext"))
+    assert entries == [1, 3, 2, 0]
+
+    sort_entries(store, entries, "default")
+    assert entries == [0, 1, 2, 3]
+
+
+def test_compute_status_delta_within_scope():
+    store = FileEntryStore([("M", "a/x.txt"), ("M", "a/y.txt"), ("?", "b/z.txt")])
+
+    delta = compute_status_delta(store, [("C", "a/x.txt"), ("A", "a/new.txt")], scope=["a/"])
+
+    assert delta.changed == [(0, "C")]
+    assert delta.added == [("A", "a/new.txt")]
+    # b/z.txt 不在重新查询的范围内，不应视为已移除
+    assert delta.removed == [1]
+
+
+def test_dir_flag_from_disk_and_wc_db(tmp_path, monkeypatch):
+    """磁盘上的目录按 stat 判断，缺失和已删除的目录按 wc.db 记录的类型判断"""
+    (tmp_path / "newdir").mkdir()
+    (tmp_path / "added").mkdir()
+    (tmp_path / "file.txt").write_text("x", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    queried = []
+
+    def fake_read_node_kinds(wc_path, paths):
+        queried.extend(paths)
+        return {"gone": "dir", "deleted": "dir", "gone.txt": "file"}
+
+    monkeypatch.setattr(wc_db, "read_node_kinds", fake_read_node_kinds)
+    store = FileEntryStore(
+        [
+            ("?", "newdir"),
+            ("A", "added"),
+            ("?", "file.txt"),
+            ("!", "gone"),
+            ("D", "deleted"),
+            ("!", "gone.txt"),
+            ("M", "modified.txt"),
+        ]
+    )
+
+    assert [store.is_dir(i) for i in range(len(store))] == [
+        True,
+        True,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert queried == ["gone", "deleted", "gone.txt"]
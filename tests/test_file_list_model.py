@@ -0,0 +1,103 @@
+"""
+文件列表模型（ui.file_list_model）测试
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from smart_svn_commit.core.entry_store import FileEntryStore  # noqa: E402
+from smart_svn_commit.ui import file_list_model  # noqa: E402
+from smart_svn_commit.ui.constants import CHECKBOX_COLUMN, PATH_COLUMN  # noqa: E402
+from smart_svn_commit.ui.file_list_model import FileListModel  # noqa: E402
+from smart_svn_commit.ui.icon_cache import DIR_KEY, IconCache  # noqa: E402
+
+
+class RecordingIconCache:
+    """记录请求的图标缓存"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, file_path, is_dir=None):
+        self.requests.append((file_path, is_dir))
+        return None
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def make_model(paths):
+    model = FileListModel(RecordingIconCache())
+    model.set_store(FileEntryStore([("M", path) for path in paths]))
+    model.set_rows(list(range(len(paths))))
+    return model
+
+
+def test_data_reads_from_store(app):
+    model = make_model(["a.txt", "b.txt"])
+    model.store.set_status(1, "_M")
+
+    assert model.rowCount() == 2
+    assert model.data(model.index(1, PATH_COLUMN)) == "[_M] b.txt"
+    assert model.data(model.index(0, CHECKBOX_COLUMN), Qt.CheckStateRole) == Qt.Unchecked
+    model.data(model.index(0, PATH_COLUMN), Qt.DecorationRole)
+    assert model._icon_cache.requests == [("a.txt", False)]
+
+
+def test_check_state_kept_for_hidden_rows(app):
+    model = make_model(["a.txt", "b.txt", "c.txt"])
+    changes = []
+    model.checkStateChanged.connect(lambda row, state: changes.append((row, state)))
+
+    assert model.setData(model.index(2, CHECKBOX_COLUMN), Qt.Checked, Qt.CheckStateRole)
+    assert changes == [(2, Qt.Checked)]
+
+    model.set_rows([0, 1])
+    assert model.checked_entries() == []
+    model.set_rows([2, 1, 0])
+    assert model.checked_entries() == [2]
+
+    model.toggle_checked([0, 2])
+    assert model.checked_entries() == [0]
+
+
+def test_append_and_remove_rows(app, monkeypatch):
+    model = make_model(["a", "b", "c", "d"])
+    model.store.append("A", "e")
+    model.ensure_capacity()
+    model.append_rows([4])
+    model.set_checked([4], True)
+
+    model.remove_entries({1, 3})
+    assert model.rows == [0, 2, 4]
+    assert model.checked_entries() == [4]
+
+    # 超过逐行移除的上限时改为重置模型，结果相同
+    monkeypatch.setattr(file_list_model, "_MAX_ROW_REMOVALS", 1)
+    model.remove_entries({0, 4})
+    assert model.rows == [2]
+
+
+def test_directory_entry_gets_folder_icon(app, tmp_path, monkeypatch):
+    """svn status 输出的目录路径没有末尾分隔符，仍按磁盘上的类型显示目录图标"""
+    (tmp_path / "NewFolder").mkdir()
+    (tmp_path / "file.txt").write_text("x", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    icon_cache = IconCache()
+    model = FileListModel(icon_cache)
+    model.set_store(FileEntryStore([("?", "NewFolder"), ("A", "file.txt")]))
+    model.set_rows([0, 1])
+
+    folder_icon = model.data(model.index(0, PATH_COLUMN), Qt.DecorationRole)
+    model.data(model.index(1, PATH_COLUMN), Qt.DecorationRole)
+
+    assert folder_icon is icon_cache._cache[DIR_KEY]
+    assert list(icon_cache._cache) == [DIR_KEY, "ext:.txt"]
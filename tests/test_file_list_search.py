@@ -0,0 +1,62 @@
+"""
+文件列表搜索（ui.file_list_widget）测试：后台搜索使用派发时的快照
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from smart_svn_commit.core.entry_store import FileEntryStore  # noqa: E402
+from smart_svn_commit.ui.file_list_widget import FileListWidget, run_search  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def make_widget(paths):
+    widget = FileListWidget()
+    store = FileEntryStore([("M", path) for path in paths])
+    widget.set_store(store)
+    widget.add_entries(range(len(store)), set())
+    return widget, store
+
+
+def test_snapshot_is_isolated_from_store_replacement(app):
+    """派发后替换条目存储，快照仍按原存储和原引擎计算，新搜索不受其状态影响"""
+    widget, old_store = make_widget(["a/File1.cs", "a/File2.cs", "b/Other.cs"])
+    snapshot = widget.prepare_search("File")
+
+    widget.set_store(FileEntryStore([("A", "c/File9.cs")]))
+    widget.add_entries(range(1), set())
+    result = run_search(snapshot)
+
+    assert result.store is old_store
+    assert result.indices == [0, 1]
+    assert snapshot.engine is not widget.prepare_search("File").engine
+    assert not widget.apply_search_result(result)
+
+    widget.set_search_text("File")
+    assert widget.apply_search_result(run_search(widget.prepare_search("File")))
+    assert widget.count() == 1
+
+
+def test_snapshot_size_excludes_later_entries(app):
+    """快照只处理派发时已有的条目，之后追加的条目保持 add_entries 时的可见性"""
+    widget, store = make_widget(["a/File1.cs", "b/Other.cs"])
+    widget.set_search_text("File")
+    snapshot = widget.prepare_search("File")
+
+    new_indices = store.extend([("A", "c/File3.cs")])
+    widget.add_entries(new_indices, set())
+    result = run_search(snapshot)
+
+    assert result.size == 2
+    assert result.indices == [0]
+    assert widget.apply_search_result(result)
+    assert widget.get_checked_items() == []
+    assert widget.count() == 2
@@ -0,0 +1,99 @@
+"""
+文件过滤工具（utils.filters）测试
+"""
+
+import itertools
+from pathlib import Path
+
+from smart_svn_commit.utils.filters import IgnoreMatcher, apply_ignore_patterns
+
+IGNORE_PATTERNS = [
+    "Library/",
+    "Assets/Plugins/",
+    "*.meta",
+    "*.tar.gz",
+    "*.cs*",
+    "*.[ch]",
+    "Temp*",
+    "*Test?.cs",
+    "Assets/*/Editor/*.cs",
+    "Build/**/*.dll",
+    "[Tt]humbs.db",
+    "obj",
+    "/abs/*.txt",
+]
+
+PATHS = [
+    "Library/cache.bin",
+    "Library",
+    "MyLibrary/a.txt",
+    "Assets/Plugins/x.dll",
+    "Assets/PluginsExtra/x.dll",
+    "Assets/Scripts/Main.cs",
+    "Assets/Scripts/Main.cs.meta",
+    "Assets/Scripts/Main.csx",
+    "Assets/Scripts/Main.cs*",
+    "src/util.c",
+    "src/util.[ch]",
+    "backup.tar.gz",
+    "notes.gz",
+    "TempFile.txt",
+    "dir/TempFile.txt",
+    "dir/MyTest1.cs",
+    "dir/MyTest12.cs",
+    "Assets/Game/Editor/Tool.cs",
+    "Assets/Game/Sub/Editor/Tool.cs",
+    "Build/x/y/lib.dll",
+    "Build/lib.dll",
+    "Thumbs.db",
+    "docs/thumbs.db",
+    "project/obj/out.o",
+    "/abs/readme.txt",
+    "README",
+    ".gitignore",
+]
+
+
+def reference_should_ignore(file_path, ignore_patterns):
+    """改为预编译之前的逐文件逐模式匹配"""
+    for pattern in ignore_patterns:
+        if pattern.endswith("/"):
+            if file_path.startswith(pattern):
+                return True
+        elif pattern.startswith("*."):
+            if file_path.endswith(pattern[1:]):
+                return True
+        elif "*" in pattern or "?" in pattern:
+            try:
+                if Path(file_path).match(pattern):
+                    return True
+            except (ValueError, RuntimeError):
+                pass
+        else:
+            if pattern in file_path:
+                return True
+    return False
+
+
+def test_matcher_equals_reference_loop():
+    # 每个模式单独以及两两组合，结果都与逐条匹配一致
+    pattern_sets = [[p] for p in IGNORE_PATTERNS]
+    pattern_sets += [list(pair) for pair in itertools.combinations(IGNORE_PATTERNS, 2)]
+    pattern_sets.append(IGNORE_PATTERNS)
+
+    for patterns in pattern_sets:
+        matcher = IgnoreMatcher(patterns)
+        for path in PATHS:
+            assert matcher.matches(path) == reference_should_ignore(path, patterns), (
+                patterns,
+                path,
+            )
+
+
+def test_filter_equals_reference_loop():
+    files = [("M", path) for path in PATHS]
+    expected = [item for item in files if not reference_should_ignore(item[1], IGNORE_PATTERNS)]
+
+    assert IgnoreMatcher(IGNORE_PATTERNS).filter(files) == expected
+    assert apply_ignore_patterns(files, IGNORE_PATTERNS) == expected
+    assert apply_ignore_patterns(files, []) == files
@@ -0,0 +1,70 @@
+"""
+模糊搜索（utils.fuzzy）测试
+"""
+
+import random
+
+from smart_svn_commit.core.entry_store import FileEntryStore
+from smart_svn_commit.utils import fuzzy
+from smart_svn_commit.utils.fuzzy import FuzzyMatcher, fuzzy_filter
+
+
+def is_subsequence(term: str, key: str) -> bool:
+    it = iter(key)
+    return all(c in it for c in term)
+
+
+def brute_force(store: FileEntryStore, query: str):
+    terms = query.lower().split()
+    return {
+        i
+        for i in store.live_indices()
+        if all(is_subsequence(term, store.search_keys[i]) for term in terms)
+    }
+
+
+def make_store(count: int) -> FileEntryStore:
+    rng = random.Random(7)
+    words = ["Assets", "Scripts", "PlayerController", "enemy_ai", "Main", "ui-kit", "Data"]
+    paths = ["/".join(rng.sample(words, 2)) + f"/{rng.choice(words)}{i}.cs" for i in range(count)]
+    return FileEntryStore([("M", path) for path in paths])
+
+
+def test_search_matches_brute_force_across_batches(monkeypatch):
+    monkeypatch.setattr(fuzzy, "BATCH_SIZE", 64)
+    store = make_store(500)
+    matcher = FuzzyMatcher()
+
+    for query in ["pc", "scr main", "enemyai", "dt1", "xyz", "assets/ui"]:
+        assert set(matcher.search(query, store)) == brute_force(store, query), query
+
+
+def test_refined_query_equals_fresh_search():
+    store = make_store(300)
+    matcher = FuzzyMatcher()
+    matcher.search("pla", store)
+    store.append("A", "New/PlayerCtl.cs")
+    store.remove(3)
+
+    refined = matcher.search("plac", store)
+
+    assert refined == FuzzyMatcher().search("plac", store)
+    assert 300 in refined
+    assert 3 not in refined
+
+
+def test_ranking_prefers_boundaries_and_basename():
+    store = FileEntryStore(
+        [
+            ("M", "src/components/Layout.cs"),
+            ("M", "lib/CustomLayout.cs"),
+            ("M", "Controllers/Other.cs"),
+            ("M", "src/col/list.cs"),
+        ]
+    )
+
+    result = fuzzy_filter("cl", store, range(len(store)))
+
+    assert result[0] == 1
+    assert set(result) == {0, 1, 2, 3}
+    assert fuzzy_filter("", store, [2, 0]) == [2, 0]
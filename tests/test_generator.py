@@ -0,0 +1,135 @@
+"""
+AI 提交消息生成器（ai.generator）测试
+
+用假的客户端代替 OpenAI SDK 的网络请求。
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from smart_svn_commit.ai import generator, response_cache
+from smart_svn_commit.ai.generator import (
+    DEFAULT_MESSAGE,
+    SOURCE_AI,
+    SOURCE_CACHE,
+    _call_openai_api,
+    request_completion,
+)
+
+
+class FakeClient:
+    """按顺序返回预设回复的客户端，回复为异常时抛出"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        message = SimpleNamespace(content=reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def use_client(monkeypatch, tmp_path):
+    """使用假的客户端，响应缓存写入临时目录"""
+    monkeypatch.setattr(response_cache, "get_cache_dir", lambda: tmp_path)
+
+    def use(*replies):
+        client = FakeClient(*replies)
+        monkeypatch.setattr(generator, "get_openai_client", lambda *args: client)
+        return client
+
+    return use
+
+
+def make_config(cache_enabled=True):
+    return {
+        "aiApi": {"enabled": True, "baseUrl": "http://localhost", "apiKey": "key"},
+        "responseCache": {"enabled": cache_enabled},
+    }
+
+
+@pytest.mark.parametrize(
+    "reply", [ConnectionError("refused"), RuntimeError("404 Not Found"), None, "  ", '""']
+)
+def test_call_api_returns_none_on_failure(use_client, reply):
+    """调用失败或返回内容为空时返回 None，而不是默认消息"""
+    use_client(reply)
+
+    assert _call_openai_api("http://localhost", "key", "m", "sys", "user") is None
+
+
+def test_failure_is_not_cached(use_client):
+    """调用失败时 request_completion 返回 None 且不写入缓存，下次仍会调用 API"""
+    client = use_client(ConnectionError("refused"), "feat: 新功能")
+    config = make_config()
+
+    assert request_completion(config, "sys", "user") is None
+    assert request_completion(config, "sys", "user") == {
+        "message": "feat: 新功能",
+        "source": SOURCE_AI,
+    }
+    assert client.calls == 2
+
+
+def test_reply_equal_to_default_message_is_kept(use_client):
+    """模型恰好返回与默认消息相同的文本时，仍视为成功并写入缓存"""
+    client = use_client(DEFAULT_MESSAGE)
+    config = make_config()
+
+    assert request_completion(config, "sys", "user") == {
+        "message": DEFAULT_MESSAGE,
+        "source": SOURCE_AI,
+    }
+    assert request_completion(config, "sys", "user") == {
+        "message": DEFAULT_MESSAGE,
+        "source": SOURCE_CACHE,
+    }
+    assert client.calls == 1
+
+
+def test_generate_falls_back_to_default_message(use_client):
+    """对外的 generate_commit_message_with_ai 在失败时仍返回默认消息"""
+    use_client(ConnectionError("refused"))
+    files = [{"path": "a.txt", "diff": "@@ -1 +1 @@\n-a\n+b\n"}]
+
+    message = generator.generate_commit_message_with_ai(files, make_config(cache_enabled=False))
+
+    assert message == DEFAULT_MESSAGE
+
+
+@pytest.fixture
+def registry():
+    """测试前后清空客户端注册表"""
+    pytest.importorskip("openai")
+    generator.close_openai_clients()
+    yield generator._clients
+    generator.close_openai_clients()
+
+
+def test_client_reused_for_same_settings(registry):
+    """同一组连接参数复用同一个客户端，参数不同时创建新的客户端"""
+    config = {"timeout": 10, "maxConnections": 4}
+    client = generator.get_openai_client("http://localhost", "key", config)
+
+    assert generator.get_openai_client("http://localhost", "key", dict(config)) is client
+    assert generator.get_openai_client("http://localhost", "other", config) is not client
+    assert generator.get_openai_client("http://localhost", "key", {"timeout": 5}) is not client
+    assert len(registry) == 3
+
+
+def test_close_clients_clears_registry(registry):
+    """关闭后注册表清空，已有客户端被关闭，再次获取时创建新的客户端"""
+    client = generator.get_openai_client("http://localhost", "key", {})
+
+    generator.close_openai_clients()
+
+    assert registry == {}
+    assert client.is_closed()
+    assert generator.get_openai_client("http://localhost", "key", {}) is not client
@@ -0,0 +1,95 @@
+"""
+大变更集分组概括（ai.map_reduce）测试
+"""
+
+import pytest
+
+from smart_svn_commit.ai import map_reduce
+from smart_svn_commit.ai.generator import DEFAULT_MESSAGE, SOURCE_AI
+from smart_svn_commit.ai.map_reduce import group_files, should_map_reduce, summarize_groups
+
+
+def make_diff(lines: int) -> str:
+    body = "".join(f"+line {i}\n" for i in range(lines))
+    return f"@@ -0,0 +1,{lines} @@\n{body}"
+
+
+def make_files(count: int, dirs: int = 4, lines: int = 20):
+    return [
+        {"path": f"dir{i % dirs}/file{i:03d}.txt", "diff": make_diff(lines)} for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("max_groups", [1, 2, 3, 8])
+@pytest.mark.parametrize("count", [1, 10, 60, 300])
+def test_group_files_respects_max_groups(count, max_groups):
+    """组数不超过 max_groups，所有有 diff 的文件各出现一次且组内按路径排序"""
+    files = make_files(count) + [{"path": "empty.txt", "diff": ""}]
+
+    groups = group_files(files, group_max_tokens=50, max_groups=max_groups)
+
+    assert 1 <= len(groups) <= max_groups
+    paths = [file.path for group in groups for _, file in group]
+    assert paths == sorted(f["path"] for f in files if f["diff"])
+
+
+def test_group_files_with_oversized_file():
+    """单个超大文件不会使组数超过上限"""
+    files = make_files(20, lines=2)
+    files.insert(0, {"path": "big/huge.txt", "diff": make_diff(5000)})
+
+    groups = group_files(files, group_max_tokens=50, max_groups=3)
+
+    assert len(groups) <= 3
+    assert sum(len(group) for group in groups) == 21
+
+
+def test_group_files_keeps_directories_together():
+    """目标大小能容纳整个目录时，同一目录的文件在同一组"""
+    groups = group_files(make_files(40, dirs=4, lines=5), group_max_tokens=10**6, max_groups=8)
+    small = group_files(make_files(40, dirs=4, lines=5), group_max_tokens=400, max_groups=8)
+
+    assert len(groups) == 1
+    for group in small:
+        dirs = {map_reduce._parent_dir(file.path) for _, file in group}
+        assert len(dirs) == 1
+
+
+def test_should_map_reduce():
+    """文件数达到 minFiles 且 diff 总量超出预算时才分组概括"""
+    files = make_files(60)
+    api_config = {"maxDiffTokens": 500, "mapReduce": {"minFiles": 50}}
+
+    assert should_map_reduce(files, api_config)
+    assert not should_map_reduce(files[:49], api_config)
+    assert not should_map_reduce(files, {**api_config, "maxDiffTokens": 10**7})
+    assert not should_map_reduce(files, {**api_config, "mapReduce": {"enabled": False}})
+
+
+def test_summarize_groups_handles_failed_group(monkeypatch):
+    """失败的组只保留统计，回复与默认消息相同的组照常使用"""
+    replies = {"dir0/": None, "dir1/": DEFAULT_MESSAGE}
+
+    def fake_request_completion(config, system_prompt, user_prompt):
+        group = user_prompt.split(" ", 2)[1]
+        message = replies.get(group, f"{group} 的概括")
+        return None if message is None else {"message": message, "source": SOURCE_AI}
+
+    monkeypatch.setattr(map_reduce, "request_completion", fake_request_completion)
+    config = {"aiApi": {"mapReduce": {"groupMaxTokens": 400, "maxGroups": 4}}}
+
+    summary = summarize_groups(make_files(40, dirs=4, lines=5), config)
+
+    lines = summary.splitlines()
+    assert lines[0].startswith("共 40 个文件")
+    assert lines[1] == "- dir0/（10 个文件，+50 -0）"
+    assert lines[2] == f"- dir1/（10 个文件，+50 -0）：{DEFAULT_MESSAGE}"
+    assert lines[3] == "- dir2/（10 个文件，+50 -0）：dir2/ 的概括"
+
+
+def test_summarize_groups_all_failed(monkeypatch):
+    """全部组失败时返回 None"""
+    monkeypatch.setattr(map_reduce, "request_completion", lambda *args: None)
+    config = {"aiApi": {"mapReduce": {"groupMaxTokens": 300}}}
+
+    assert summarize_groups(make_files(40), config) is None
@@ -0,0 +1,73 @@
+"""
+三元组索引（utils.ngram_index）测试
+"""
+
+import random
+
+from smart_svn_commit.core.entry_store import FileEntryStore
+from smart_svn_commit.utils.ngram_index import TrigramIndex, indexed_candidates, literal_segments
+
+WORDS = ["Assets", "Scripts", "Editor", "Player", "Enemy", "UI", "Main", "Test", "data"]
+EXTS = [".cs", ".meta", ".png", ".json", ""]
+
+
+def make_store(count: int, seed: int = 1) -> FileEntryStore:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        parts = rng.sample(WORDS, rng.randint(1, 3))
+        paths.append("/".join(parts) + f"/{rng.choice(WORDS)}{i}{rng.choice(EXTS)}")
+    return FileEntryStore([("M", path) for path in paths])
+
+
+def expected_matches(store: FileEntryStore, search_text: str):
+    segments = literal_segments(search_text.lower())
+    return [
+        i for i, key in enumerate(store.search_keys) if all(segment in key for segment in segments)
+    ]
+
+
+def test_candidates_cover_all_matches():
+    store = make_store(3000)
+    index = TrigramIndex.build(store.search_keys)
+
+    # 常见片段（enemy、te?t）命中过多条目时不使用索引，返回 None
+    assert index.candidates("enemy") is None
+    for search_text in ["Player12", "scripts/main", "edi*.cs", "data1*meta"]:
+        candidates = index.candidates(search_text)
+        assert candidates is not None
+        assert candidates == sorted(candidates)
+        assert set(expected_matches(store, search_text)) <= set(candidates), search_text
+
+    assert index.candidates("zzz") == []
+    assert index.candidates("ab") is None
+
+
+def test_extend_matches_full_build():
+    store = make_store(2000, seed=2)
+    keys = store.search_keys
+    incremental = TrigramIndex.build(keys[:700])
+    incremental.extend(keys)
+    full = TrigramIndex.build(keys)
+
+    assert incremental.size == full.size == len(keys)
+    for search_text in ["player", "main1", "json"]:
+        assert incremental.candidates(search_text) == full.candidates(search_text)
+
+
+def test_build_cancelled():
+    store = make_store(10)
+    assert TrigramIndex.build(store.search_keys, lambda: True) is None
+
+
+def test_indexed_candidates_include_appended_entries():
+    store = make_store(1000, seed=3)
+    index = TrigramIndex.build(store.search_keys)
+    store.append("A", "New/UniqueName.cs")
+    store.append("A", "New/Other.cs")
+
+    candidates = indexed_candidates(index, "uniquename", store)
+
+    assert candidates == [1000, 1001]
+    assert indexed_candidates(index, "uniquename", store, size=1000) == []
+    assert indexed_candidates(None, "uniquename", store) is None
@@ -0,0 +1,73 @@
+"""
+svn status --xml 流式解析测试（不依赖 svn 命令行）
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+from conftest import sorted_status
+
+from smart_svn_commit.core.parser import iter_svn_status_xml
+
+STATUS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<status>
+<target path=".">
+<entry path="a.txt"><wc-status item="modified" revision="3" props="none">
+<commit revision="2"><author>alice</author></commit></wc-status></entry>
+<entry path="b.txt"><wc-status item="normal" revision="3" props="modified"></wc-status></entry>
+<entry path="c.txt"><wc-status item="normal" revision="3" props="none"></wc-status></entry>
+</target>
+<changelist name="cl">
+<entry path="d.txt"><wc-status item="added" revision="-1" props="none"></wc-status></entry>
+<entry path="e.txt"><wc-status item="normal" revision="3" props="none"
+ tree-conflicted="true"></wc-status></entry>
+</changelist>
+</status>
+"""
+
+
+class ChunkedSource:
+    """每次只返回少量字节的输入流，模拟管道分块到达"""
+
+    def __init__(self, data: bytes, size: int) -> None:
+        self._stream = io.BytesIO(data)
+        self._size = size
+
+    def read(self, _size: int = -1) -> bytes:
+        return self._stream.read(self._size)
+
+
+def test_iter_status_xml_includes_changelist_entries():
+    entries = list(iter_svn_status_xml(io.BytesIO(STATUS_XML)))
+    assert sorted_status((e["status"], e["path"]) for e in entries) == [
+        ("M", "a.txt"),
+        ("_M", "b.txt"),
+        ("A", "d.txt"),
+        ("C", "e.txt"),
+    ]
+    assert entries[0]["author"] == "alice"
+    assert entries[-1]["treeConflict"] is True
+
+
+def test_iter_status_xml_clears_parsed_entries(monkeypatch):
+    # 大量 changelist 条目分块到达时，已产出的 entry 应从 <changelist> 中移除
+    body = b"".join(
+        b'<entry path="f%d"><wc-status item="modified" props="none"></wc-status></entry>' % i
+        for i in range(500)
+    )
+    data = b'<status><changelist name="cl">%s</changelist></status>' % body
+    changelists = []
+
+    class RecordingParser(ET.XMLPullParser):
+        def read_events(self):
+            for event, elem in super().read_events():
+                if event == "start" and elem.tag == "changelist":
+                    changelists.append(elem)
+                yield event, elem
+
+    monkeypatch.setattr(ET, "XMLPullParser", RecordingParser)
+    paths = []
+    for entry in iter_svn_status_xml(ChunkedSource(data, 97)):
+        paths.append(entry["path"])
+        assert len(changelists[0]) <= 1
+    assert paths == [f"f{i}" for i in range(500)]
@@ -0,0 +1,83 @@
+"""
+AI 响应缓存（ai.response_cache）测试
+"""
+
+import pytest
+
+from smart_svn_commit.ai import response_cache
+from smart_svn_commit.ai.response_cache import ResponseCache, make_cache_key
+
+
+class FakeClock:
+    """可手动推进的 time.time"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache.time, "time", fake)
+    return fake
+
+
+def test_cache_key_covers_model_and_prompts():
+    """模型或任一提示词不同时缓存键不同"""
+    key = make_cache_key("m", "sys", "user")
+
+    others = [
+        make_cache_key("m2", "sys", "user"),
+        make_cache_key("m", "sys2", "user"),
+        make_cache_key("m", "sys", "user2"),
+    ]
+
+    assert key == make_cache_key("m", "sys", "user")
+    assert len({key, *others}) == 4
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    """超过有效期的条目不再返回，并在下次保存时删除"""
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl_hours=1)
+    assert cache.save("old", "fix: 旧消息")
+
+    clock.now += 3599
+    assert cache.load("old") == "fix: 旧消息"
+
+    clock.now += 2
+    assert cache.load("old") is None
+    cache.save("new", "feat: 新消息")
+    # 回拨时钟后旧条目仍未命中，说明保存时已被删除
+    clock.now -= 3601
+    assert cache.load("old") is None
+    assert cache.load("new") == "feat: 新消息"
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    """条目数量超过上限时淘汰最久未使用的条目（读取也会刷新使用时间）"""
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.save("a", "A")
+    clock.now += 1
+    cache.save("b", "B")
+    clock.now += 1
+    assert cache.load("a") == "A"
+    clock.now += 1
+    cache.save("c", "C")
+
+    assert cache.load("a") == "A"
+    assert cache.load("b") is None
+    assert cache.load("c") == "C"
+
+
+def test_unreadable_db_is_a_miss(tmp_path, capsys):
+    """数据库无法打开时视为未命中，保存返回 False"""
+    db_path = tmp_path / "cache.sqlite"
+    db_path.mkdir()
+    cache = ResponseCache(db_path)
+
+    assert cache.load("key") is None
+    assert cache.save("key", "message") is False
+    assert "AI 响应缓存" in capsys.readouterr().err
@@ -0,0 +1,123 @@
+"""
+svn status 查询计划（core.status_plan）测试
+"""
+
+import fnmatch
+import os
+import shutil
+
+from conftest import requires_svn, sorted_status, svn, write_file
+
+from smart_svn_commit.core import status_plan
+from smart_svn_commit.core.commit import iter_svn_status
+from smart_svn_commit.core.status_plan import (
+    GLOBAL_IGNORES_OPTION,
+    build_global_ignores_options,
+    plan_status_targets,
+)
+from smart_svn_commit.utils.filters import IgnoreMatcher, apply_ignore_patterns
+
+IGNORE_PATTERNS = ["Library/", "*.tmp"]
+
+
+@requires_svn
+def test_plan_keeps_children_of_deleted_and_missing_dirs(make_wc, monkeypatch):
+    """排除 Library/ 时，已删除和缺失目录下的 D/! 条目与完整的 svn status 一致"""
+    wc = make_wc(
+        "plan",
+        {
+            "Assets/keep.txt": "keep\n",
+            "Old/a.txt": "a\n",
+            "Old/sub/b.txt": "b\n",
+            "Gone/c.txt": "c\n",
+        },
+    )
+    write_file(wc / "Library" / "cache" / "big.bin", "unversioned\n")
+    write_file(wc / "Assets" / "keep.txt", "keep changed\n")
+    write_file(wc / "Assets" / "scratch.tmp", "ignored\n")
+    svn("delete", "Old", cwd=wc)
+    shutil.rmtree(wc / "Gone")
+
+    monkeypatch.chdir(wc)
+    plan = plan_status_targets(IGNORE_PATTERNS)
+    assert plan is not None
+    assert plan.excluded == ["Library"]
+
+    expected = sorted_status(apply_ignore_patterns(list(iter_svn_status()), IGNORE_PATTERNS))
+    actual = sorted_status(
+        apply_ignore_patterns(
+            list(iter_svn_status(ignore_patterns=IGNORE_PATTERNS)), IGNORE_PATTERNS
+        )
+    )
+
+    assert actual == expected
+    assert ("D", os.path.join("Old", "sub", "b.txt")) in actual
+    assert ("!", os.path.join("Gone", "c.txt")) in actual
+    assert not any(path.startswith("Library" + os.sep) for _, path in actual)
+
+
+def test_plan_records_excluded_dirs(tmp_path):
+    """只有实际存在的被排除目录及其上级目录进入计划"""
+    write_file(tmp_path / "Library" / "a.bin", "1")
+    write_file(tmp_path / "Assets" / "Generated" / "b.cs", "1")
+    write_file(tmp_path / "Assets" / "Scripts" / "c.cs", "1")
+    write_file(tmp_path / "Packages" / "d.json", "1")
+
+    plan = plan_status_targets(["Library/", "Temp/", "Assets/Generated/"], str(tmp_path))
+
+    assert plan is not None
+    assert plan.immediates == [".", "Assets"]
+    assert plan.recursive == [os.path.join("Assets", "Scripts"), "Packages"]
+    assert plan.excluded == [os.path.join("Assets", "Generated"), "Library"]
+    assert plan_status_targets(["Temp/"], str(tmp_path)) is None
+
+
+def test_global_ignores_skip_wildcard_suffix_patterns(monkeypatch):
+    """后缀含通配符的 *.xxx 模式在 Python 侧按字面后缀匹配，不下推到 global-ignores"""
+    monkeypatch.setattr(status_plan, "read_global_ignores", lambda: ["*.o"])
+    patterns = [
+        "*.meta",
+        "*.tar.gz",
+        "*.cs*",
+        "*.[ch]",
+        "*.t?t",
+        "Test*.cs",
+        "Thumbs.db",
+        "[Tt]humbs.db",
+        "Library/",
+        "a b",
+    ]
+
+    options = build_global_ignores_options(patterns)
+
+    assert options == [
+        "--config-option",
+        f"{GLOBAL_IGNORES_OPTION}=*.o *.meta *.tar.gz Test*.cs Thumbs.db",
+    ]
+    assert build_global_ignores_options(["*.cs*", "*.[ch]"]) == []
+
+
+def test_global_ignores_hide_subset_of_python_filter(monkeypatch):
+    """svn 按 global-ignores 隐藏的文件名，Python 侧的完整过滤也一定会忽略"""
+    monkeypatch.setattr(status_plan, "read_global_ignores", lambda: [])
+    patterns = ["*.meta", "*.cs*", "*.[ch]", "*.tar.gz", "Test*.cs", "Thumbs.db", "obj"]
+    names = [
+        "a.meta",
+        "a.cs",
+        "a.csx",
+        "a.cs*",
+        "a.c",
+        "a.h",
+        "a.[ch]",
+        "b.tar.gz",
+        "TestA.cs",
+        "Thumbs.db",
+        "obj",
+        "a.txt",
+    ]
+
+    pushed = build_global_ignores_options(patterns)[1].split("=", 1)[1].split()
+    matcher = IgnoreMatcher(patterns)
+    for name in names:
+        if any(fnmatch.fnmatchcase(name, p) for p in pushed):
+            assert matcher.matches(name), name
@@ -0,0 +1,72 @@
+"""
+工作目录监视（core.watcher）轮询模式测试
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import write_file
+
+from smart_svn_commit.core import watcher as watcher_module
+from smart_svn_commit.core.watcher import WorkingCopyWatcher
+
+POLL_INTERVAL = 0.05
+
+
+def wait_changes(watcher: WorkingCopyWatcher, timeout: float = 2.0):
+    """等待监视器取出变化，超时返回 None"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        changes = watcher.take_changes()
+        if changes is not None:
+            # 再等几轮，收集同一批操作产生的全部变化（可能跨越两次轮询）
+            time.sleep(POLL_INTERVAL * 3)
+            more = watcher.take_changes()
+            return watcher_module._collapse_paths(changes[0] | (more[0] if more else set()))
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+@pytest.fixture
+def polling_watcher(tmp_path: Path, monkeypatch):
+    """在 tmp_path 中创建目录树，启动轮询模式的监视器"""
+    monkeypatch.setattr(watcher_module, "WATCHDOG_AVAILABLE", False)
+    for relpath in ("a/b/f.txt", "c/g.txt", "Library/x/big.bin", "top.txt"):
+        write_file(tmp_path / relpath, "1")
+
+    watcher = WorkingCopyWatcher(tmp_path, ["Library/"], POLL_INTERVAL)
+    watcher.start()
+    time.sleep(POLL_INTERVAL * 3)
+    yield watcher
+    watcher.stop()
+
+
+def test_polling_reports_added_removed_and_renamed(polling_watcher, tmp_path):
+    """新建、删除、重命名的条目和新建的目录树都能被发现，忽略的目录不监视"""
+    assert polling_watcher.is_polling
+    assert polling_watcher.take_changes() is None
+
+    write_file(tmp_path / "a" / "b" / "new.txt", "x")
+    write_file(tmp_path / "c" / "d" / "e" / "h.txt", "x")
+    (tmp_path / "top.txt").unlink()
+    write_file(tmp_path / "Library" / "x" / "new.bin", "x")
+    assert wait_changes(polling_watcher) == {
+        os.path.join("a", "b", "new.txt"),
+        os.path.join("c", "d"),
+        "top.txt",
+    }
+
+    # 新建的目录在下一轮起同样被监视
+    write_file(tmp_path / "c" / "d" / "e" / "h2.txt", "x")
+    shutil.rmtree(tmp_path / "a")
+    assert wait_changes(polling_watcher) == {os.path.join("c", "d", "e", "h2.txt"), "a"}
+
+    os.replace(tmp_path / "c" / "g.txt", tmp_path / "c" / "g2.txt")
+    assert wait_changes(polling_watcher) == {
+        os.path.join("c", "g.txt"),
+        os.path.join("c", "g2.txt"),
+    }
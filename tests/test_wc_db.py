@@ -0,0 +1,230 @@
+"""
+原生状态引擎（core.wc_db）测试
+
+前半部分用 sqlite3 构造最小的 wc.db，不依赖 svn 命令行；
+后半部分与真实 svn status 的输出比较。
+"""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from conftest import requires_svn, sorted_status, svn, write_file
+
+from smart_svn_commit.core import wc_db
+from smart_svn_commit.core.commit import iter_svn_status
+from smart_svn_commit.core.wc_db import read_node_kinds, run_wc_db_status
+
+WC_DB_SCHEMA = """
+CREATE TABLE wcroot (id INTEGER PRIMARY KEY, local_abspath TEXT);
+CREATE TABLE nodes (
+    wc_id INTEGER, local_relpath TEXT, op_depth INTEGER, parent_relpath TEXT,
+    repos_id INTEGER, revision INTEGER, presence TEXT, kind TEXT, checksum TEXT,
+    properties BLOB, translated_size INTEGER, last_mod_time INTEGER,
+    file_external INTEGER, inherited_props BLOB
+);
+CREATE TABLE actual_node (
+    wc_id INTEGER, local_relpath TEXT, parent_relpath TEXT, properties BLOB,
+    conflict_data BLOB
+);
+CREATE TABLE externals (wc_id INTEGER, local_relpath TEXT, kind TEXT);
+CREATE TABLE work_queue (id INTEGER PRIMARY KEY);
+INSERT INTO wcroot (id, local_abspath) VALUES (1, NULL);
+PRAGMA user_version = 31;
+"""
+
+
+class FakeWc:
+    """在临时目录中构造工作文件和对应的 wc.db 记录"""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        (root / ".svn").mkdir(parents=True)
+        self.conn = sqlite3.connect(str(root / ".svn" / "wc.db"))
+        self.conn.executescript(WC_DB_SCHEMA)
+        self.add_node("", kind="dir")
+
+    def add_node(self, relpath: str, kind: str = "file", op_depth: int = 0, **columns) -> None:
+        row = {
+            "wc_id": 1,
+            "local_relpath": relpath,
+            "op_depth": op_depth,
+            "parent_relpath": relpath.rpartition("/")[0] if relpath else None,
+            "repos_id": 1 if op_depth == 0 else None,
+            "revision": 1,
+            "presence": "normal",
+            "kind": kind,
+            **columns,
+        }
+        names = ", ".join(row)
+        placeholders = ", ".join("?" * len(row))
+        self.conn.execute(
+            f"INSERT INTO nodes ({names}) VALUES ({placeholders})", list(row.values())
+        )
+
+    def add_file(self, relpath: str, content: str, **columns) -> None:
+        """写入已版本化文件，默认记录与磁盘一致的大小、修改时间和校验和"""
+        path = self.root / relpath
+        write_file(path, content)
+        st = path.stat()
+        checksum = "$sha1$" + hashlib.sha1(path.read_bytes()).hexdigest()
+        columns.setdefault("translated_size", st.st_size)
+        columns.setdefault("last_mod_time", st.st_mtime_ns // 1000)
+        columns.setdefault("checksum", checksum)
+        self.add_node(relpath, **columns)
+
+    def add_actual(self, relpath: str, properties=None, conflict_data=None) -> None:
+        self.conn.execute(
+            "INSERT INTO actual_node (wc_id, local_relpath, properties, conflict_data) "
+            "VALUES (1, ?, ?, ?)",
+            (relpath, properties, conflict_data),
+        )
+
+    def status(self, monkeypatch, cli_result=None):
+        """提交记录并运行原生引擎，返回 (状态列表, 交给 svn 命令行的路径)"""
+        self.conn.commit()
+        cli_targets = []
+
+        def fake_resolve_by_cli(engine, relpaths, prefix):
+            cli_targets.extend(relpaths)
+            return dict(cli_result or {})
+
+        monkeypatch.setattr(wc_db.WcDbStatusEngine, "_resolve_by_cli", fake_resolve_by_cli)
+        monkeypatch.setattr(wc_db, "read_global_ignores", lambda: ["*.o"])
+        return run_wc_db_status(self.root), cli_targets
+
+
+@pytest.fixture
+def fake_wc(tmp_path: Path) -> FakeWc:
+    wc = FakeWc(tmp_path / "wc")
+    yield wc
+    wc.conn.close()
+
+
+def test_status_mapping_without_svn(fake_wc, monkeypatch):
+    """M、!、?、A、D、R、~、C 以及属性修改由 wc.db 与磁盘 stat 直接得出"""
+    fake_wc.add_file("same.txt", "same\n")
+    fake_wc.add_file("mod.txt", "content\n", translated_size=3)
+    fake_wc.add_file("gone.txt", "gone\n")
+    (fake_wc.root / "gone.txt").unlink()
+    fake_wc.add_file("added.txt", "added\n", op_depth=1)
+    fake_wc.add_file("del.txt", "del\n")
+    fake_wc.add_node("del.txt", op_depth=1, presence="base-deleted")
+    fake_wc.add_file("repl.txt", "repl\n")
+    fake_wc.add_node("repl.txt", op_depth=1)
+    fake_wc.add_node("obst")
+    (fake_wc.root / "obst").mkdir()
+    fake_wc.add_file("conf.txt", "conf\n")
+    fake_wc.add_actual("conf.txt", conflict_data=b"((update) ((text 1 2)))")
+    fake_wc.add_file("prop_conf.txt", "prop\n")
+    fake_wc.add_actual("prop_conf.txt", conflict_data=b"((update) ((prop 1 2)))")
+    fake_wc.add_file("props.txt", "props\n")
+    fake_wc.add_actual("props.txt", properties=b"(7 svn:foo 3 bar)")
+    fake_wc.add_node("dir", kind="dir")
+    fake_wc.add_file("dir/inner.txt", "inner\n")
+    write_file(fake_wc.root / "dir" / "new.txt", "new\n")
+    write_file(fake_wc.root / "build.o", "ignored\n")
+    (fake_wc.root / "newdir").mkdir()
+
+    result, cli_targets = fake_wc.status(monkeypatch)
+
+    assert sorted_status(result) == [
+        ("A", "added.txt"),
+        ("C", "conf.txt"),
+        ("D", "del.txt"),
+        ("?", os.path.join("dir", "new.txt")),
+        ("!", "gone.txt"),
+        ("M", "mod.txt"),
+        ("?", "newdir"),
+        ("~", "obst"),
+        ("_C", "prop_conf.txt"),
+        ("_M", "props.txt"),
+        ("R", "repl.txt"),
+    ]
+    assert cli_targets == []
+
+
+def test_same_size_files_compared_by_checksum(fake_wc, monkeypatch):
+    """大小相同但修改时间不同的文件与 pristine 校验和比较"""
+    fake_wc.add_file("touched.txt", "same\n", last_mod_time=1)
+    fake_wc.add_file("edited.txt", "old\n", last_mod_time=1)
+    write_file(fake_wc.root / "edited.txt", "new\n")
+
+    result, cli_targets = fake_wc.status(monkeypatch)
+
+    assert result == [("M", "edited.txt")]
+    assert cli_targets == []
+
+
+def test_unreadable_dir_children_are_not_missing(fake_wc, monkeypatch):
+    """无法列出的目录中的条目交给 svn 命令行判断，而不是全部报告为缺失"""
+    fake_wc.add_node("locked", kind="dir")
+    fake_wc.add_file("locked/a.txt", "a\n")
+    fake_wc.add_file("locked/b.txt", "b\n")
+    locked = str(fake_wc.root / "locked")
+    scan_dir = wc_db._scan_dir
+    monkeypatch.setattr(
+        wc_db, "_scan_dir", lambda path: wc_db.UNREADABLE_DIR if path == locked else scan_dir(path)
+    )
+
+    result, cli_targets = fake_wc.status(monkeypatch, {"locked/b.txt": "M"})
+
+    assert sorted(cli_targets) == ["locked/a.txt", "locked/b.txt"]
+    assert result == [("M", os.path.join("locked", "b.txt"))]
+
+
+def test_read_node_kinds(fake_wc):
+    """缺失和已删除的条目按最上层节点读取类型"""
+    fake_wc.add_node("missing_dir", kind="dir")
+    fake_wc.add_node("deleted_dir", kind="dir")
+    fake_wc.add_node("deleted_dir", kind="dir", op_depth=1, presence="base-deleted")
+    fake_wc.add_node("gone.txt")
+    fake_wc.conn.commit()
+
+    kinds = read_node_kinds(fake_wc.root, ["missing_dir", "deleted_dir", "gone.txt", "nope"])
+
+    assert kinds == {"missing_dir": "dir", "deleted_dir": "dir", "gone.txt": "file"}
+
+
+@requires_svn
+def test_matches_svn_status_with_dir_external(make_wc, svn_repo, monkeypatch):
+    """目录外部定义中的变更与 svn status 一致（外部目录本身显示为 X）"""
+    make_wc("lib", {"a.txt": "lib\n", "sub/b.txt": "lib sub\n"})
+    wc = make_wc("main", {"f.txt": "main\n"})
+    svn("propset", "svn:externals", f"{svn_repo}/lib ext", ".", cwd=wc)
+    svn("commit", "-m", "add external", cwd=wc)
+    svn("update", cwd=wc)
+
+    write_file(wc / "f.txt", "main changed\n")
+    write_file(wc / "ext" / "a.txt", "lib changed\n")
+    write_file(wc / "ext" / "sub" / "new.txt", "unversioned\n")
+    (wc / "ext" / "sub" / "b.txt").unlink()
+
+    monkeypatch.chdir(wc)
+    expected = sorted_status(iter_svn_status())
+    actual = run_wc_db_status(Path(wc))
+
+    assert actual is not None
+    assert sorted_status(actual) == expected
+    assert ("M", os.path.join("ext", "a.txt")) in actual
+    assert ("!", os.path.join("ext", "sub", "b.txt")) in actual
+    assert ("X", "ext") in actual
+
+
+@requires_svn
+def test_matches_svn_status_for_local_changes(make_wc, monkeypatch):
+    """修改、删除、缺失和未版本化的文件与 svn status 一致"""
+    wc = make_wc("plain", {"a.txt": "a\n", "b.txt": "b\n", "c.txt": "c\n", "dir/d.txt": "d\n"})
+    write_file(wc / "a.txt", "a changed\n")
+    svn("delete", "b.txt", cwd=wc)
+    (wc / "c.txt").unlink()
+    write_file(wc / "dir" / "new.txt", "new\n")
+
+    monkeypatch.chdir(wc)
+    expected = sorted_status(iter_svn_status())
+    actual = run_wc_db_status(Path(wc))
+
+    assert actual is not None
+    assert sorted_status(actual) == expected